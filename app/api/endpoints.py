@@ -1,27 +1,144 @@
 """
 API endpoint definitions.
 
-This module contains the FastAPI application and endpoint definitions.
+This module contains the FastAPI application and endpoint definitions. The
+application and the services behind it are built on first use rather than on
+import, and endpoints receive the services through FastAPI dependencies.
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Body, status
+import asyncio
+import hashlib
+import json
+import secrets
+import signal
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+from fastapi import APIRouter, FastAPI, HTTPException, Depends, Body, Header, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Match
 
-from app.api.models import ResearchRequest, ResearchResponse
-from app.core.config import get_settings, Settings
-from app.core.logging import setup_logger
+from app.api.models import (
+    BatchResearchRequest,
+    BatchResearchResponse,
+    FollowUpRequest,
+    ResearchJob,
+    ResearchJobRequest,
+    ResearchRequest,
+    ResearchResponse,
+)
+from app.api.responses import CompressionMiddleware, FastJSONResponse, dumps
+from app.core.agent import JulepAgentManager, get_agent_manager
+from app.core.config import get_settings, reload_settings, Settings
+from app.core.logging import configure_logging, setup_logger
+from app.core.resilience import CircuitBreaker
+from app.core.metrics import (
+    ERRORS,
+    REGISTRY,
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    monitor_event_loop_lag,
+    server_timing_header,
+    start_request_timings,
+)
+from app.services.jobs import JobRunner, get_job_runner
+from app.services.priming import create_cache_primer, prime_in_background
 from app.services.research import (
-    research_service, 
+    ResearchService,
+    get_research_service,
+    AdmissionRejected,
+    InputTooLarge,
     ResearchError, 
     AgentSessionError, 
-    ResearchResponseError
+    ConversationNotFound,
+    ResearchResponseError,
+    UpstreamUnavailable
 )
+from app.services.scheduling import ANONYMOUS_CLIENT, ClientContext, current_client, set_client_context
 
 # Set up logger for this module
 logger = setup_logger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:
+    """
+    Prepare shared resources on startup and release them on shutdown.
+    
+    Args:
+        application (FastAPI): The application being served.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGHUP, handle_reload_signal)
+    except (AttributeError, NotImplementedError, RuntimeError, ValueError):
+        # No SIGHUP on this platform, or not running in the main thread
+        logger.debug("SIGHUP settings reload is unavailable")
+    
+    lag_monitor = asyncio.ensure_future(monitor_event_loop_lag())
+    agent_manager = get_agent_manager()
+    research_service = get_research_service()
+    job_runner = get_job_runner()
+    # Bootstrapping the agent, importing the Julep SDK and filling the session pool
+    # happen after startup, so that new replicas answer probes while getting ready
+    warm_up = asyncio.ensure_future(agent_manager.start_up())
+    priming = None
+    settings = get_settings()
+    if settings.PRIME_FILE:
+        priming = asyncio.ensure_future(prime_in_background(
+            create_cache_primer(settings, research_service), settings.PRIME_FILE,
+            after=warm_up, shared=settings.CACHE_SHARED_BACKEND is not None
+        ))
+    if job_runner is not None:
+        job_runner.start()
+    yield
+    if job_runner is not None:
+        await job_runner.stop()
+    if priming is not None:
+        priming.cancel()
+    warm_up.cancel()
+    lag_monitor.cancel()
+    research_service.close()
+    agent_manager.close()
+
+
+def apply_logging_settings(settings: Settings) -> None:
+    """
+    Apply the logging options from the settings.
+    
+    Args:
+        settings (Settings): Application settings.
+    """
+    configure_logging(
+        log_level=settings.LOG_LEVEL,
+        log_format=settings.LOG_FORMAT,
+        info_sample_rate=settings.LOG_INFO_SAMPLE_RATE,
+    )
+
+
+def apply_reloaded_settings(settings: Settings) -> None:
+    """
+    Apply reloaded settings to the logging and the agent profiles.
+    
+    Args:
+        settings (Settings): The reloaded application settings.
+    """
+    apply_logging_settings(settings)
+    get_agent_manager().reload_profiles(settings)
+
+
+def handle_reload_signal() -> None:
+    """Reload settings when the process receives SIGHUP."""
+    try:
+        apply_reloaded_settings(reload_settings())
+        logger.info("Reloaded settings on SIGHUP")
+    except Exception as e:
+        logger.error("Failed to reload settings on SIGHUP: %s", e)
+
+
 def create_application() -> FastAPI:
     """
     Create and configure the FastAPI application.
@@ -30,11 +147,14 @@ def create_application() -> FastAPI:
         FastAPI: The configured FastAPI application.
     """
     settings = get_settings()
+    apply_logging_settings(settings)
     
     application = FastAPI(
         title=settings.API_TITLE,
         description=settings.API_DESCRIPTION,
         version=settings.API_VERSION,
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
     
     # Configure CORS
@@ -46,44 +166,288 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
     
+    if settings.COMPRESSION_ENABLED:
+        application.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MIN_SIZE,
+            gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+            brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        )
+    
+    application.middleware("http")(instrument_requests)
+    application.add_exception_handler(AdmissionRejected, handle_admission_rejected)
+    application.add_exception_handler(InputTooLarge, handle_input_too_large)
+    application.add_exception_handler(ConversationNotFound, handle_conversation_not_found)
+    application.add_exception_handler(UpstreamUnavailable, handle_upstream_unavailable)
+    application.add_exception_handler(AgentSessionError, handle_agent_session_error)
+    application.add_exception_handler(ResearchResponseError, handle_research_response_error)
+    application.add_exception_handler(ResearchError, handle_research_error)
+    application.include_router(router)
+    
+    return application
+
+
+_application: Optional[FastAPI] = None
+_application_lock = threading.Lock()
+
+
+def get_application() -> FastAPI:
+    """
+    Get the application served by this process, building it on first use.
+    
+    Returns:
+        FastAPI: The configured FastAPI application.
+    """
+    global _application
+    application = _application
+    if application is None:
+        with _application_lock:
+            if _application is None:
+                _application = create_application()
+            application = _application
     return application
 
 
-app = create_application()
+def __getattr__(name: str) -> Any:
+    """Build the application when it is first looked up as `app.api.endpoints:app`."""
+    if name == "app":
+        return get_application()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Routes are collected here and added to the application when it is built
+router = APIRouter()
+
+
+def route_path(request: Request) -> str:
+    """
+    Get the path template of the route a request matches, for use as a metric label.
+    
+    Args:
+        request (Request): The incoming request.
+        
+    Returns:
+        str: The route path, or "unmatched" if no route matches.
+    """
+    for route in request.app.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+async def instrument_requests(request: Request, call_next):
+    """
+    Record request latency and in-flight requests, and add a Server-Timing header.
+    
+    Args:
+        request (Request): The incoming request.
+        call_next: Handler for the rest of the middleware chain.
+        
+    Returns:
+        Response: The response, with a Server-Timing header listing the timed stages.
+    """
+    path = route_path(request)
+    timings = start_request_timings()
+    start = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc(path=path)
+    try:
+        response = await call_next(request)
+    finally:
+        REQUESTS_IN_FLIGHT.dec(path=path)
+        duration = time.perf_counter() - start
+        REQUEST_LATENCY.observe(duration, method=request.method, path=path)
+    response.headers["Server-Timing"] = server_timing_header(timings, duration)
+    return response
+
+
+def count_error(exc: Exception) -> None:
+    """
+    Count an error by exception class.
+    
+    Args:
+        exc (Exception): The error to count.
+    """
+    ERRORS.inc(exception=type(exc).__name__)
 
 
 # Exception handlers
-@app.exception_handler(AgentSessionError)
+async def handle_admission_rejected(request, exc):
+    """Handle requests rejected by admission control."""
+    count_error(exc)
+    logger.warning("AdmissionRejected: %s", exc)
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": f"Service overloaded: {str(exc)}"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+async def handle_input_too_large(request, exc):
+    """Handle topics rejected for being over their token budget."""
+    count_error(exc)
+    logger.warning("InputTooLarge: %s", exc)
+    return JSONResponse(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        content={"detail": f"Input too large: {str(exc)}"}
+    )
+
+
+async def handle_conversation_not_found(request, exc):
+    """Handle follow-ups on unknown or expired conversation handles."""
+    count_error(exc)
+    logger.warning("ConversationNotFound: %s", exc)
+    return JSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND,
+        content={"detail": str(exc)}
+    )
+
+
+async def handle_upstream_unavailable(request, exc):
+    """Handle requests failed fast by the circuit breaker or the request deadline."""
+    count_error(exc)
+    logger.warning("UpstreamUnavailable: %s", exc)
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": f"Upstream unavailable: {str(exc)}"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
 async def handle_agent_session_error(request, exc):
     """Handle agent session errors."""
-    logger.error(f"AgentSessionError: {str(exc)}")
+    count_error(exc)
+    logger.error("AgentSessionError: %s", exc)
     return JSONResponse(
         status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
         content={"detail": f"Agent session error: {str(exc)}"}
     )
 
 
-@app.exception_handler(ResearchResponseError)
 async def handle_research_response_error(request, exc):
     """Handle research response errors."""
-    logger.error(f"ResearchResponseError: {str(exc)}")
+    count_error(exc)
+    logger.error("ResearchResponseError: %s", exc)
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": f"Research response error: {str(exc)}"}
     )
 
 
-@app.exception_handler(ResearchError)
 async def handle_research_error(request, exc):
     """Handle general research errors."""
-    logger.error(f"ResearchError: {str(exc)}")
+    count_error(exc)
+    logger.error("ResearchError: %s", exc)
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": f"Research error: {str(exc)}"}
     )
 
 
-@app.get("/health")
+def require_admin(
+    x_admin_key: Optional[str] = Header(default=None),
+    settings: Settings = Depends(get_settings)
+) -> None:
+    """
+    Guard admin routes with the configured admin key.
+    
+    Admin routes are disabled unless an admin key is configured.
+    
+    Args:
+        x_admin_key (Optional[str]): Value of the X-Admin-Key header.
+        settings (Settings): Application settings.
+        
+    Raises:
+        HTTPException: If no admin key is configured, or the header does not match it.
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin routes are disabled; set ADMIN_API_KEY to enable them"
+        )
+    if x_admin_key is None or not secrets.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin key"
+        )
+
+
+def identify_client(request: Request, settings: Settings, default_priority: str) -> ClientContext:
+    """
+    Identify the client of a request and choose its priority class.
+    
+    Clients are identified by their X-API-Key, else by X-Client-Id, else by their
+    address. The priority class configured for the API key wins; otherwise a known
+    class requested in X-Priority is used, falling back to the route's default.
+    
+    Args:
+        request (Request): The incoming HTTP request.
+        settings (Settings): Application settings.
+        default_priority (str): Priority class when the request does not choose one.
+        
+    Returns:
+        ClientContext: The client and its priority class.
+    """
+    priority = None
+    api_key = request.headers.get("x-api-key")
+    if api_key:
+        # Keep the key itself out of logs and metrics
+        client_id = "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        priority = settings.API_KEY_PRIORITIES.get(api_key)
+    else:
+        client_id = request.headers.get("x-client-id") or (
+            request.client.host if request.client else ANONYMOUS_CLIENT
+        )
+    if priority is None:
+        requested = request.headers.get("x-priority")
+        priority = requested if requested in settings.PRIORITY_WEIGHTS else default_priority
+    return ClientContext(client_id, priority)
+
+
+async def interactive_client(
+    request: Request,
+    settings: Settings = Depends(get_settings),
+    service: ResearchService = Depends(get_research_service)
+) -> None:
+    """
+    Record the client of a research request and apply its rate limit.
+    
+    Args:
+        request (Request): The incoming HTTP request.
+        settings (Settings): Application settings.
+        service (ResearchService): The research service.
+        
+    Raises:
+        AdmissionRejected: If the client is over its rate limit.
+    """
+    client = identify_client(request, settings, settings.DEFAULT_PRIORITY_CLASS)
+    service.check_rate_limit(client)
+    # Async, so that the context is set in the task that runs the endpoint
+    set_client_context(client.client_id, client.priority)
+
+
+async def batch_client(
+    request: Request,
+    settings: Settings = Depends(get_settings),
+    service: ResearchService = Depends(get_research_service)
+) -> None:
+    """
+    Record the client of a batch request, defaulting to the batch priority class.
+    
+    Args:
+        request (Request): The incoming HTTP request.
+        settings (Settings): Application settings.
+        service (ResearchService): The research service.
+        
+    Raises:
+        AdmissionRejected: If the client is over its rate limit.
+    """
+    client = identify_client(request, settings, settings.BATCH_PRIORITY_CLASS)
+    service.check_rate_limit(client)
+    set_client_context(client.client_id, client.priority)
+
+
+@router.get("/health")
 async def health_check():
     """
     Health check endpoint.
@@ -95,45 +459,545 @@ async def health_check():
     return {"status": "healthy"}
 
 
-@app.post(
+@router.get("/livez", summary="Liveness probe")
+async def liveness():
+    """
+    Liveness probe: the process is up and its event loop is serving requests.
+    
+    Returns:
+        dict: A simple status message.
+    """
+    return {"status": "alive"}
+
+
+def readiness_checks(
+    agent_manager: JulepAgentManager,
+    service: ResearchService,
+    job_runner: Optional[JobRunner],
+    settings: Settings
+) -> Dict[str, bool]:
+    """
+    Check whether the replica should receive traffic.
+    
+    Args:
+        agent_manager (JulepAgentManager): The agent manager.
+        service (ResearchService): The research service.
+        job_runner (Optional[JobRunner]): The job runner, or None if jobs are disabled.
+        settings (Settings): Application settings.
+        
+    Returns:
+        Dict[str, bool]: Whether each check passes: the agent is bootstrapped, the
+            warm-up has finished, the circuit breaker is not open, and the admission
+            and job queues are below the saturation threshold.
+    """
+    checks = {
+        "agent": agent_manager.bootstrapped,
+        "warm_up": agent_manager.warmed_up,
+        "upstream": agent_manager.breaker.state != CircuitBreaker.OPEN,
+    }
+    if service.admission is not None:
+        checks["admission"] = service.admission.saturation < settings.READINESS_MAX_SATURATION
+    if job_runner is not None:
+        checks["jobs"] = job_runner.saturation < settings.READINESS_MAX_SATURATION
+    return checks
+
+
+@router.get("/readyz", summary="Readiness probe")
+async def readiness(
+    settings: Settings = Depends(get_settings),
+    agent_manager: JulepAgentManager = Depends(get_agent_manager),
+    service: ResearchService = Depends(get_research_service),
+    job_runner: Optional[JobRunner] = Depends(get_job_runner)
+):
+    """
+    Readiness probe: the replica is warmed up and not overloaded.
+    
+    Args:
+        settings (Settings): Application settings.
+        agent_manager (JulepAgentManager): The agent manager.
+        service (ResearchService): The research service.
+        job_runner (Optional[JobRunner]): The job runner, or None if jobs are disabled.
+        
+    Returns:
+        FastJSONResponse: The outcome of each check, with status 200 when every
+            check passes and 503 otherwise, and the failure of the latest agent
+            bootstrap attempt under 'errors' while it keeps failing.
+    """
+    checks = readiness_checks(agent_manager, service, job_runner, settings)
+    ready = all(checks.values())
+    content: Dict[str, Any] = {"status": "ready" if ready else "not ready", "checks": checks}
+    if agent_manager.bootstrap_error is not None:
+        content["errors"] = {"agent": agent_manager.bootstrap_error}
+    if not ready:
+        logger.debug("Readiness checks failed: %s", checks)
+    return FastJSONResponse(
+        content,
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Metrics endpoint in the Prometheus text exposition format.
+    
+    Returns:
+        PlainTextResponse: The current metrics.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.post(
     "/research",
     response_model=ResearchResponse,
     summary="Perform research on a topic",
-    description="Performs research on the given topic and returns the results in the specified format."
+    description="Performs research on the given topic and returns the results in the specified format.",
+    dependencies=[Depends(interactive_client)]
 )
 async def do_research(
     request: ResearchRequest = Body(...),
-    settings: Settings = Depends(get_settings)
+    settings: Settings = Depends(get_settings),
+    service: ResearchService = Depends(get_research_service)
 ):
     """
     Perform research on a topic.
     
+    The X-Cache response header reports whether the result came from the cache.
+    The 'conversation' field holds a handle for follow-up requests, if enabled.
+    The results are serialized directly rather than validated again against the
+    response model, since the service already built them from validated values.
+    
     Args:
         request (ResearchRequest): The research request parameters.
         settings (Settings): Application settings.
+        service (ResearchService): The research service.
         
     Returns:
-        ResearchResponse: The research results.
+        FastJSONResponse: The research results, shaped like ResearchResponse.
         
     Raises:
         HTTPException: If there's an error in the research process.
     """
-    logger.info(f"Received research request - Topic: '{request.topic}', Format: '{request.format}'")
+    logger.info("Received research request - Topic: '%s', Format: '%s'", request.topic, request.format)
     
     try:
-        result = await research_service.perform_research(
+        result = await service.perform_research(
             topic=request.topic,
-            output_format=request.format
+            output_format=request.format,
+            profile=request.profile
         )
-        logger.info(f"Successfully completed research for topic: '{request.topic}'")
-        return ResearchResponse(**result)
+        logger.info("Successfully completed research for topic: '%s'", request.topic)
+        headers = {"X-Cache": result["cache_status"]} if "cache_status" in result else None
+        return FastJSONResponse(research_content(result, await service.open_conversation(result)), headers=headers)
     except (ResearchError, AgentSessionError, ResearchResponseError):
         # These will be handled by our exception handlers
         raise
     except Exception as e:
         # Catch any other unexpected errors
-        logger.error(f"Unexpected error in research endpoint: {str(e)}")
+        count_error(e)
+        logger.error("Unexpected error in research endpoint: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An unexpected error occurred: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+def research_content(result: Dict[str, Any], conversation: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get the fields of a research result that make up a ResearchResponse.
+    
+    Args:
+        result (Dict[str, Any]): The research results returned by the service.
+        conversation (Optional[str]): Handle for follow-up requests, if any.
+        
+    Returns:
+        Dict[str, Any]: The response content.
+    """
+    content = {"topic": result["topic"], "format": result["format"], "result": result["result"]}
+    if conversation is not None:
+        content["conversation"] = conversation
+    return content
+
+
+def format_sse(event: str, data: dict) -> str:
+    """
+    Format a server-sent event.
+    
+    Args:
+        event (str): The event name.
+        data (dict): The event payload, sent as JSON.
+        
+    Returns:
+        str: The encoded event.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post(
+    "/research/stream",
+    summary="Perform research on a topic, streaming the results",
+    description=(
+        "Performs research on the given topic and relays the results as server-sent events: "
+        "'token' events carry pieces of text as they are generated, and a final 'result' event "
+        "carries the same fields as the /research response. Failures are reported as an 'error' event."
+    ),
+    response_class=StreamingResponse,
+    dependencies=[Depends(interactive_client)]
+)
+async def do_research_stream(
+    request: ResearchRequest = Body(...),
+    service: ResearchService = Depends(get_research_service)
+):
+    """
+    Perform research on a topic, streaming the results as server-sent events.
+    
+    Args:
+        request (ResearchRequest): The research request parameters.
+        service (ResearchService): The research service.
+        
+    Returns:
+        StreamingResponse: A text/event-stream response.
+        
+    Raises:
+        InputTooLarge: If the topic is over budget and oversized topics are rejected.
+    """
+    logger.info("Received streaming research request - Topic: '%s', Format: '%s'", request.topic, request.format)
+    # Shape before the stream starts, so that rejections get their status code
+    topic = service.shape_topic(request.topic, request.format)
+    
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event in service.stream_research(
+                topic=topic,
+                output_format=request.format,
+                profile=request.profile
+            ):
+                if event["event"] == "token":
+                    yield format_sse("token", {"text": event["text"]})
+                else:
+                    data = event["data"]
+                    yield format_sse("result", research_content(data, await service.open_conversation(data)))
+        except ResearchError as e:
+            count_error(e)
+            yield format_sse("error", {"detail": str(e)})
+        except Exception as e:
+            count_error(e)
+            logger.error("Unexpected error in streaming research endpoint: %s", e)
+            yield format_sse("error", {"detail": f"An unexpected error occurred: {str(e)}"})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post(
+    "/research/{handle}/follow-up",
+    response_model=ResearchResponse,
+    summary="Follow up on a research answer",
+    description=(
+        "Rewrites a previous answer in another format, or follows the given instruction, with "
+        "one chat on the session that produced it instead of researching the topic again. "
+        "Handles are returned by /research and expire after sitting idle."
+    ),
+    dependencies=[Depends(interactive_client)]
+)
+async def do_follow_up(
+    handle: str,
+    request: FollowUpRequest = Body(...),
+    service: ResearchService = Depends(get_research_service)
+):
+    """
+    Follow up on a research answer.
+    
+    Args:
+        handle (str): Conversation handle returned by /research.
+        request (FollowUpRequest): The follow-up parameters.
+        service (ResearchService): The research service.
+        
+    Returns:
+        FastJSONResponse: The reworked results, shaped like ResearchResponse.
+        
+    Raises:
+        ConversationNotFound: If the handle is unknown or has expired.
+    """
+    logger.info("Received follow-up request - Conversation: '%s', Format: '%s'", handle, request.format)
+    result = await service.follow_up(handle, instruction=request.instruction, output_format=request.format)
+    return FastJSONResponse(research_content(result, result["conversation"]))
+
+
+def job_state(job: Dict[str, Any]) -> ResearchJob:
+    """
+    Build the response model of a stored job.
+    
+    Args:
+        job (Dict[str, Any]): The job as stored.
+        
+    Returns:
+        ResearchJob: The job state.
+    """
+    return ResearchJob(
+        id=job["id"],
+        status=job["status"],
+        topic=job["topic"],
+        format=job["format"],
+        result=ResearchResponse(**job["result"]) if job["result"] else None,
+        error=job["error"],
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+    )
+
+
+def require_jobs(job_runner: Optional[JobRunner] = Depends(get_job_runner)) -> JobRunner:
+    """
+    Get the job runner, rejecting job requests when background jobs are disabled.
+    
+    Args:
+        job_runner (Optional[JobRunner]): The job runner, or None if jobs are disabled.
+        
+    Returns:
+        JobRunner: The job runner.
+        
+    Raises:
+        HTTPException: If background jobs are disabled.
+    """
+    if job_runner is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Background research jobs are disabled"
+        )
+    return job_runner
+
+
+@router.post(
+    "/research/jobs",
+    response_model=ResearchJob,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit a background research job",
+    description=(
+        "Queues research on the given topic and returns the job immediately. Poll the URL "
+        "in the Location header for the result, or pass 'callback_url' to receive the "
+        "finished job as a JSON POST. Jobs survive restarts of the server."
+    ),
+    dependencies=[Depends(require_jobs), Depends(interactive_client)]
+)
+async def submit_research_job(
+    response: Response,
+    request: ResearchJobRequest = Body(...),
+    job_runner: JobRunner = Depends(require_jobs)
+):
+    """
+    Submit a background research job.
+    
+    Args:
+        response (Response): The outgoing response, used to set headers.
+        request (ResearchJobRequest): The research job parameters.
+        job_runner (JobRunner): The job runner.
+        
+    Returns:
+        ResearchJob: The queued job.
+        
+    Raises:
+        HTTPException: If the callback URL is not allowed.
+        AdmissionRejected: If too many jobs are queued.
+    """
+    client = current_client()
+    try:
+        job = await job_runner.submit(
+            topic=request.topic,
+            output_format=request.format,
+            profile=request.profile,
+            callback_url=str(request.callback_url) if request.callback_url else None,
+            client_id=client.client_id,
+            priority=client.priority
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    response.headers["Location"] = f"/research/jobs/{job['id']}"
+    return job_state(job)
+
+
+@router.get(
+    "/research/jobs/{job_id}",
+    response_model=ResearchJob,
+    summary="Get a background research job"
+)
+async def get_research_job(job_id: str, job_runner: JobRunner = Depends(require_jobs)):
+    """
+    Get the state of a background research job.
+    
+    Args:
+        job_id (str): The job ID.
+        job_runner (JobRunner): The job runner.
+        
+    Returns:
+        ResearchJob: The job state, with the result once it has succeeded.
+        
+    Raises:
+        HTTPException: If the job does not exist or its result has expired.
+    """
+    job = await job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Research job not found")
+    return job_state(job)
+
+
+def batch_item(
+    index: int,
+    item: ResearchRequest,
+    outcome: Union[Dict[str, Any], Exception]
+) -> Dict[str, Any]:
+    """
+    Build the response entry for one batch item, shaped like BatchResearchItem.
+    
+    Args:
+        index (int): Position of the item in the request.
+        item (ResearchRequest): The item as requested.
+        outcome (Union[Dict[str, Any], Exception]): The research results or the error raised.
+        
+    Returns:
+        Dict[str, Any]: The response entry.
+    """
+    entry = {"index": index, "topic": item.topic, "format": item.format, "result": None, "error": None}
+    if isinstance(outcome, Exception):
+        count_error(outcome)
+        if not isinstance(outcome, ResearchError):
+            logger.error("Unexpected error in batch item %s: %s", index, outcome)
+        entry["error"] = str(outcome)
+    else:
+        entry["result"] = outcome["result"]
+    return entry
+
+
+@router.post(
+    "/research/batch",
+    response_model=BatchResearchResponse,
+    summary="Perform research on many topics",
+    description=(
+        "Performs research on every item with bounded parallelism, researching identical "
+        "items once. Send 'Accept: application/x-ndjson' or '?stream=true' to receive each "
+        "item as a line of NDJSON as soon as it completes."
+    ),
+    dependencies=[Depends(batch_client)]
+)
+async def do_research_batch(
+    http_request: Request,
+    request: BatchResearchRequest = Body(...),
+    stream: bool = Query(default=False, description="Stream items as NDJSON as they complete"),
+    settings: Settings = Depends(get_settings),
+    service: ResearchService = Depends(get_research_service)
+):
+    """
+    Perform research on a batch of topics.
+    
+    Args:
+        http_request (Request): The incoming HTTP request, used for content negotiation.
+        request (BatchResearchRequest): The batch research request parameters.
+        stream (bool): Whether to stream items as NDJSON as they complete.
+        settings (Settings): Application settings.
+        service (ResearchService): The research service.
+        
+    Returns:
+        Union[FastJSONResponse, StreamingResponse]: Every item's outcome in request
+            order, or an NDJSON stream of outcomes in completion order.
+        
+    Raises:
+        HTTPException: If the batch has more items than allowed.
+    """
+    if len(request.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch has {len(request.items)} items; the maximum is {settings.BATCH_MAX_ITEMS}"
+        )
+    
+    concurrency = min(request.concurrency or settings.BATCH_MAX_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY)
+    logger.info("Received batch research request - %s item(s), concurrency %s", len(request.items), concurrency)
+    outcomes = service.perform_batch(
+        items=[(item.topic, item.format, item.profile) for item in request.items],
+        concurrency=concurrency
+    )
+    
+    if stream or "application/x-ndjson" in http_request.headers.get("accept", ""):
+        async def lines() -> AsyncIterator[str]:
+            async for index, outcome in outcomes:
+                yield dumps(batch_item(index, request.items[index], outcome)) + b"\n"
+        
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    
+    results = [None] * len(request.items)
+    async for index, outcome in outcomes:
+        results[index] = batch_item(index, request.items[index], outcome)
+    return FastJSONResponse({"results": results})
+
+
+@router.delete(
+    "/admin/cache",
+    summary="Invalidate cached research results",
+    dependencies=[Depends(require_admin)]
+)
+async def invalidate_cache(
+    topic: Optional[str] = Query(default=None, description="Topic to invalidate; omit to clear the cache"),
+    format: str = Query(default="summary", description="Output format of the entry to invalidate"),
+    service: ResearchService = Depends(get_research_service)
+):
+    """
+    Invalidate one cached research result, or the whole cache.
+    
+    Args:
+        topic (Optional[str]): Topic to invalidate, or None to clear every entry.
+        format (str): Output format of the entry to invalidate.
+        service (ResearchService): The research service.
+        
+    Returns:
+        dict: The number of entries removed.
+    """
+    # Clearing a shared cache is blocking I/O
+    removed = await asyncio.to_thread(service.invalidate, topic=topic, output_format=format)
+    logger.info("Invalidated %s cached research result(s)", removed)
+    return {"invalidated": removed}
+
+
+@router.get(
+    "/admin/coalescing",
+    summary="Get in-flight request coalescing statistics",
+    dependencies=[Depends(require_admin)]
+)
+async def coalescing_stats(service: ResearchService = Depends(get_research_service)):
+    """
+    Get per-key waiter statistics for coalesced research requests.
+    
+    Args:
+        service (ResearchService): The research service.
+        
+    Returns:
+        dict: Statistics keyed by normalized request key.
+    """
+    return service.coalescing_stats()
+
+
+@router.post(
+    "/admin/settings/reload",
+    summary="Reload application settings",
+    dependencies=[Depends(require_admin)]
+)
+async def reload_application_settings():
+    """
+    Re-read the environment and the .env file and swap in the new settings.
+    
+    Returns:
+        dict: A status message.
+        
+    Raises:
+        HTTPException: If the new configuration is invalid.
+    """
+    try:
+        apply_reloaded_settings(reload_settings())
+    except Exception as e:
+        logger.error("Failed to reload settings: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid settings: {str(e)}"
+        )
+    logger.info("Reloaded settings from admin endpoint")
+    return {"status": "reloaded"}
@@ -4,18 +4,31 @@ Pydantic models for API request and response validation.
 This module contains Pydantic models for validating API requests and responses.
 """
 
-from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, HttpUrl
+
+# Characters accepted in a topic or instruction, well above any token budget;
+# longer input is refused before it is shaped
+MAX_TEXT_LENGTH = 2000
+# Characters accepted in an output format, which goes into prompts and sessions
+MAX_FORMAT_LENGTH = 50
 
 
 class ResearchRequest(BaseModel):
     """
     Model for research request validation.
     """
-    topic: str = Field(..., description="The research topic")
+    topic: str = Field(..., max_length=MAX_TEXT_LENGTH, description="The research topic")
     format: str = Field(
         default="summary",
+        max_length=MAX_FORMAT_LENGTH,
         description="The desired output format (summary, bullet points, short report)"
     )
+    profile: Optional[str] = Field(
+        default=None,
+        description="Agent profile to use instead of the one routed by format, e.g. 'research' or 'brief'"
+    )
 
     class Config:
         """Pydantic config."""
@@ -34,6 +47,10 @@ class ResearchResponse(BaseModel):
     topic: str = Field(..., description="The research topic")
     format: str = Field(..., description="The output format used")
     result: str = Field(..., description="The research results")
+    conversation: Optional[str] = Field(
+        default=None,
+        description="Handle for POST /research/{handle}/follow-up, while it has not expired"
+    )
 
     class Config:
         """Pydantic config."""
@@ -43,4 +60,105 @@ class ResearchResponse(BaseModel):
                 "format": "bullet points",
                 "result": "• AI ethics concerns the moral implications of AI systems.\n• Key issues include privacy, bias, and accountability.\n• Many organizations have developed ethical guidelines for AI.\n• Ethical AI requires diverse perspectives.\n• Challenges include balancing innovation with safety."
             }
-        }
\ No newline at end of file
+        }
+
+
+class FollowUpRequest(BaseModel):
+    """
+    Model for follow-up request validation.
+    """
+    instruction: Optional[str] = Field(
+        default=None,
+        max_length=MAX_TEXT_LENGTH,
+        description="What to change or expand in the previous answer, e.g. 'Focus on recent work'"
+    )
+    format: Optional[str] = Field(
+        default=None,
+        max_length=MAX_FORMAT_LENGTH,
+        description="Output format to rewrite the previous answer in; unchanged when omitted"
+    )
+
+    class Config:
+        """Pydantic config."""
+        schema_extra = {
+            "example": {
+                "format": "bullet points",
+                "instruction": "Add one point about regulation."
+            }
+        }
+
+
+class BatchResearchRequest(BaseModel):
+    """
+    Model for batch research request validation.
+    """
+    items: List[ResearchRequest] = Field(..., min_length=1, description="The research requests to perform")
+    concurrency: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Maximum number of items researched at once, capped by the server limit"
+    )
+
+    class Config:
+        """Pydantic config."""
+        schema_extra = {
+            "example": {
+                "items": [
+                    {"topic": "artificial intelligence ethics", "format": "bullet points"},
+                    {"topic": "climate change", "format": "summary"}
+                ],
+                "concurrency": 4
+            }
+        }
+
+
+class BatchResearchItem(BaseModel):
+    """
+    Model for the outcome of a single item of a batch research request.
+    """
+    index: int = Field(..., description="Position of the item in the request")
+    topic: str = Field(..., description="The research topic")
+    format: str = Field(..., description="The output format used")
+    result: Optional[str] = Field(default=None, description="The research results, if the item succeeded")
+    error: Optional[str] = Field(default=None, description="The error message, if the item failed")
+
+
+class BatchResearchResponse(BaseModel):
+    """
+    Model for batch research response validation.
+    """
+    results: List[BatchResearchItem] = Field(..., description="Outcome of each item, in request order")
+
+
+class ResearchJobRequest(ResearchRequest):
+    """
+    Model for background research job request validation.
+    """
+    callback_url: Optional[HttpUrl] = Field(
+        default=None,
+        description="URL that receives the finished job as a JSON POST"
+    )
+
+    class Config:
+        """Pydantic config."""
+        schema_extra = {
+            "example": {
+                "topic": "artificial intelligence ethics",
+                "format": "short report",
+                "callback_url": "https://example.com/hooks/research"
+            }
+        }
+
+
+class ResearchJob(BaseModel):
+    """
+    Model for the state of a background research job.
+    """
+    id: str = Field(..., description="The job ID")
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    topic: str = Field(..., description="The research topic")
+    format: str = Field(..., description="The output format used")
+    result: Optional[ResearchResponse] = Field(default=None, description="The research results, once succeeded")
+    error: Optional[str] = Field(default=None, description="The error message, if the job failed")
+    created_at: float = Field(..., description="Submission time as a Unix timestamp")
+    updated_at: float = Field(..., description="Time of the last status change as a Unix timestamp")
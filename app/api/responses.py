@@ -0,0 +1,179 @@
+"""
+Response serialization and compression.
+
+This module contains the JSON response class used by the API, which serializes
+with orjson when it is installed, and the middleware that compresses responses
+with brotli or gzip as negotiated by Accept-Encoding. Both orjson and brotli are
+optional dependencies.
+"""
+
+import gzip
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import setup_logger
+
+# Set up logger for this module
+logger = setup_logger(__name__)
+
+
+# Media types worth compressing
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/x-ndjson")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to compact UTF-8 JSON.
+
+    Args:
+        content (Any): JSON-compatible content.
+
+    Returns:
+        bytes: The encoded JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response serialized with orjson when available, else with compact json.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Serialize the response content."""
+        return dumps(content)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best content coding the client accepts.
+
+    Args:
+        accept_encoding (str): Value of the Accept-Encoding header.
+
+    Returns:
+        Optional[str]: "br" or "gzip", or None if neither is acceptable.
+    """
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    def acceptable(coding: str) -> bool:
+        return accepted.get(coding, accepted.get("*", 0.0)) > 0
+
+    if brotli is not None and acceptable("br"):
+        return "br"
+    if acceptable("gzip"):
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    """
+    Compress a body with the given content coding.
+
+    Args:
+        body (bytes): The uncompressed body.
+        encoding (str): "br" or "gzip".
+        gzip_level (int): gzip compression level.
+        brotli_quality (int): brotli quality.
+
+    Returns:
+        bytes: The compressed body.
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Compress complete responses with brotli or gzip as negotiated by Accept-Encoding.
+
+    Only responses sent in a single body message are compressed, so streamed
+    responses such as server-sent events keep flushing each chunk as it is produced.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        """
+        Initialize the middleware.
+
+        Args:
+            app (ASGIApp): The wrapped application.
+            minimum_size (int): Smallest body in bytes that is compressed.
+            gzip_level (int): gzip compression level.
+            brotli_quality (int): brotli quality.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start)
+            if not message.get("more_body", False) and self._compressible(headers, body):
+                body = compress(body, encoding, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                message = {**message, "body": body}
+            passthrough = True
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, headers: MutableHeaders, body: bytes) -> bool:
+        """Whether a complete response body should be compressed."""
+        content_type = headers.get("content-type", "")
+        return (
+            len(body) >= self.minimum_size
+            and "content-encoding" not in headers
+            and content_type.startswith(COMPRESSIBLE_TYPES)
+        )
+
@@ -4,17 +4,271 @@ Julep AI agent creation and management.
 This module handles creation and management of the Julep AI research assistant agent.
 """
 
-from typing import Dict, Any, Optional
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, Callable, Iterator, List, Optional
 
-from julep import Julep
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.core.http import close_http_client, create_http_client, request_timeout
 from app.core.logging import setup_logger
+from app.core.metrics import REGISTRY, Counter, Histogram, timed
+from app.core.resilience import CircuitBreaker, RetryPolicy, call_with_retry, is_retryable
+from app.core.session_pool import SessionLease, SessionPool
+
+if TYPE_CHECKING:  # pragma: no cover - the SDK is imported on first use
+    from julep import Julep
 
 
 # Set up logger for this module
 logger = setup_logger(__name__)
 
+# Research assistant agent definition
+AGENT_NAME = "Research Assistant"
+AGENT_ABOUT = "An AI research assistant that provides information in requested formats"
+AGENT_INSTRUCTIONS = [
+    # Layer 1: Base Instruction - Core role
+    "You are a helpful research assistant. Your goal is to find concise information on topics provided by the user.",
+    
+    # Layer 2: Task Instruction - Primary task
+    "When given a topic and an output format (e.g., 'summary', 'bullet points', 'short report'), you must gather relevant information and structure it according to the requested format.",
+    
+    # Layer 3: Persona/Formatting Instruction - Tone and constraints
+    "Maintain a neutral, objective tone. Strictly adhere to the requested output format. Keep summaries to 3-4 sentences, bullet points concise (max 5 points), and short reports under 150 words. If you cannot find reliable information, state that clearly."
+]
+WIKIPEDIA_TOOL = {
+    "name": "wikipedia_search",
+    "type": "integration",
+    "integration": {
+        "provider": "wikipedia",
+    }
+}
+
+# Output formats served from the session pool
+POOLED_FORMATS = frozenset({"summary", "bullet points", "short report"})
+
+# Profile of the original research assistant agent, used for unrouted formats
+DEFAULT_PROFILE = "research"
+
+# Seconds between bootstrap attempts after startup, doubled up to the maximum
+BOOTSTRAP_RETRY_INITIAL = 1.0
+BOOTSTRAP_RETRY_MAX = 60.0
+
+# Dollars per 1,000 prompt and completion tokens, for profiles that do not set prices
+MODEL_PRICES = {
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4o-mini": (0.00015, 0.0006),
+}
+
+PROFILE_LATENCY = REGISTRY.register(Histogram(
+    "agent_profile_seconds",
+    "Latency of successful chat calls per agent profile",
+    labelnames=("profile", "mode"),
+))
+PROFILE_TOKENS = REGISTRY.register(Counter(
+    "agent_profile_tokens_total",
+    "Tokens reported by Julep per agent profile, by kind",
+    labelnames=("profile", "kind"),
+))
+PROFILE_COST = REGISTRY.register(Counter(
+    "agent_profile_cost_dollars_total",
+    "Estimated spend per agent profile, from token usage and the profile's prices",
+    labelnames=("profile",),
+))
+
+
+@contextmanager
+def _locked_state_file(path: str) -> Iterator[Dict[str, str]]:
+    """
+    Open the agent state file under an exclusive lock shared by all processes.
+    
+    The state maps agent definition hashes to agent IDs. Changes made to the
+    yielded mapping are written back atomically when the block exits cleanly.
+    
+    Args:
+        path (str): Path to the agent state file.
+        
+    Yields:
+        Dict[str, str]: The persisted agent IDs keyed by definition hash.
+    """
+    with open(f"{path}.lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            try:
+                with open(path, encoding="utf-8") as state_file:
+                    state = json.load(state_file).get("agents", {})
+            except FileNotFoundError:
+                state = {}
+            except ValueError:
+                logger.warning("Ignoring unreadable agent state file: %s", path)
+                state = {}
+            
+            original = dict(state)
+            yield state
+            
+            if state != original:
+                temp_path = f"{path}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as state_file:
+                    json.dump({"agents": state}, state_file, indent=2)
+                os.replace(temp_path, path)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _chunk_text(chunk: Dict[str, Any]) -> str:
+    """
+    Extract the generated text from a streamed chat chunk.
+    
+    Args:
+        chunk (Dict[str, Any]): A decoded chunk of a streaming chat response.
+        
+    Returns:
+        str: The text carried by the chunk, or an empty string if it has none.
+    """
+    choices = chunk.get("choices") or []
+    if not choices:
+        return ""
+    content = (choices[0].get("delta") or {}).get("content")
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    # Content may also arrive as a list of strings or of typed text parts
+    return "".join(
+        part if isinstance(part, str) else part.get("text", "")
+        for part in content
+    )
+
+
+class AgentProfile:
+    """
+    Definition of one agent: its instructions, model, tools and token limits.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        model: str,
+        instructions: Optional[List[str]] = None,
+        about: str = AGENT_ABOUT,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        max_tokens: Optional[int] = None,
+        prompt_cost_per_1k: Optional[float] = None,
+        completion_cost_per_1k: Optional[float] = None,
+        agent_id: Optional[str] = None
+    ):
+        """
+        Initialize the profile.
+        
+        Args:
+            name (str): Name of the profile, used for routing and in metrics.
+            model (str): Model the agent runs on.
+            instructions (Optional[List[str]]): Agent instructions; the research
+                assistant's instructions by default.
+            about (str): Description of the agent.
+            tools (Optional[List[Dict[str, Any]]]): Tools attached to the agent; the
+                Wikipedia tool by default.
+            max_tokens (Optional[int]): Completion token limit of each chat, if any.
+            prompt_cost_per_1k (Optional[float]): Dollars per 1,000 prompt tokens;
+                taken from MODEL_PRICES when not set.
+            completion_cost_per_1k (Optional[float]): Dollars per 1,000 completion
+                tokens; taken from MODEL_PRICES when not set.
+            agent_id (Optional[str]): Existing agent to use instead of bootstrapping one.
+        """
+        default_prices = MODEL_PRICES.get(model, (0.0, 0.0))
+        self.name = name
+        self.model = model
+        self.instructions = instructions if instructions is not None else AGENT_INSTRUCTIONS
+        self.about = about
+        self.tools = tools if tools is not None else [WIKIPEDIA_TOOL]
+        self.max_tokens = max_tokens
+        self.prompt_cost_per_1k = default_prices[0] if prompt_cost_per_1k is None else prompt_cost_per_1k
+        self.completion_cost_per_1k = (
+            default_prices[1] if completion_cost_per_1k is None else completion_cost_per_1k
+        )
+        self.agent_id = agent_id
+        self._definition_hash: Optional[str] = None
+    
+    @property
+    def agent_name(self) -> str:
+        """Name of the agent in Julep."""
+        return AGENT_NAME if self.name == DEFAULT_PROFILE else f"{AGENT_NAME} ({self.name})"
+    
+    @property
+    def definition_hash(self) -> str:
+        """
+        Hash of everything that defines the agent: instructions, model and tools.
+        
+        Computed on first use; profiles are not changed once built.
+        
+        Returns:
+            str: A hex digest that changes whenever the agent definition changes.
+        """
+        if self._definition_hash is None:
+            definition = {
+                "name": self.agent_name,
+                "about": self.about,
+                "instructions": self.instructions,
+                "model": self.model,
+                "tools": self.tools,
+            }
+            self._definition_hash = hashlib.sha256(
+                json.dumps(definition, sort_keys=True).encode("utf-8")
+            ).hexdigest()
+        return self._definition_hash
+    
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        """
+        Estimate the cost of a call.
+        
+        Args:
+            prompt_tokens (int): Prompt tokens used.
+            completion_tokens (int): Completion tokens used.
+            
+        Returns:
+            float: The estimated cost in dollars.
+        """
+        return (prompt_tokens * self.prompt_cost_per_1k + completion_tokens * self.completion_cost_per_1k) / 1000
+
+
+def build_profiles(settings: Settings) -> Dict[str, AgentProfile]:
+    """
+    Build the agent profiles described by the application settings.
+    
+    The built-in "research" profile is the original research assistant on
+    JULEP_MODEL, and "brief" runs the same instructions on JULEP_FAST_MODEL with a
+    lower token limit. AGENT_PROFILES overrides their fields or adds profiles.
+    
+    Args:
+        settings (Settings): Application settings.
+        
+    Returns:
+        Dict[str, AgentProfile]: The profiles keyed by name.
+        
+    Raises:
+        TypeError: If a configured profile has an unknown field.
+    """
+    options: Dict[str, Dict[str, Any]] = {
+        DEFAULT_PROFILE: {"model": settings.JULEP_MODEL, "agent_id": settings.JULEP_AGENT_ID},
+        "brief": {"model": settings.JULEP_FAST_MODEL, "max_tokens": 400},
+    }
+    for name, overrides in settings.AGENT_PROFILES.items():
+        options[name] = {"model": settings.JULEP_MODEL, **options.get(name, {}), **overrides}
+    return {name: AgentProfile(name=name, **profile_options) for name, profile_options in options.items()}
+
 
 class JulepAgentManager:
     """
@@ -22,15 +276,90 @@ class JulepAgentManager:
     """
     
     def __init__(self):
-        """Initialize the Julep client and agent reference."""
+        """Initialize the agent reference; the Julep client is built on first use."""
         self.settings = get_settings()
-        self.julep = Julep(api_key=self.settings.JULEP_API_KEY)
+        # Profiles are built once, and again by reload_profiles
+        self._profiles = build_profiles(self.settings)
+        self.http_client = create_http_client(self.settings)
+        self._julep: Optional["Julep"] = None
+        self._client_lock = threading.Lock()
+        # Whether the background warm-up after startup has finished
+        self.warmed_up = False
+        # Why the latest bootstrap attempt after startup failed, if it did
+        self.bootstrap_error: Optional[str] = None
         self._agent_id: Optional[str] = None
+        # Agent IDs of the profiles other than the default one
+        self._profile_agent_ids: Dict[str, str] = {}
+        self._bootstrap_lock = threading.Lock()
+        # The Julep SDK client is synchronous, so blocking calls are offloaded to
+        # a bounded thread pool to keep the event loop free while waiting on I/O.
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.settings.JULEP_MAX_WORKERS,
+            thread_name_prefix="julep",
+        )
+        self.retry_policy = RetryPolicy(
+            max_attempts=self.settings.UPSTREAM_MAX_ATTEMPTS,
+            attempt_timeout=self.settings.UPSTREAM_CALL_TIMEOUT,
+            backoff_base=self.settings.UPSTREAM_BACKOFF_BASE,
+            backoff_max=self.settings.UPSTREAM_BACKOFF_MAX,
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=self.settings.BREAKER_FAILURE_THRESHOLD,
+            recovery_time=self.settings.BREAKER_RECOVERY_TIME,
+            half_open_max_calls=self.settings.BREAKER_HALF_OPEN_CALLS,
+        )
+        self.session_pool: Optional[SessionPool] = None
+        if self.settings.SESSION_POOL_ENABLED:
+            self.session_pool = SessionPool(
+                create_session=lambda situation, output_format: self.acreate_session(
+                    situation=situation,
+                    profile=self.resolve_profile(output_format).name
+                ),
+                size=self.settings.SESSION_POOL_SIZE,
+                max_uses=self.settings.SESSION_POOL_MAX_USES,
+                idle_timeout=self.settings.SESSION_POOL_IDLE_TIMEOUT,
+            )
+    
+    @property
+    def julep(self) -> "Julep":
+        """
+        Get the Julep SDK client, importing the SDK and building the client on first use.
+        
+        Importing the SDK takes seconds, so it is kept off the import of this module
+        and off the startup path of the server.
+        
+        Returns:
+            Julep: The Julep client.
+        """
+        if self._julep is None:
+            with self._client_lock:
+                if self._julep is None:
+                    from julep import Julep
+                    
+                    # Retries are handled by call_with_retry, so the SDK's own retries are
+                    # turned off to avoid multiplying attempts during upstream incidents.
+                    self._julep = Julep(
+                        api_key=self.settings.JULEP_API_KEY,
+                        base_url=self.settings.JULEP_BASE_URL,
+                        max_retries=0,
+                        http_client=self.http_client,
+                    )
+        return self._julep
+    
+    @julep.setter
+    def julep(self, client: Any) -> None:
+        """Replace the Julep client, for example with a test double."""
+        self._julep = client
+    
+    @property
+    def bootstrapped(self) -> bool:
+        """Whether the agent of the default profile has been resolved."""
+        return self._agent_id is not None
     
     @property
     def agent_id(self) -> str:
         """
-        Get the agent ID, creating the agent if it doesn't exist yet.
+        Get the agent ID, bootstrapping the agent if that has not happened yet.
         
         Returns:
             str: The ID of the research assistant agent.
@@ -39,17 +368,169 @@ class JulepAgentManager:
             Exception: If there is an error creating the agent.
         """
         if self._agent_id is None:
+            self.bootstrap()
+        return self._agent_id
+    
+    @property
+    def profiles(self) -> Dict[str, AgentProfile]:
+        """
+        Get the agent profiles, as built from the settings.
+        
+        Returns:
+            Dict[str, AgentProfile]: The profiles keyed by name.
+        """
+        return self._profiles
+    
+    def reload_profiles(self, settings: Optional[Settings] = None) -> None:
+        """
+        Rebuild the agent profiles, for example after the settings were reloaded.
+        
+        Profiles whose definition changed forget their agent, so that an agent
+        matching the new definition is bootstrapped on first use.
+        
+        Args:
+            settings (Optional[Settings]): The new settings, which the manager then
+                uses; its current settings when not given.
+        """
+        if settings is not None:
+            self.settings = settings
+        profiles = build_profiles(self.settings)
+        with self._bootstrap_lock:
+            for name, previous in self._profiles.items():
+                profile = profiles.get(name)
+                if profile is not None and profile.definition_hash == previous.definition_hash \
+                        and profile.agent_id == previous.agent_id:
+                    continue
+                if name == DEFAULT_PROFILE:
+                    self._agent_id = None
+                else:
+                    self._profile_agent_ids.pop(name, None)
+            self._profiles = profiles
+    
+    @property
+    def definition_hash(self) -> str:
+        """
+        Hash of everything that defines the default agent: instructions, model and tools.
+        
+        Returns:
+            str: A hex digest that changes whenever the agent definition changes.
+        """
+        return self.profiles[DEFAULT_PROFILE].definition_hash
+    
+    def resolve_profile(self, output_format: str, hint: Optional[str] = None) -> AgentProfile:
+        """
+        Choose the agent profile for a request.
+        
+        A known profile named by the request hint wins; otherwise the profile is
+        routed by output format through AGENT_ROUTES, falling back to the default.
+        
+        Args:
+            output_format (str): The normalized output format.
+            hint (Optional[str]): Profile requested by the client, if any.
+            
+        Returns:
+            AgentProfile: The chosen profile.
+        """
+        profiles = self.profiles
+        if hint in profiles:
+            return profiles[hint]
+        routed = self.settings.AGENT_ROUTES.get(output_format, DEFAULT_PROFILE)
+        return profiles.get(routed, profiles[DEFAULT_PROFILE])
+    
+    def profile_agent_id(self, profile: str) -> str:
+        """
+        Get the agent ID of a profile, bootstrapping its agent if needed.
+        
+        Args:
+            profile (str): Name of the profile.
+            
+        Returns:
+            str: The ID of the profile's agent.
+        """
+        if profile == DEFAULT_PROFILE:
+            return self.agent_id
+        agent_id = self._profile_agent_ids.get(profile)
+        if agent_id is None:
+            agent_id = self.bootstrap(profile)
+        return agent_id
+    
+    def bootstrap(self, profile: str = DEFAULT_PROFILE) -> str:
+        """
+        Resolve a profile's agent ID once, reusing a configured or persisted agent when possible.
+        
+        The ID comes from the profile's configured agent ID (JULEP_AGENT_ID for the
+        default profile) when set. Otherwise it is looked up in the agent state file
+        under the profile's definition hash, and an agent is only created (and
+        persisted) when no agent matches the definition. A thread lock and a lock on
+        the state file keep concurrent callers and processes from creating duplicate agents.
+        
+        Args:
+            profile (str): Name of the profile to bootstrap.
+        
+        Returns:
+            str: The ID of the profile's agent.
+            
+        Raises:
+            KeyError: If the profile does not exist.
+            Exception: If there is an error creating the agent.
+        """
+        with self._bootstrap_lock:
+            agent_id = self._agent_id if profile == DEFAULT_PROFILE else self._profile_agent_ids.get(profile)
+            if agent_id is not None:
+                return agent_id
+            
+            definition = self.profiles[profile]
+            if definition.agent_id:
+                logger.info("Using configured agent ID for profile '%s': %s", profile, definition.agent_id)
+                agent_id = definition.agent_id
+            else:
+                definition_hash = definition.definition_hash
+                try:
+                    with _locked_state_file(self.settings.AGENT_STATE_FILE) as state:
+                        agent_id = state.get(definition_hash)
+                        if agent_id is not None:
+                            logger.info("Reusing persisted agent for profile '%s' with ID: %s", profile, agent_id)
+                        else:
+                            with timed("agent_bootstrap"):
+                                agent_id = self.create_research_agent(definition).id
+                            state[definition_hash] = agent_id
+                except Exception as e:
+                    logger.error("Failed to get agent ID for profile '%s': %s", profile, e)
+                    raise
+            
+            if profile == DEFAULT_PROFILE:
+                self._agent_id = agent_id
+            else:
+                self._profile_agent_ids[profile] = agent_id
+            return agent_id
+    
+    async def abootstrap(self) -> str:
+        """
+        Bootstrap every agent profile without blocking the event loop.
+        
+        The default profile must succeed. Other profiles that fail are logged and
+        bootstrapped again on first use.
+        
+        Returns:
+            str: The ID of the default research assistant agent.
+        """
+        agent_id = await self._run_blocking(self.bootstrap)
+        for profile in self.profiles:
+            if profile == DEFAULT_PROFILE:
+                continue
             try:
-                agent = self.create_research_agent()
-                self._agent_id = agent.id
+                await self._run_blocking(self.bootstrap, profile)
             except Exception as e:
-                logger.error(f"Failed to get agent ID: {str(e)}")
-                raise
-        return self._agent_id
+                logger.warning("Could not bootstrap agent profile '%s': %s", profile, e)
+        return agent_id
     
-    def create_research_agent(self) -> Any:
+    def create_research_agent(self, profile: Optional[AgentProfile] = None) -> Any:
         """
-        Create a research assistant agent in Julep with Wikipedia tool integration.
+        Create a research assistant agent in Julep with its tools attached.
+        
+        Args:
+            profile (Optional[AgentProfile]): Definition of the agent; the default
+                profile when not given.
         
         Returns:
             Any: The created agent object from Julep.
@@ -58,44 +539,32 @@ class JulepAgentManager:
             Exception: If there's an error in creating the agent or attaching tools.
         """
         try:
+            if profile is None:
+                profile = self.profiles[DEFAULT_PROFILE]
             # Create the base agent
-            logger.info("Creating research assistant agent...")
+            logger.info("Creating research assistant agent for profile '%s'...", profile.name)
             agent = self.julep.agents.create(
-                name="Research Assistant",
-                about="An AI research assistant that provides information in requested formats",
-                instructions=[
-                    # Layer 1: Base Instruction - Core role
-                    "You are a helpful research assistant. Your goal is to find concise information on topics provided by the user.",
-                    
-                    # Layer 2: Task Instruction - Primary task
-                    "When given a topic and an output format (e.g., 'summary', 'bullet points', 'short report'), you must gather relevant information and structure it according to the requested format.",
-                    
-                    # Layer 3: Persona/Formatting Instruction - Tone and constraints
-                    "Maintain a neutral, objective tone. Strictly adhere to the requested output format. Keep summaries to 3-4 sentences, bullet points concise (max 5 points), and short reports under 150 words. If you cannot find reliable information, state that clearly."
-                ],
-                model=self.settings.JULEP_MODEL,
+                name=profile.agent_name,
+                about=profile.about,
+                instructions=profile.instructions,
+                model=profile.model,
             )
             
-            logger.info(f"Successfully created agent with ID: {agent.id}")
+            logger.info("Successfully created agent with ID: %s", agent.id)
             
-            # Attach the Wikipedia search tool to the agent
-            try:
-                logger.info(f"Attaching Wikipedia tool to agent: {agent.id}")
-                self.julep.agents.tools.create(
-                    agent_id=agent.id,
-                    **{
-                        "name": "wikipedia_search",
-                        "type": "integration",
-                        "integration": {
-                            "provider": "wikipedia",
-                        }
-                    }
-                )
-                logger.info(f"Successfully attached Wikipedia tool to agent: {agent.id}")
-            except Exception as tool_error:
-                logger.warning(f"Error attaching Wikipedia tool to agent: {str(tool_error)}")
-                logger.warning("Continuing with agent creation without Wikipedia tool")
-                # We'll continue even if tool attachment fails, as the base agent can still function
+            # Attach the profile's tools, such as Wikipedia search, to the agent
+            for tool in profile.tools:
+                try:
+                    logger.info("Attaching %s tool to agent: %s", tool["name"], agent.id)
+                    self.julep.agents.tools.create(
+                        agent_id=agent.id,
+                        **tool
+                    )
+                    logger.info("Successfully attached %s tool to agent: %s", tool["name"], agent.id)
+                except Exception as tool_error:
+                    logger.warning("Error attaching %s tool to agent: %s", tool["name"], tool_error)
+                    logger.warning("Continuing with agent creation without %s tool", tool["name"])
+                    # We'll continue even if tool attachment fails, as the base agent can still function
                 
             return agent
             
@@ -105,12 +574,14 @@ class JulepAgentManager:
             # Re-raise the exception to be handled by the caller
             raise
     
-    def create_session(self, situation: str) -> Any:
+    def create_session(self, situation: str, profile: str = DEFAULT_PROFILE, **options: Any) -> Any:
         """
-        Create a new session with the research assistant agent.
+        Create a new session with the agent of a profile.
         
         Args:
             situation (str): Description of the user's situation.
+            profile (str): Name of the agent profile.
+            **options: Additional session parameters passed to the Julep API.
             
         Returns:
             Any: The created session object from Julep.
@@ -119,24 +590,26 @@ class JulepAgentManager:
             Exception: If there's an error creating the session.
         """
         try:
-            logger.info(f"Creating session with situation: {situation}")
+            logger.info("Creating session with situation: %s", situation)
             session = self.julep.sessions.create(
-                agent=self.agent_id,
+                agent=self.profile_agent_id(profile),
                 situation=situation,
+                **options
             )
-            logger.info(f"Session created successfully with ID: {session.id}")
+            logger.info("Session created successfully with ID: %s", session.id)
             return session
         except Exception as e:
-            logger.error(f"Failed to create session: {str(e)}")
+            logger.error("Failed to create session: %s", e)
             raise
     
-    def chat(self, session_id: str, messages: list) -> Any:
+    def chat(self, session_id: str, messages: list, **options: Any) -> Any:
         """
         Send a message to the agent and get a response.
         
         Args:
             session_id (str): ID of the session to use.
             messages (list): List of message objects to send.
+            **options: Additional chat parameters passed to the Julep API.
             
         Returns:
             Any: The response from the agent.
@@ -145,17 +618,342 @@ class JulepAgentManager:
             Exception: If there's an error in the chat process.
         """
         try:
-            logger.info(f"Sending messages to session: {session_id}")
+            logger.info("Sending messages to session: %s", session_id)
             response = self.julep.sessions.chat(
                 session_id=session_id,
-                messages=messages
+                messages=messages,
+                **options
             )
             logger.info("Received response from Julep")
             return response
         except Exception as e:
-            logger.error(f"Failed to chat with agent: {str(e)}")
+            logger.error("Failed to chat with agent: %s", e)
             raise
+    
+    def stream_chat(self, session_id: str, messages: list, **options: Any) -> Iterator[str]:
+        """
+        Send a message to the agent and yield the response text as it is generated.
+        
+        Args:
+            session_id (str): ID of the session to use.
+            messages (list): List of message objects to send.
+            **options: Additional chat parameters passed to the Julep API.
+            
+        Yields:
+            str: Pieces of the response text in the order they arrive.
+            
+        Raises:
+            Exception: If there's an error in the chat process.
+        """
+        try:
+            logger.info("Streaming messages to session: %s", session_id)
+            with self.julep.sessions.with_streaming_response.chat(
+                session_id=session_id,
+                messages=messages,
+                stream=True,
+                **options
+            ) as response:
+                for line in response.iter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    text = _chunk_text(json.loads(data))
+                    if text:
+                        yield text
+            logger.info("Finished streaming response from Julep")
+        except Exception as e:
+            logger.error("Failed to stream chat with agent: %s", e)
+            raise
+    
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking callable on the Julep thread pool.
+        
+        Args:
+            func (Callable[..., Any]): The blocking callable to run.
+            *args: Positional arguments for the callable.
+            **kwargs: Keyword arguments for the callable.
+            
+        Returns:
+            Any: The value returned by the callable.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+    
+    async def _call_upstream(self, operation: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking Julep call with timeouts, retries and the circuit breaker.
+        
+        The attempt timeout is also passed to the SDK, so a timed-out attempt
+        releases its worker thread instead of waiting on the connection.
+        
+        Args:
+            operation (str): Name of the call, used in logs and metrics.
+            func (Callable[..., Any]): The blocking SDK wrapper to run; must accept a
+                `timeout` keyword argument.
+            *args: Positional arguments for the callable.
+            **kwargs: Keyword arguments for the callable.
+            
+        Returns:
+            Any: The value returned by the callable.
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker refuses the call.
+            DeadlineExceeded: If the request deadline passes before the call succeeds.
+        """
+        async def attempt(timeout: float) -> Any:
+            return await self._run_blocking(func, *args, timeout=request_timeout(timeout, self.settings), **kwargs)
+        
+        return await call_with_retry(attempt, self.retry_policy, self.breaker, operation)
+    
+    async def acreate_session(self, situation: str, profile: str = DEFAULT_PROFILE) -> Any:
+        """
+        Create a new session without blocking the event loop.
+        
+        Args:
+            situation (str): Description of the user's situation.
+            profile (str): Name of the agent profile.
+            
+        Returns:
+            Any: The created session object from Julep.
+        """
+        with timed("session_create"):
+            return await self._call_upstream(
+                "create_session", self.create_session, situation=situation, profile=profile
+            )
+    
+    async def achat(
+        self,
+        session_id: str,
+        messages: list,
+        profile: Optional[AgentProfile] = None,
+        **options: Any
+    ) -> Any:
+        """
+        Send a message to the agent without blocking the event loop.
+        
+        Args:
+            session_id (str): ID of the session to use.
+            messages (list): List of message objects to send.
+            profile (Optional[AgentProfile]): Profile of the session's agent, whose
+                token limit applies and whose latency, tokens and cost are recorded.
+            **options: Additional chat parameters passed to the Julep API.
+            
+        Returns:
+            Any: The response from the agent.
+        """
+        if profile is not None and profile.max_tokens is not None:
+            options.setdefault("max_tokens", profile.max_tokens)
+        start = time.perf_counter()
+        with timed("chat"):
+            response = await self._call_upstream("chat", self.chat, session_id, messages, **options)
+        if profile is not None:
+            PROFILE_LATENCY.observe(time.perf_counter() - start, profile=profile.name, mode="chat")
+            self._record_usage(profile, response)
+        return response
+    
+    @staticmethod
+    def _record_usage(profile: AgentProfile, response: Any) -> None:
+        """Count the tokens and estimated cost a chat response reports, if any."""
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        completion_tokens = getattr(usage, "completion_tokens", None) or 0
+        if not isinstance(prompt_tokens, int) or not isinstance(completion_tokens, int):
+            return
+        PROFILE_TOKENS.inc(prompt_tokens, profile=profile.name, kind="prompt")
+        PROFILE_TOKENS.inc(completion_tokens, profile=profile.name, kind="completion")
+        PROFILE_COST.inc(profile.cost(prompt_tokens, completion_tokens), profile=profile.name)
+    
+    async def astream_chat(
+        self,
+        session_id: str,
+        messages: list,
+        profile: Optional[AgentProfile] = None,
+        **options: Any
+    ) -> AsyncIterator[str]:
+        """
+        Stream the agent's response without blocking the event loop.
+        
+        The blocking stream is consumed on the Julep thread pool and relayed through
+        a queue. The stream stops early if the consumer goes away. Streams pass
+        through the circuit breaker but are not retried, since part of the response
+        may already have been delivered.
+        
+        Args:
+            session_id (str): ID of the session to use.
+            messages (list): List of message objects to send.
+            profile (Optional[AgentProfile]): Profile of the session's agent, whose
+                token limit applies and whose latency is recorded. Streams report no
+                token usage, so they are not counted in the profile's cost.
+            **options: Additional chat parameters passed to the Julep API.
+            
+        Yields:
+            str: Pieces of the response text in the order they arrive.
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker refuses the call.
+        """
+        self.breaker.before_call()
+        if profile is not None and profile.max_tokens is not None:
+            options.setdefault("max_tokens", profile.max_tokens)
+        start = time.perf_counter()
+        options.setdefault("timeout", request_timeout(self.settings.UPSTREAM_CALL_TIMEOUT, self.settings))
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+        stopped = threading.Event()
+        
+        def put(item: tuple) -> None:
+            if not stopped.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        
+        def produce() -> None:
+            try:
+                for text in self.stream_chat(session_id, messages, **options):
+                    if stopped.is_set():
+                        return
+                    put((text, None))
+            except Exception as e:
+                put((None, e))
+                return
+            put((None, None))
+        
+        loop.run_in_executor(self._executor, produce)
+        finished = False
+        try:
+            while True:
+                text, error = await queue.get()
+                if error is not None:
+                    finished = True
+                    if is_retryable(error):
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                    raise error
+                if text is None:
+                    finished = True
+                    self.breaker.record_success()
+                    if profile is not None:
+                        PROFILE_LATENCY.observe(time.perf_counter() - start, profile=profile.name, mode="stream")
+                    return
+                yield text
+        finally:
+            stopped.set()
+            if not finished:
+                self.breaker.record_abandoned()
+    
+    async def lease_session(
+        self,
+        output_format: str,
+        situation: str,
+        profile: Optional[AgentProfile] = None
+    ) -> SessionLease:
+        """
+        Lease a session for a research request.
+        
+        Known output formats are served from the warm session pool when it is
+        enabled and the request uses the profile the format is routed to;
+        otherwise a dedicated session is created for the situation.
+        
+        Args:
+            output_format (str): The normalized output format.
+            situation (str): Situation used when a dedicated session is created.
+            profile (Optional[AgentProfile]): Agent profile of the session; the
+                profile routed for the format when not given.
+            
+        Returns:
+            SessionLease: The leased session. Pooled sessions must be used with
+                `save=False` so that no history leaks between requests.
+        """
+        routed = self.resolve_profile(output_format)
+        if profile is None:
+            profile = routed
+        if self.session_pool is not None and output_format in POOLED_FORMATS and profile.name == routed.name:
+            return await self.session_pool.lease(output_format)
+        session = await self.acreate_session(situation=situation, profile=profile.name)
+        return SessionLease(session, output_format, pooled=False, clock=time.monotonic)
+    
+    def release_session(self, lease: SessionLease, failed: bool = False) -> None:
+        """
+        Return a leased session once the request is done with it.
+        
+        Args:
+            lease (SessionLease): The lease to return.
+            failed (bool): Whether the request using the session failed.
+        """
+        if lease.pooled and self.session_pool is not None:
+            self.session_pool.release(lease, failed=failed)
+    
+    async def warm_session_pool(self) -> None:
+        """Pre-create pooled sessions for every known output format."""
+        if self.session_pool is not None:
+            logger.info("Warming session pool...")
+            await self.session_pool.warm(sorted(POOLED_FORMATS))
+    
+    async def start_up(self) -> None:
+        """
+        Bootstrap the agent and warm up in the background.
+        
+        Bootstrapping is retried with a growing delay until it succeeds, so that a
+        replica started while Julep is unreachable stays alive and not ready, with
+        the latest failure in `bootstrap_error`, instead of crashing.
+        """
+        delay = BOOTSTRAP_RETRY_INITIAL
+        while True:
+            try:
+                await self.abootstrap()
+                break
+            except Exception as e:
+                self.bootstrap_error = str(e) or type(e).__name__
+                logger.error("Could not bootstrap the agent, retrying in %.0fs: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, BOOTSTRAP_RETRY_MAX)
+        self.bootstrap_error = None
+        await self.warm_up()
+    
+    async def warm_up(self) -> None:
+        """
+        Load the Julep client and fill the session pool in the background.
+        
+        Run after startup so that a new replica answers health checks while the
+        SDK is imported, instead of after. Failures are logged; the client is then
+        built and sessions created on first use.
+        """
+        try:
+            with timed("sdk_import"):
+                await self._run_blocking(lambda: self.julep)
+            await self.warm_session_pool()
+        except Exception as e:
+            logger.warning("Could not warm up the Julep client: %s", e)
+        finally:
+            # Failed session creations count against the circuit breaker, which
+            # readiness also reflects, so an unreachable upstream keeps it false
+            self.warmed_up = True
+            logger.info("Warm-up finished")
+    
+    def close(self) -> None:
+        """Release the thread pool and the pooled connections used for Julep calls."""
+        self._executor.shutdown(wait=False)
+        close_http_client(self.http_client)
+
+
+_agent_manager: Optional[JulepAgentManager] = None
+_agent_manager_lock = threading.Lock()
 
 
-# Create a singleton instance
-agent_manager = JulepAgentManager()
\ No newline at end of file
+def get_agent_manager() -> JulepAgentManager:
+    """
+    Get the shared agent manager, building it on first use.
+    
+    Returns:
+        JulepAgentManager: The agent manager of this process.
+    """
+    global _agent_manager
+    manager = _agent_manager
+    if manager is None:
+        with _agent_manager_lock:
+            if _agent_manager is None:
+                _agent_manager = JulepAgentManager()
+            manager = _agent_manager
+    return manager
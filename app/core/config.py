@@ -5,7 +5,8 @@ This module contains configuration settings that are loaded from environment var
 """
 
 import os
-from typing import Optional
+import threading
+from typing import Any, Dict, List, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -19,9 +20,155 @@ class Settings(BaseSettings):
     API_DESCRIPTION: str = "API for research assistant powered by Julep AI"
     API_VERSION: str = "0.1.0"
     
+    # Server settings
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WORKERS: Optional[int] = None  # Worker processes; defaults to the number of CPUs
+    UVICORN_LOOP: str = "auto"  # Event loop implementation: auto, asyncio or uvloop
+    UVICORN_HTTP: str = "auto"  # HTTP parser: auto, h11 or httptools
+    KEEPALIVE_TIMEOUT: int = 5  # Seconds to keep idle HTTP connections open
+    BACKLOG: int = 2048  # Maximum number of pending connections
+    READINESS_MAX_SATURATION: float = 0.9  # Fill of the admission or job queue above which /readyz fails
+    
+    # Logging settings
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # "text" or "json"
+    LOG_INFO_SAMPLE_RATE: float = 1.0  # Fraction of INFO lines kept
+    
     # Julep settings
     JULEP_API_KEY: str
     JULEP_MODEL: str = "gpt-4o"
+    JULEP_BASE_URL: Optional[str] = None  # Override the Julep API URL, e.g. for the benchmark fake server
+    JULEP_AGENT_ID: Optional[str] = None  # Use an existing agent instead of bootstrapping one
+    AGENT_STATE_FILE: str = ".agent_state.json"  # Persisted agent IDs keyed by definition hash
+    
+    # Agent profile settings
+    JULEP_FAST_MODEL: str = "gpt-4o-mini"  # Model of the built-in "brief" profile
+    AGENT_PROFILES: Dict[str, Dict[str, Any]] = {}  # Profile fields overriding or adding to the built-in profiles
+    AGENT_ROUTES: Dict[str, str] = {  # Profile used for each normalized output format
+        "summary": "brief",
+        "bullet points": "brief",
+        "short report": "research",
+    }
+    
+    # Concurrency settings
+    JULEP_MAX_WORKERS: int = 256  # Threads available for blocking Julep SDK calls
+    
+    # Julep HTTP transport settings, shared by every Julep call of the process
+    JULEP_HTTP_MAX_CONNECTIONS: int = 256  # At least JULEP_MAX_WORKERS, so threads never wait for a connection
+    JULEP_HTTP_MAX_KEEPALIVE: int = 64  # Idle connections kept open for reuse
+    JULEP_HTTP_KEEPALIVE_EXPIRY: float = 60.0  # Seconds an idle connection is kept open
+    JULEP_HTTP_CONNECT_TIMEOUT: float = 5.0
+    JULEP_HTTP_READ_TIMEOUT: float = 30.0  # Default for calls made without an attempt timeout
+    JULEP_HTTP_POOL_TIMEOUT: float = 10.0  # Seconds to wait for a free pooled connection
+    JULEP_HTTP2: bool = False  # Requires the h2 package
+    
+    # Resilience settings
+    REQUEST_DEADLINE_SECONDS: Optional[float] = 60.0  # Time budget of a research request; None for no deadline
+    UPSTREAM_CALL_TIMEOUT: float = 30.0  # Timeout of a single Julep call attempt
+    UPSTREAM_MAX_ATTEMPTS: int = 3  # Attempts per Julep call, including the first
+    UPSTREAM_BACKOFF_BASE: float = 0.25  # Backoff ceiling before the first retry, in seconds
+    UPSTREAM_BACKOFF_MAX: float = 4.0  # Upper bound of the backoff ceiling, in seconds
+    BREAKER_FAILURE_THRESHOLD: int = 5  # Consecutive failures that open the circuit breaker
+    BREAKER_RECOVERY_TIME: float = 30.0  # Seconds the breaker stays open before probing
+    BREAKER_HALF_OPEN_CALLS: int = 1  # Probe calls allowed while half-open
+    
+    # Session pool settings
+    SESSION_POOL_ENABLED: bool = True
+    SESSION_POOL_SIZE: int = 4  # Idle sessions kept per output format
+    SESSION_POOL_MAX_USES: int = 100  # Leases before a session is retired
+    SESSION_POOL_IDLE_TIMEOUT: float = 600.0  # Seconds before an idle session is retired
+    
+    # Admission control settings
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 128  # Upstream research calls running at once
+    ADMISSION_MAX_QUEUE: int = 512  # Requests waiting for a slot before 429s are returned
+    ADMISSION_MAX_QUEUE_TIME: float = 15.0  # Seconds a request may wait before a 503
+    ADMISSION_FORMAT_LIMITS: Dict[str, int] = {}  # Per-format limits, e.g. {"short report": 16}
+    
+    # Scheduling settings
+    PRIORITY_WEIGHTS: Dict[str, float] = {"interactive": 8.0, "batch": 1.0}  # Share of upstream slots per class
+    DEFAULT_PRIORITY_CLASS: str = "interactive"  # Class of requests that do not choose one
+    BATCH_PRIORITY_CLASS: str = "batch"  # Default class of /research/batch requests
+    API_KEY_PRIORITIES: Dict[str, str] = {}  # Class of each API key sent in X-API-Key; overrides X-Priority
+    RATE_LIMIT_PER_CLIENT: Optional[float] = None  # Requests per second per client; None disables
+    RATE_LIMIT_BURST: float = 20.0  # Requests a client may send at once after being idle
+    
+    # Result cache settings
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: float = 3600.0
+    CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    CACHE_SHARED_BACKEND: Optional[str] = None  # "sqlite" to share results across processes
+    CACHE_SQLITE_PATH: str = "research_cache.sqlite3"
+    
+    # Semantic cache settings (require numpy)
+    SEMANTIC_CACHE_ENABLED: bool = False  # Serve cached results for paraphrased topics
+    SEMANTIC_CACHE_THRESHOLD: float = 0.4  # Minimum cosine similarity of candidates, whose terms must also align
+    SEMANTIC_CACHE_DIM: int = 1024  # Dimensions of the hashed topic vectors
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 5000  # Indexed topics per output format
+    SEMANTIC_CACHE_DIR: Optional[str] = None  # Directory of index snapshots; None keeps them in memory only
+    
+    # Request coalescing settings
+    COALESCING_ENABLED: bool = True  # Share one upstream call between identical concurrent requests
+    
+    # Batch settings
+    BATCH_MAX_ITEMS: int = 1000
+    BATCH_MAX_CONCURRENCY: int = 8  # Items of one batch researched at once
+    
+    # Response compression settings (brotli is used when installed, else gzip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Smallest response body in bytes that is compressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    
+    # Background job settings
+    JOBS_ENABLED: bool = True
+    JOBS_DB_PATH: str = "research_jobs.sqlite3"  # SQLite queue shared by every worker process
+    JOBS_WORKERS: int = 4  # Jobs run at once by each process
+    JOBS_RESULT_TTL: float = 86400.0  # Seconds finished jobs are kept
+    JOBS_POLL_INTERVAL: float = 1.0  # Seconds between polls of the queue when idle
+    JOBS_MAX_QUEUED: int = 10000  # Submissions are rejected with 429 beyond this
+    JOBS_CALLBACK_TIMEOUT: float = 10.0
+    JOBS_CALLBACK_ALLOWED_HOSTS: List[str] = []  # Hosts callbacks may go to; ".example.com" allows subdomains
+    JOBS_CALLBACK_ALLOW_HTTP: bool = False  # Allow plain-HTTP callback URLs, e.g. inside a private network
+    JOBS_LEASE_SECONDS: float = 60.0  # Running jobs not renewed for this long are requeued for other workers
+    JOBS_MAX_ATTEMPTS: int = 5  # Runs of a job that keeps hitting 429/503/504 from upstream before it fails
+    
+    # Cache priming settings
+    PRIME_FILE: Optional[str] = None  # Topic list (CSV or JSONL) primed in the background after startup
+    PRIME_RATE: float = 1.0  # Priming items started per second
+    PRIME_CONCURRENCY: int = 4  # Priming items researched at once
+    PRIME_PRIORITY_CLASS: str = "batch"  # Priority class of priming requests
+    PRIME_CHECKPOINT_FILE: Optional[str] = ".prime_checkpoint.json"  # Progress per source, for resuming; None disables
+    
+    # Request shaping settings
+    SHAPING_ENABLED: bool = True
+    INPUT_TOKEN_BUDGETS: Dict[str, int] = {  # Estimated topic tokens per normalized output format
+        "summary": 128,
+        "bullet points": 128,
+        "short report": 256,
+    }
+    DEFAULT_INPUT_TOKEN_BUDGET: int = 128  # Estimated topic tokens of formats not listed above
+    OUTPUT_TOKEN_BUDGETS: Dict[str, int] = {  # Completion token limit per format; profiles may set lower ones
+        "summary": 160,
+        "bullet points": 240,
+        "short report": 240,
+    }
+    OUTPUT_WORD_LIMITS: Dict[str, int] = {  # Answer length in words asked for in the prompt
+        "summary": 100,
+        "bullet points": 150,
+        "short report": 150,
+    }
+    OVERSIZED_TOPIC_POLICY: str = "truncate"  # "truncate" or "reject" topics over their budget, with 413
+    
+    # Follow-up conversation settings
+    CONVERSATIONS_ENABLED: bool = True  # Return a handle from /research for /research/{handle}/follow-up
+    CONVERSATION_MAX_HANDLES: int = 10000  # Least recently used handles are dropped beyond this
+    CONVERSATION_IDLE_TTL: float = 900.0  # Seconds after its last use that a handle expires
+    CONVERSATION_DB_PATH: Optional[str] = "research_conversations.sqlite3"  # Handle store shared by worker processes; None keeps handles in memory
+    
+    # Admin settings
+    ADMIN_API_KEY: Optional[str] = None  # Required in X-Admin-Key for /admin routes, which are disabled when unset
     
     class Config:
         """Pydantic config."""
@@ -29,11 +176,46 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+
 def get_settings() -> Settings:
     """
     Get application settings.
     
+    The environment and the .env file are parsed once; later calls return the
+    same instance until reload_settings() swaps in a new one.
+    
     Returns:
         Settings: Application settings loaded from environment variables.
     """
-    return Settings()
\ No newline at end of file
+    global _settings
+    settings = _settings
+    if settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = Settings()
+            settings = _settings
+    return settings
+
+
+def reload_settings() -> Settings:
+    """
+    Re-read the environment and the .env file and atomically swap in the result.
+    
+    If the new configuration is invalid, the current settings stay in place.
+    Settings consumed while building long-lived components (for example thread
+    pool, session pool and cache sizes) only take effect after a restart.
+    
+    Returns:
+        Settings: The newly loaded settings.
+        
+    Raises:
+        ValidationError: If the environment does not describe valid settings.
+    """
+    global _settings
+    settings = Settings()
+    with _settings_lock:
+        _settings = settings
+    return settings
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+HTTP transport for the Julep SDK client.
+
+This module builds the shared, pooled httpx client used for every Julep call,
+with connection limits, keep-alive and timeouts taken from the settings, and
+exports the utilization of its connection pool as metrics.
+"""
+
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import Settings
+from app.core.logging import setup_logger
+from app.core.metrics import REGISTRY, Counter, Gauge
+
+# Set up logger for this module
+logger = setup_logger(__name__)
+
+
+POOL_CONNECTIONS = REGISTRY.register(Gauge(
+    "julep_http_pool_connections",
+    "Connections in the Julep HTTP pool, by state",
+    labelnames=("state",),
+))
+POOL_WAITING = REGISTRY.register(Gauge(
+    "julep_http_pool_waiting_requests",
+    "Julep requests waiting for a pooled connection",
+))
+CONNECTIONS_OPENED = REGISTRY.register(Counter(
+    "julep_http_connections_opened_total",
+    "New connections opened to the Julep API; low values mean keep-alive is reused",
+    labelnames=("stage",),
+))
+
+
+def _trace(event_name: str, info: Dict[str, Any]) -> None:
+    """Count TCP connects and TLS handshakes reported by httpcore."""
+    if event_name == "connection.connect_tcp.complete":
+        CONNECTIONS_OPENED.inc(stage="tcp")
+    elif event_name == "connection.start_tls.complete":
+        CONNECTIONS_OPENED.inc(stage="tls")
+
+
+def _add_trace(request: httpx.Request) -> None:
+    """Attach the connection trace to an outgoing request."""
+    request.extensions.setdefault("trace", _trace)
+
+
+def pool_stats(client: httpx.Client) -> Dict[str, int]:
+    """
+    Count the connections of a client's pool by state.
+
+    This reads httpcore internals, so it reports zeros where they are unavailable.
+
+    Args:
+        client (httpx.Client): The client to inspect.
+
+    Returns:
+        Dict[str, int]: The number of "active" and "idle" connections and of
+            requests "waiting" for a connection.
+    """
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    requests = list(getattr(pool, "_requests", []) or [])
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {
+        "active": len(connections) - idle,
+        "idle": idle,
+        "waiting": sum(1 for status in requests if getattr(status, "connection", None) is None),
+    }
+
+
+def request_timeout(seconds: float, settings: Settings) -> httpx.Timeout:
+    """
+    Build the timeout of one Julep call attempt.
+
+    Passing a plain number to the SDK would apply it to every phase, so the
+    connect and pool timeouts from the settings are kept, bounded by the attempt.
+
+    Args:
+        seconds (float): Time allowed for the attempt.
+        settings (Settings): Application settings.
+
+    Returns:
+        httpx.Timeout: The timeout to pass to the SDK.
+    """
+    return httpx.Timeout(
+        seconds,
+        connect=min(seconds, settings.JULEP_HTTP_CONNECT_TIMEOUT),
+        pool=min(seconds, settings.JULEP_HTTP_POOL_TIMEOUT),
+    )
+
+
+def create_http_client(settings: Settings) -> httpx.Client:
+    """
+    Build the shared HTTP client for the Julep SDK.
+
+    Args:
+        settings (Settings): Application settings.
+
+    Returns:
+        httpx.Client: A pooled client whose utilization is exported as metrics.
+    """
+    http2 = settings.JULEP_HTTP2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("JULEP_HTTP2 is set but the h2 package is not installed; using HTTP/1.1")
+            http2 = False
+
+    client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=settings.JULEP_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.JULEP_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.JULEP_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            settings.JULEP_HTTP_READ_TIMEOUT,
+            connect=settings.JULEP_HTTP_CONNECT_TIMEOUT,
+            pool=settings.JULEP_HTTP_POOL_TIMEOUT,
+        ),
+        http2=http2,
+        follow_redirects=True,
+        event_hooks={"request": [_add_trace]},
+    )
+
+    def connection_counts() -> Dict[tuple, float]:
+        stats = pool_stats(client)
+        return {("active",): stats["active"], ("idle",): stats["idle"]}
+
+    POOL_CONNECTIONS.set_callback(connection_counts)
+    POOL_WAITING.set_callback(lambda: {(): pool_stats(client)["waiting"]})
+    return client
+
+
+def close_http_client(client: Optional[httpx.Client]) -> None:
+    """
+    Close a client's pooled connections.
+
+    Args:
+        client (Optional[httpx.Client]): The client to close, if any.
+    """
+    if client is not None and not client.is_closed:
+        client.close()
@@ -1,49 +1,215 @@
 """
 Logging configuration for the application.
+
+Module loggers enqueue records on a shared queue, and a background listener thread
+formats them and writes them to stdout, so request handlers never block on I/O.
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
-from typing import Optional
+from typing import Optional, Set
+
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatter emitting one JSON object per record.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record as JSON.
+
+        Args:
+            record (logging.LogRecord): The record to format.
+
+        Returns:
+            str: The JSON-encoded record.
+        """
+        entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry)
+
+
+class InfoSamplingFilter(logging.Filter):
+    """
+    Filter passing only a fraction of INFO records; other levels always pass.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        """
+        Initialize the filter.
+
+        Args:
+            rate (float): Fraction of INFO records to keep, between 0 and 1.
+        """
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Decide whether to keep a record.
+
+        Args:
+            record (logging.LogRecord): The record to check.
+
+        Returns:
+            bool: Whether the record should be logged.
+        """
+        if record.levelno != logging.INFO or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread.
+
+    The standard QueueHandler formats records before enqueueing them; this one
+    only merges the message arguments, which keeps the calling thread's work small.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Make a record safe to hand to another thread.
+
+        Args:
+            record (logging.LogRecord): The record to enqueue.
+
+        Returns:
+            logging.LogRecord: The record with its arguments merged into the message.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """
+    Stream handler writing to whatever sys.stdout is when a record is emitted.
+
+    Binding the stream at import would keep writing to a stream that was replaced
+    and closed in the meantime, such as one captured by a test runner.
+    """
+
+    def __init__(self):
+        """Initialize the handler without binding a stream."""
+        logging.Handler.__init__(self)
+
+    @property
+    def stream(self):
+        """The current standard output."""
+        return sys.stdout
+
+
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_output_handler = _StdoutHandler()
+_output_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+_sampling_filter = InfoSamplingFilter()
+_queue_handler = _DeferredQueueHandler(_queue)
+_queue_handler.addFilter(_sampling_filter)
+_listener = logging.handlers.QueueListener(_queue, _output_handler)
+_listener_started = False
+_level = logging.INFO
+_configured_loggers: Set[str] = set()
+
+
+def _start_listener() -> None:
+    """Start the background listener thread once per process."""
+    global _listener_started
+    if not _listener_started:
+        _listener.start()
+        atexit.register(_stop_listener)
+        _listener_started = True
+
+
+def _stop_listener() -> None:
+    """Write out the queued records and stop the listener thread, if it runs."""
+    global _listener_started
+    if _listener_started:
+        _listener.stop()
+        _listener_started = False
 
 
 def setup_logger(name: str, log_level: Optional[str] = None) -> logging.Logger:
     """
     Set up a logger with the specified name and level.
-    
+
     Args:
         name (str): Name of the logger.
-        log_level (Optional[str]): Log level as a string. Defaults to INFO if not specified.
-        
+        log_level (Optional[str]): Log level as a string. Defaults to the level set
+            by configure_logging(), which is INFO until it is called.
+
     Returns:
         logging.Logger: Configured logger.
     """
     # Determine log level
     if log_level is None:
-        level = logging.INFO
+        level = _level
     else:
         level = getattr(logging, log_level.upper())
-    
+
     # Create logger
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
-    # Create console handler if no handlers exist
+
+    # Attach the shared queue handler if no handlers exist
     if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(level)
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        
-        # Add handler to logger
-        logger.addHandler(handler)
-    
+        _start_listener()
+        logger.addHandler(_queue_handler)
+        if log_level is None:
+            _configured_loggers.add(name)
+
     return logger
 
 
+def configure_logging(
+    log_level: str = "INFO",
+    log_format: str = "text",
+    info_sample_rate: float = 1.0
+) -> None:
+    """
+    Apply application-wide logging options to every logger set up by this module.
+
+    Args:
+        log_level (str): Log level for loggers that did not request their own.
+        log_format (str): Output format, either "text" or "json".
+        info_sample_rate (float): Fraction of INFO records to keep, between 0 and 1.
+
+    Raises:
+        ValueError: If the log format is not recognised.
+    """
+    global _level
+    if log_format == "json":
+        _output_handler.setFormatter(JsonFormatter())
+    elif log_format == "text":
+        _output_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    else:
+        raise ValueError(f"Unknown log format: {log_format}")
+
+    _sampling_filter.rate = info_sample_rate
+    _level = getattr(logging, log_level.upper())
+    for name in _configured_loggers:
+        logging.getLogger(name).setLevel(_level)
+
+
 # Create a default application logger
-logger = setup_logger("julep_research_assistant")
\ No newline at end of file
+logger = setup_logger("julep_research_assistant")
@@ -0,0 +1,405 @@
+"""
+In-process metrics and request timing.
+
+This module contains small Prometheus-style metric types, the registry rendered
+by the /metrics endpoint, and the timing spans behind the Server-Timing header.
+"""
+
+import asyncio
+import bisect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+LabelValues = Tuple[str, ...]
+
+# Latency buckets in seconds, spanning cache hits to long LLM generations
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Quantiles reported from the recent observations of each histogram
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Buckets in seconds for event loop lag, which should stay in the low milliseconds
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render a Prometheus label set."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """
+    Base class for metrics with an optional set of labels.
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize the metric.
+
+        Args:
+            name (str): Metric name.
+            help_text (str): Description shown in the exposition output.
+            labelnames (Sequence[str]): Names of the labels the metric is split by.
+        """
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        """Order label values as declared."""
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        """Render the metric in the Prometheus text format."""
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing count.
+    """
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """
+        Increase the counter.
+
+        Args:
+            amount (float): Amount to add.
+            **labels: Label values.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Get the current value for a label set."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down, or be read from a callback at render time.
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback: Optional[Callable[[], Dict[LabelValues, float]]] = None
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge to a value."""
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the gauge."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Decrease the gauge."""
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        """Get the current value for a label set."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def set_callback(self, callback: Callable[[], Dict[LabelValues, float]]) -> None:
+        """
+        Read the gauge from a callback whenever metrics are rendered.
+
+        Args:
+            callback (Callable[[], Dict[LabelValues, float]]): Returns values keyed by
+                label values in declaration order.
+        """
+        self._callback = callback
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            values = dict(self._values)
+        if self._callback is not None:
+            values.update(self._callback())
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observations in cumulative buckets.
+
+    Recent observations are also kept in a bounded window so that p50, p95 and p99
+    can be reported directly, as a companion `<name>_quantile` gauge.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        window: int = 1024
+    ):
+        """
+        Initialize the histogram.
+
+        Args:
+            name (str): Metric name.
+            help_text (str): Description shown in the exposition output.
+            labelnames (Sequence[str]): Names of the labels the metric is split by.
+            buckets (Sequence[float]): Upper bounds of the buckets.
+            window (int): Number of recent observations kept for quantiles.
+        """
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.window = window
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+        self._recent: Dict[LabelValues, Deque[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value (float): The observed value.
+            **labels: Label values.
+        """
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+                self._recent[key] = deque(maxlen=self.window)
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[key] += value
+            self._recent[key].append(value)
+
+    def count(self, **labels: str) -> int:
+        """Get the number of observations for a label set."""
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def quantile(self, q: float, **labels: str) -> Optional[float]:
+        """
+        Get a quantile of the recent observations.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+            **labels: Label values.
+
+        Returns:
+            Optional[float]: The quantile, or None if nothing was observed.
+        """
+        with self._lock:
+            recent = sorted(self._recent.get(self._key(labels), ()))
+        return self._quantile(recent, q)
+
+    @staticmethod
+    def _quantile(ordered: List[float], q: float) -> Optional[float]:
+        """Nearest-rank quantile of sorted values."""
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        quantile_lines = [
+            f"# HELP {self.name}_quantile Recent quantiles of {self.name}",
+            f"# TYPE {self.name}_quantile gauge",
+        ]
+        with self._lock:
+            snapshot = [
+                (key, list(counts), self._sums[key], sorted(self._recent[key]))
+                for key, counts in sorted(self._counts.items())
+            ]
+        for key, counts, total, recent in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += counts[-1]
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+            for q in QUANTILES:
+                labels = _format_labels(self.labelnames, key, f'quantile="{q}"')
+                quantile_lines.append(f"{self.name}_quantile{labels} {self._quantile(recent, q)}")
+        return lines + quantile_lines
+
+
+class Registry:
+    """
+    Collection of metrics rendered together.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """
+        Add a metric, or return the one already registered under its name.
+
+        Args:
+            metric (_Metric): The metric to add.
+
+        Returns:
+            _Metric: The registered metric.
+        """
+        return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text format.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_LATENCY = REGISTRY.register(Histogram(
+    "research_stage_seconds",
+    "Time spent in each stage of a research request",
+    labelnames=("stage",),
+))
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "http_request_seconds",
+    "Time spent handling HTTP requests",
+    labelnames=("method", "path"),
+))
+REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled",
+    labelnames=("path",),
+))
+ERRORS = REGISTRY.register(Counter(
+    "research_errors_total",
+    "Research errors by exception class",
+    labelnames=("exception",),
+))
+
+EVENT_LOOP_LAG = REGISTRY.register(Histogram(
+    "event_loop_lag_seconds",
+    "Delay of event loop wake-ups beyond their scheduled time",
+    buckets=LAG_BUCKETS,
+))
+
+
+async def monitor_event_loop_lag(interval: float = 0.25) -> None:
+    """
+    Sample event loop lag until cancelled.
+    
+    The monitor sleeps for the interval and records how much later than scheduled
+    it woke up, which is the time the loop spent blocked on other work.
+    
+    Args:
+        interval (float): Seconds between samples.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - start - interval))
+
+
+# Stage timings of the current request, reported in the Server-Timing header
+_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("timings", default=None)
+
+
+def start_request_timings() -> List[Tuple[str, float]]:
+    """
+    Start collecting stage timings for the current request.
+
+    Returns:
+        List[Tuple[str, float]]: The list that timed stages will be appended to.
+    """
+    timings: List[Tuple[str, float]] = []
+    _timings.set(timings)
+    return timings
+
+
+def detach_request_timings() -> None:
+    """Stop reporting stage timings of the current context to a request."""
+    _timings.set(None)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """
+    Time a stage of request processing.
+
+    The duration is recorded in the stage latency histogram and, when the current
+    request collects timings, added to its Server-Timing header.
+
+    Args:
+        stage (str): Name of the stage.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        STAGE_LATENCY.observe(duration, stage=stage)
+        timings = _timings.get()
+        if timings is not None:
+            timings.append((stage, duration))
+
+
+def server_timing_header(timings: List[Tuple[str, float]], total: float) -> str:
+    """
+    Build a Server-Timing header value.
+
+    Args:
+        timings (List[Tuple[str, float]]): Stage names and durations in seconds.
+        total (float): Total request duration in seconds.
+
+    Returns:
+        str: The header value, with durations in milliseconds.
+    """
+    entries = [f"{stage};dur={duration * 1000:.1f}" for stage, duration in timings]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
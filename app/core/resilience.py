@@ -0,0 +1,348 @@
+"""
+Resilience helpers for calls to the Julep API.
+
+This module contains the request deadline carried through a research request,
+the classification of retryable errors, retries with jittered exponential
+backoff, and the circuit breaker that sheds load while upstream is unhealthy.
+"""
+
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
+
+from app.core.logging import setup_logger
+from app.core.metrics import REGISTRY, Counter, Gauge
+
+# Set up logger for this module
+logger = setup_logger(__name__)
+
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying besides server errors
+RETRYABLE_STATUSES = frozenset({408, 409, 429})
+
+RETRIES = REGISTRY.register(Counter(
+    "upstream_retries_total",
+    "Upstream calls retried after a retryable error",
+    labelnames=("operation",),
+))
+BREAKER_STATE = REGISTRY.register(Gauge(
+    "upstream_circuit_open",
+    "Circuit breaker state: 0 closed, 0.5 half-open, 1 open",
+))
+SHED = REGISTRY.register(Counter(
+    "upstream_shed_total",
+    "Upstream calls refused by the open circuit breaker",
+    labelnames=("operation",),
+))
+
+
+class CircuitOpenError(Exception):
+    """Exception raised when the circuit breaker refuses a call."""
+
+    def __init__(self, retry_after: float):
+        """
+        Initialize the exception.
+
+        Args:
+            retry_after (float): Seconds until the breaker lets a probe call through.
+        """
+        super().__init__(f"Upstream circuit is open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(TimeoutError):
+    """Exception raised when the request deadline leaves no time for a call."""
+    pass
+
+
+# Absolute monotonic time by which the current request must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound the time available to upstream calls made within the block.
+
+    Nested deadlines can only shorten the time available, never extend it.
+
+    Args:
+        seconds (Optional[float]): Time budget in seconds, or None for no deadline.
+    """
+    current = _deadline.get()
+    expires_at = current
+    if seconds is not None:
+        candidate = time.monotonic() + seconds
+        expires_at = candidate if current is None else min(current, candidate)
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def detach_deadline() -> None:
+    """Stop applying the current request's deadline in this context."""
+    _deadline.set(None)
+
+
+def time_remaining() -> Optional[float]:
+    """
+    Get the time left before the current deadline.
+
+    Returns:
+        Optional[float]: Seconds left, which may be negative, or None without a deadline.
+    """
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Decide whether an error is transient and the call may be retried.
+
+    Timeouts, connection failures, rate limits and server errors are retryable;
+    other client errors mean the request itself is wrong and will fail again.
+
+    Args:
+        error (BaseException): The error raised by an upstream call.
+
+    Returns:
+        bool: Whether retrying the call can succeed.
+    """
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    # Imported here so that importing this module does not load the Julep SDK
+    from julep import APIConnectionError, APIStatusError
+    if isinstance(error, APIConnectionError):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRYABLE_STATUSES or error.status_code >= 500
+    return False
+
+
+def _retry_after_header(error: BaseException) -> Optional[float]:
+    """Get the delay requested by a Retry-After header on an error response, if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker over consecutive upstream failures.
+
+    The breaker opens after `failure_threshold` consecutive retryable failures
+    and refuses calls until `recovery_time` has passed. It then lets up to
+    `half_open_max_calls` probe calls through: a successful probe closes the
+    breaker, and a failed one opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        recovery_time: float,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the breaker in the closed state.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker.
+            recovery_time (float): Seconds the breaker stays open before probing.
+            half_open_max_calls (int): Probe calls allowed at once while half-open.
+            clock (Callable[[], float]): Time source, replaceable in tests.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the recovery time has passed."""
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.recovery_time:
+            self._transition(self.HALF_OPEN)
+        return self._state
+
+    def before_call(self) -> None:
+        """
+        Check that a call may go upstream, reserving a probe slot when half-open.
+
+        Raises:
+            CircuitOpenError: If the breaker is open or every probe slot is taken.
+        """
+        state = self.state
+        if state == self.OPEN:
+            raise CircuitOpenError(self.recovery_time - (self._clock() - self._opened_at))
+        if state == self.HALF_OPEN:
+            if self._probes >= self.half_open_max_calls:
+                raise CircuitOpenError(0.0)
+            self._probes += 1
+
+    def record_abandoned(self) -> None:
+        """Record a call that was cancelled before upstream answered."""
+        if self._state == self.HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def record_success(self) -> None:
+        """Record a call that reached a healthy upstream."""
+        self._failures = 0
+        if self._state != self.CLOSED:
+            logger.info("Upstream recovered, closing circuit breaker")
+            self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a call that failed because upstream is unhealthy."""
+        self._failures += 1
+        if self._state == self.HALF_OPEN or (
+            self._state == self.CLOSED and self._failures >= self.failure_threshold
+        ):
+            logger.warning("Opening circuit breaker after %s consecutive failure(s)", self._failures)
+            self._opened_at = self._clock()
+            self._transition(self.OPEN)
+
+    def _transition(self, state: str) -> None:
+        """Enter a state and publish it."""
+        self._state = state
+        self._probes = 0
+        BREAKER_STATE.set({self.CLOSED: 0.0, self.HALF_OPEN: 0.5, self.OPEN: 1.0}[state])
+
+
+class RetryPolicy:
+    """
+    Timeouts and backoff applied to an upstream call.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        attempt_timeout: float,
+        backoff_base: float,
+        backoff_max: float
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts (int): Total attempts, including the first one.
+            attempt_timeout (float): Timeout of a single attempt in seconds.
+            backoff_base (float): Backoff ceiling before the first retry, in seconds.
+            backoff_max (float): Upper bound of the backoff ceiling, in seconds.
+        """
+        self.max_attempts = max_attempts
+        self.attempt_timeout = attempt_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Get the delay before the next attempt, with full jitter.
+
+        Args:
+            attempt (int): Number of the attempt that just failed, starting at 1.
+
+        Returns:
+            float: Seconds to wait, drawn uniformly below the exponential ceiling.
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+async def call_with_retry(
+    func: Callable[[float], Awaitable[T]],
+    policy: RetryPolicy,
+    breaker: Optional[CircuitBreaker],
+    operation: str
+) -> T:
+    """
+    Call upstream with per-attempt timeouts, retries and the circuit breaker.
+
+    Each attempt is bounded by the attempt timeout and by the time left before the
+    current deadline. Only retryable errors are retried, and never past the deadline.
+
+    Args:
+        func (Callable[[float], Awaitable[T]]): Performs one attempt; receives the
+            timeout in seconds to pass on to the HTTP client.
+        policy (RetryPolicy): Timeouts and backoff to apply.
+        breaker (Optional[CircuitBreaker]): Breaker guarding the upstream, or None.
+        operation (str): Name of the call, used in logs and metrics.
+
+    Returns:
+        T: The value returned by the first successful attempt.
+
+    Raises:
+        CircuitOpenError: If the breaker refuses the call.
+        DeadlineExceeded: If the deadline passes before the call succeeds.
+        Exception: The last error of the call when it is not retryable or attempts run out.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        timeout = policy.attempt_timeout
+        remaining = time_remaining()
+        if remaining is not None:
+            if remaining <= 0:
+                raise DeadlineExceeded(f"Deadline exceeded before {operation}")
+            timeout = min(timeout, remaining)
+
+        if breaker is not None:
+            try:
+                breaker.before_call()
+            except CircuitOpenError:
+                SHED.inc(operation=operation)
+                raise
+
+        try:
+            result = await asyncio.wait_for(func(timeout), timeout=timeout)
+        except asyncio.CancelledError:
+            if breaker is not None:
+                breaker.record_abandoned()
+            raise
+        except Exception as e:
+            retryable = is_retryable(e)
+            if breaker is not None:
+                if retryable:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if not retryable or attempt >= policy.max_attempts:
+                raise
+
+            delay = max(policy.backoff(attempt), _retry_after_header(e) or 0.0)
+            remaining = time_remaining()
+            if remaining is not None and remaining <= delay:
+                raise DeadlineExceeded(f"Deadline exceeded while retrying {operation}") from e
+            RETRIES.inc(operation=operation)
+            logger.warning(
+                "Retrying %s in %.2fs after attempt %s failed: %s",
+                operation, delay, attempt, e
+            )
+            await asyncio.sleep(delay)
+            continue
+
+        if breaker is not None:
+            breaker.record_success()
+        return result
@@ -0,0 +1,204 @@
+"""
+Warm pool of pre-created Julep sessions.
+
+This module keeps a small number of idle sessions per output format so that
+research requests can lease an existing session instead of creating one.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List
+
+from app.core.logging import setup_logger
+from app.core.metrics import detach_request_timings
+from app.core.resilience import detach_deadline
+
+# Set up logger for this module
+logger = setup_logger(__name__)
+
+
+def pooled_situation(output_format: str) -> str:
+    """
+    Build the topic-independent situation used for pooled sessions.
+
+    Args:
+        output_format (str): The output format the session serves.
+
+    Returns:
+        str: The session situation.
+    """
+    return f"User wants to research topics and receive results in '{output_format}' format."
+
+
+class SessionLease:
+    """
+    A session handed out to a single research request.
+    """
+
+    def __init__(self, session: Any, output_format: str, pooled: bool, clock: Callable[[], float]):
+        """
+        Initialize the lease.
+
+        Args:
+            session (Any): The Julep session object.
+            output_format (str): The output format the session serves.
+            pooled (bool): Whether the session belongs to the pool and is shared between requests.
+            clock (Callable[[], float]): Time source used for idle tracking.
+        """
+        self.session = session
+        self.output_format = output_format
+        self.pooled = pooled
+        self.uses = 0
+        self.last_used_at = clock()
+
+    @property
+    def id(self) -> str:
+        """ID of the leased session."""
+        return self.session.id
+
+
+class SessionPool:
+    """
+    Pool of idle sessions per output format, refilled in the background.
+
+    Pooled sessions are shared between requests one at a time, so callers must chat
+    on them without saving history. Sessions are retired after a number of uses,
+    after sitting idle too long, or when a request using them fails.
+    """
+
+    def __init__(
+        self,
+        create_session: Callable[[str, str], Awaitable[Any]],
+        size: int,
+        max_uses: int,
+        idle_timeout: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            create_session (Callable[[str, str], Awaitable[Any]]): Coroutine factory creating a
+                session from a situation and the output format it will serve.
+            size (int): Number of idle sessions kept per output format.
+            max_uses (int): Number of leases after which a session is retired.
+            idle_timeout (float): Seconds after which an idle session is retired.
+            clock (Callable[[], float]): Time source, replaceable in tests.
+        """
+        self.size = size
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self._create_session = create_session
+        self._clock = clock
+        self._idle: Dict[str, Deque[SessionLease]] = {}
+        self._refills: Dict[str, "asyncio.Task[None]"] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    async def lease(self, output_format: str) -> SessionLease:
+        """
+        Lease a session for an output format, creating one if none is idle.
+
+        Args:
+            output_format (str): The normalized output format.
+
+        Returns:
+            SessionLease: The leased session.
+        """
+        idle = self._idle.setdefault(output_format, deque())
+        stats = self._format_stats(output_format)
+        lease = None
+        while idle:
+            candidate = idle.popleft()
+            if self._clock() - candidate.last_used_at < self.idle_timeout:
+                lease = candidate
+                break
+            stats["retired"] += 1
+
+        if lease is None:
+            stats["misses"] += 1
+            lease = await self._new_lease(output_format)
+        else:
+            stats["hits"] += 1
+
+        self.refill(output_format)
+        return lease
+
+    def release(self, lease: SessionLease, failed: bool = False) -> None:
+        """
+        Return a leased session to the pool, or retire it.
+
+        Args:
+            lease (SessionLease): The lease to return.
+            failed (bool): Whether the request using the session failed.
+        """
+        lease.uses += 1
+        lease.last_used_at = self._clock()
+        idle = self._idle.setdefault(lease.output_format, deque())
+        if failed or lease.uses >= self.max_uses or len(idle) >= self.size:
+            self._format_stats(lease.output_format)["retired"] += 1
+            self.refill(lease.output_format)
+            return
+        idle.append(lease)
+
+    def refill(self, output_format: str) -> None:
+        """
+        Start a background refill of the idle sessions for a format, if one is not running.
+
+        Args:
+            output_format (str): The normalized output format.
+        """
+        running = self._refills.get(output_format)
+        if running is not None and not running.done():
+            return
+        self._refills[output_format] = asyncio.ensure_future(self._refill(output_format))
+
+    async def warm(self, output_formats: List[str]) -> None:
+        """
+        Fill the pool for the given formats and wait until it is ready.
+
+        Args:
+            output_formats (List[str]): The normalized output formats to pre-create sessions for.
+        """
+        await asyncio.gather(*(self._refill(output_format) for output_format in output_formats))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get pool statistics per output format.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Idle, created, retired, hit and miss counts per format.
+        """
+        return {
+            output_format: {"idle": len(self._idle.get(output_format, ())), **stats}
+            for output_format, stats in self._stats.items()
+        }
+
+    async def _refill(self, output_format: str) -> None:
+        """Create sessions until the format has its full complement of idle sessions."""
+        # Background refills must not report into the Server-Timing of the request
+        # that started them, nor be cut short by its deadline
+        detach_request_timings()
+        detach_deadline()
+        idle = self._idle.setdefault(output_format, deque())
+        while len(idle) < self.size:
+            try:
+                lease = await self._new_lease(output_format)
+            except Exception as e:
+                logger.warning("Failed to refill session pool for format '%s': %s", output_format, e)
+                return
+            if len(idle) >= self.size:
+                return
+            idle.append(lease)
+
+    async def _new_lease(self, output_format: str) -> SessionLease:
+        """Create a new pooled session for a format."""
+        session = await self._create_session(pooled_situation(output_format), output_format)
+        self._format_stats(output_format)["created"] += 1
+        return SessionLease(session, output_format, pooled=True, clock=self._clock)
+
+    def _format_stats(self, output_format: str) -> Dict[str, int]:
+        """Get the statistics entry for a format."""
+        return self._stats.setdefault(
+            output_format, {"created": 0, "retired": 0, "hits": 0, "misses": 0}
+        )
@@ -0,0 +1,303 @@
+"""
+Admission control for upstream research calls.
+
+This module limits how many upstream calls run at once, holds excess requests in
+a bounded wait queue shared fairly between priority classes and clients, and
+rejects requests quickly once the queue is full or a request has waited too long.
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from app.core.config import Settings
+from app.core.logging import setup_logger
+from app.core.metrics import REGISTRY, Counter, Gauge, Histogram
+from app.services.cache import format_label
+from app.services.errors import AdmissionRejected
+from app.services.scheduling import ANONYMOUS_CLIENT, DEFAULT_PRIORITY
+
+# Set up logger for this module
+logger = setup_logger(__name__)
+
+
+QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "admission_queue_depth",
+    "Requests waiting for an upstream slot, per priority class",
+    labelnames=("priority",),
+))
+QUEUE_WAIT = REGISTRY.register(Histogram(
+    "admission_queue_wait_seconds",
+    "Time requests waited for an upstream slot, per priority class",
+    labelnames=("priority",),
+))
+ACTIVE = REGISTRY.register(Gauge(
+    "admission_active",
+    "Upstream calls currently admitted, per output format",
+    labelnames=("format",),
+))
+REJECTIONS = REGISTRY.register(Counter(
+    "admission_rejections_total",
+    "Requests rejected by admission control",
+    labelnames=("reason",),
+))
+
+
+class _Waiter:
+    """
+    A request waiting for an upstream slot.
+    """
+
+    __slots__ = ("output_format", "client_id", "priority", "future", "enqueued_at")
+
+    def __init__(self, output_format: str, client_id: str, priority: str, future: "asyncio.Future[None]"):
+        self.output_format = output_format
+        self.client_id = client_id
+        self.priority = priority
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded, weighted fair wait queue.
+
+    A request runs when both the global limit and the limit of its output format
+    have room. Waiting requests are grouped by priority class and, within a class,
+    by client. Free slots are shared between the waiting classes in proportion to
+    their weights (stride scheduling), and between the clients of a class in
+    round-robin order, so neither a busy class nor a busy client can starve the
+    others. Requests whose format is still at its limit are skipped, so one
+    saturated format does not block the others.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        max_queue_time: float,
+        format_limits: Optional[Dict[str, int]] = None,
+        class_weights: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            max_concurrency (int): Maximum number of admitted requests overall.
+            max_queue (int): Maximum number of waiting requests.
+            max_queue_time (float): Seconds a request may wait before being rejected.
+            format_limits (Optional[Dict[str, int]]): Maximum admitted requests per
+                normalized output format; formats not listed only share the global limit.
+            class_weights (Optional[Dict[str, float]]): Relative share of slots for each
+                priority class; classes not listed have a weight of 1.
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_queue_time = max_queue_time
+        self.format_limits = format_limits or {}
+        self.class_weights = class_weights or {}
+        self._active = 0
+        self._active_by_format: Dict[str, int] = {}
+        # Waiters by priority class, then by client in round-robin order
+        self._queues: Dict[str, "OrderedDict[str, Deque[_Waiter]]"] = {}
+        self._depth: Dict[str, int] = {}
+        # Stride scheduling state: the next pass of each class and the pass last served
+        self._pass: Dict[str, float] = {}
+        self._virtual_time = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting to be admitted."""
+        return sum(self._depth.values())
+
+    @property
+    def active(self) -> int:
+        """Number of admitted requests."""
+        return self._active
+
+    @property
+    def saturation(self) -> float:
+        """Fill of the wait queue from 0 to 1, or whether every slot is taken without a queue."""
+        if self.max_queue <= 0:
+            return float(self._active >= self.max_concurrency)
+        return min(1.0, self.queue_depth / self.max_queue)
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        output_format: str,
+        client_id: str = ANONYMOUS_CLIENT,
+        priority: str = DEFAULT_PRIORITY
+    ) -> AsyncIterator[None]:
+        """
+        Hold an upstream slot for the duration of the block.
+
+        Args:
+            output_format (str): The normalized output format of the request.
+            client_id (str): Identifier of the requesting client.
+            priority (str): Priority class of the request.
+
+        Raises:
+            AdmissionRejected: With status 429 if the wait queue is full, or 503 if
+                no slot became free within the maximum queue time.
+        """
+        await self.acquire(output_format, client_id, priority)
+        try:
+            yield
+        finally:
+            self.release(output_format)
+
+    async def acquire(
+        self,
+        output_format: str,
+        client_id: str = ANONYMOUS_CLIENT,
+        priority: str = DEFAULT_PRIORITY
+    ) -> None:
+        """
+        Wait for an upstream slot.
+
+        Args:
+            output_format (str): The normalized output format of the request.
+            client_id (str): Identifier of the requesting client.
+            priority (str): Priority class of the request.
+
+        Raises:
+            AdmissionRejected: If the request is not admitted.
+        """
+        # Every release admits all waiters that fit, so anyone still waiting is
+        # blocked by a limit that does not apply to a request that has room now
+        if self._has_room(output_format):
+            self._start(output_format)
+            QUEUE_WAIT.observe(0.0, priority=priority)
+            return
+
+        if self.queue_depth >= self.max_queue:
+            REJECTIONS.inc(reason="queue_full")
+            raise AdmissionRejected(
+                "Too many requests are waiting for the research service",
+                status_code=429,
+                retry_after=self._retry_after()
+            )
+
+        waiter = _Waiter(output_format, client_id, priority, asyncio.get_running_loop().create_future())
+        self._enqueue(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=self.max_queue_time)
+        except BaseException as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was granted as the wait ended; hand it on
+                self.release(output_format)
+            else:
+                waiter.future.cancel()
+                self._remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                REJECTIONS.inc(reason="queue_timeout")
+                QUEUE_WAIT.observe(time.monotonic() - waiter.enqueued_at, priority=priority)
+                logger.warning("Request waited %.1fs without an upstream slot", self.max_queue_time)
+                raise AdmissionRejected(
+                    "Timed out waiting for the research service",
+                    status_code=503,
+                    retry_after=self._retry_after()
+                ) from e
+            raise
+        QUEUE_WAIT.observe(time.monotonic() - waiter.enqueued_at, priority=priority)
+
+    def release(self, output_format: str) -> None:
+        """
+        Free an upstream slot and admit waiting requests that now fit.
+
+        Args:
+            output_format (str): The normalized output format of the finished request.
+        """
+        self._active -= 1
+        self._active_by_format[output_format] -= 1
+        if not self._active_by_format[output_format]:
+            del self._active_by_format[output_format]
+        ACTIVE.dec(format=format_label(output_format))
+
+        while self._active < self.max_concurrency:
+            waiter = self._next_waiter()
+            if waiter is None:
+                break
+            # Serve the client's other requests after those of the other clients
+            self._queues[waiter.priority].move_to_end(waiter.client_id)
+            self._remove(waiter)
+            weight = self.class_weights.get(waiter.priority, 1.0)
+            self._virtual_time = self._pass[waiter.priority]
+            self._pass[waiter.priority] += 1.0 / weight
+            self._start(waiter.output_format)
+            waiter.future.set_result(None)
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """Pick the next waiter that fits, from the class with the lowest pass."""
+        for priority in sorted(self._queues, key=lambda name: self._pass[name]):
+            for waiters in self._queues[priority].values():
+                for waiter in waiters:
+                    if self._has_room(waiter.output_format):
+                        return waiter
+        return None
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        """Add a waiter to the queue of its class and client."""
+        clients = self._queues.get(waiter.priority)
+        if clients is None:
+            # A class that was idle starts at the current pass, so it cannot
+            # claim the slots it did not use while idle
+            clients = self._queues[waiter.priority] = OrderedDict()
+            self._pass[waiter.priority] = max(self._pass.get(waiter.priority, 0.0), self._virtual_time)
+        clients.setdefault(waiter.client_id, deque()).append(waiter)
+        self._depth[waiter.priority] = self._depth.get(waiter.priority, 0) + 1
+        QUEUE_DEPTH.set(self._depth[waiter.priority], priority=waiter.priority)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        """Remove a waiter, dropping its client and class queues once empty."""
+        clients = self._queues[waiter.priority]
+        waiters = clients[waiter.client_id]
+        waiters.remove(waiter)
+        if not waiters:
+            del clients[waiter.client_id]
+        if not clients:
+            del self._queues[waiter.priority]
+        self._depth[waiter.priority] -= 1
+        QUEUE_DEPTH.set(self._depth[waiter.priority], priority=waiter.priority)
+
+    def _has_room(self, output_format: str) -> bool:
+        """Whether a request for the format can be admitted now."""
+        if self._active >= self.max_concurrency:
+            return False
+        limit = self.format_limits.get(output_format)
+        return limit is None or self._active_by_format.get(output_format, 0) < limit
+
+    def _start(self, output_format: str) -> None:
+        """Account for an admitted request."""
+        self._active += 1
+        self._active_by_format[output_format] = self._active_by_format.get(output_format, 0) + 1
+        ACTIVE.inc(format=format_label(output_format))
+
+    def _retry_after(self) -> int:
+        """Seconds a rejected client should wait before retrying."""
+        return max(1, math.ceil(self.max_queue_time))
+
+
+def create_admission_controller(settings: Settings) -> Optional[AdmissionController]:
+    """
+    Build the admission controller described by the application settings.
+
+    Args:
+        settings (Settings): Application settings.
+
+    Returns:
+        Optional[AdmissionController]: The controller, or None if admission control is disabled.
+    """
+    if not settings.ADMISSION_ENABLED:
+        return None
+    return AdmissionController(
+        max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+        max_queue=settings.ADMISSION_MAX_QUEUE,
+        max_queue_time=settings.ADMISSION_MAX_QUEUE_TIME,
+        format_limits=settings.ADMISSION_FORMAT_LIMITS,
+        class_weights=settings.PRIORITY_WEIGHTS,
+    )
@@ -0,0 +1,444 @@
+"""
+Result caching for research requests.
+
+This module contains the pluggable result cache placed in front of the research
+service, along with the key normalization used to match repeated requests.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import Settings
+from app.core.logging import setup_logger
+
+# Set up logger for this module
+logger = setup_logger(__name__)
+
+
+# Cache status values reported back to API clients
+CACHE_HIT = "HIT"
+CACHE_SEMANTIC_HIT = "SEMANTIC_HIT"
+CACHE_MISS = "MISS"
+
+# Alternative spellings of the supported output formats
+FORMAT_ALIASES: Dict[str, str] = {
+    "summary": "summary",
+    "summaries": "summary",
+    "bullet points": "bullet points",
+    "bullet point": "bullet points",
+    "bullets": "bullet points",
+    "bullet list": "bullet points",
+    "short report": "short report",
+    "report": "short report",
+}
+
+# Canonical output formats
+SUPPORTED_FORMATS = frozenset(FORMAT_ALIASES.values())
+
+
+def normalize_topic(topic: str) -> str:
+    """
+    Normalize a topic for cache lookups.
+
+    Args:
+        topic (str): The research topic.
+
+    Returns:
+        str: The lower-cased topic with collapsed whitespace.
+    """
+    return " ".join(topic.lower().split())
+
+
+def normalize_format(output_format: str) -> str:
+    """
+    Normalize an output format, resolving known aliases.
+
+    Args:
+        output_format (str): The requested output format.
+
+    Returns:
+        str: The canonical output format.
+    """
+    cleaned = " ".join(output_format.lower().replace("-", " ").replace("_", " ").split())
+    return FORMAT_ALIASES.get(cleaned, cleaned)
+
+
+def format_label(output_format: str) -> str:
+    """
+    Get the metric label of an output format.
+
+    Formats are free text, so only the supported ones get a label of their own,
+    which keeps the number of metric series bounded.
+
+    Args:
+        output_format (str): The requested output format.
+
+    Returns:
+        str: The canonical output format if it is supported, otherwise "other".
+    """
+    normalized = normalize_format(output_format)
+    return normalized if normalized in SUPPORTED_FORMATS else "other"
+
+
+def make_cache_key(topic: str, output_format: str) -> str:
+    """
+    Build the cache key for a research request.
+
+    Args:
+        topic (str): The research topic.
+        output_format (str): The requested output format.
+
+    Returns:
+        str: A key shared by all equivalent requests.
+    """
+    return f"{normalize_format(output_format)}::{normalize_topic(topic)}"
+
+
+class ResultCache(ABC):
+    """
+    Interface for research result caches.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for a key, or None if absent or expired."""
+
+    @abstractmethod
+    def get_entry(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Return the cached value for a key and the seconds it has left, or None."""
+
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        """Store a value under a key, for ttl_seconds or else the cache's TTL."""
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Remove a key, returning whether it was present."""
+
+    @abstractmethod
+    def clear(self) -> int:
+        """Remove every entry, returning the number of entries removed."""
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """Like get, for callers on the event loop; caches doing blocking I/O override it."""
+        return self.get(key)
+
+    async def aget_entry(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Like get_entry, for callers on the event loop; caches doing blocking I/O override it."""
+        return self.get_entry(key)
+
+    async def aset(self, key: str, value: Dict[str, Any]) -> None:
+        """Like set, for callers on the event loop; caches doing blocking I/O override it."""
+        self.set(key, value)
+
+    def generation(self) -> int:
+        """
+        Count of removals, which caches shared between processes keep so that
+        in-process copies of removed entries can be dropped; 0 for other caches.
+        """
+        return 0
+
+
+class MemoryResultCache(ResultCache):
+    """
+    In-process LRU cache with a time-to-live and a total size bound in bytes.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes (int): Maximum total size of the cached values.
+            ttl_seconds (float): Lifetime of an entry in seconds.
+            clock (Callable[[], float]): Time source, replaceable in tests.
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached values in bytes."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, value = entry
+            now = self._clock()
+            if expires_at <= now:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value, expires_at - now
+
+    def set(self, key: str, value: Dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        size = len(json.dumps(value).encode("utf-8"))
+        if size > self.max_bytes:
+            logger.warning("Not caching entry of %s bytes, larger than the cache bound", size)
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+            self._entries[key] = (self._clock() + ttl, size, value)
+            self._size += size
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._size = 0
+            return count
+
+    def _remove(self, key: str) -> None:
+        """Remove a key; the caller must hold the lock."""
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+
+class SQLiteResultCache(ResultCache):
+    """
+    Result cache stored in a SQLite database that several processes can share.
+
+    Removals bump a generation counter stored alongside the entries, which tells
+    other processes to drop their in-process copies.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float):
+        """
+        Initialize the cache, creating the backing table if needed.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            ttl_seconds (float): Lifetime of an entry in seconds.
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS research_results "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS research_results_generation "
+            "(id INTEGER PRIMARY KEY CHECK (id = 0), generation INTEGER NOT NULL)"
+        )
+        self._conn.execute("INSERT OR IGNORE INTO research_results_generation (id, generation) VALUES (0, 0)")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM research_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM research_results WHERE key = ?", (key,))
+                return None
+        return json.loads(row[0]), row[1] - now
+
+    def set(self, key: str, value: Dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO research_results (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + ttl)
+            )
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aget_entry(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        return await asyncio.to_thread(self.get_entry, key)
+
+    async def aset(self, key: str, value: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.set, key, value)
+
+    def delete(self, key: str) -> bool:
+        return self._remove("DELETE FROM research_results WHERE key = ?", (key,)) > 0
+
+    def clear(self) -> int:
+        return self._remove("DELETE FROM research_results", ())
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT generation FROM research_results_generation").fetchone()[0]
+
+    def _remove(self, statement: str, parameters: Tuple[Any, ...]) -> int:
+        """Run a deletion and bump the generation in one transaction, returning the rows removed."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                removed = self._conn.execute(statement, parameters).rowcount
+                # Bumped even when nothing was removed here, as other processes may hold copies
+                self._conn.execute("UPDATE research_results_generation SET generation = generation + 1")
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return removed
+
+
+class TieredResultCache(ResultCache):
+    """
+    In-process cache backed by a shared cache, read through and written through.
+
+    Entries copied from the shared tier keep their remaining lifetime. The local
+    tier is dropped when the shared tier's generation shows that another process
+    removed entries, which is checked at most once per sync interval.
+    """
+
+    def __init__(
+        self,
+        local: ResultCache,
+        shared: ResultCache,
+        sync_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the tiered cache.
+
+        Args:
+            local (ResultCache): Fast in-process tier.
+            shared (ResultCache): Shared tier consulted on local misses.
+            sync_interval (float): Seconds between checks for removals by other processes.
+            clock (Callable[[], float]): Time source, replaceable in tests.
+        """
+        self.local = local
+        self.shared = shared
+        self.sync_interval = sync_interval
+        self._clock = clock
+        self._generation = shared.generation()
+        self._synced_at = clock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        if self._sync_due():
+            self._apply_generation(self.shared.generation())
+        entry = self.local.get_entry(key)
+        if entry is None:
+            entry = self.shared.get_entry(key)
+            if entry is not None:
+                self.local.set(key, entry[0], ttl_seconds=entry[1])
+        return entry
+
+    def set(self, key: str, value: Dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        self.local.set(key, value, ttl_seconds)
+        self.shared.set(key, value, ttl_seconds)
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = await self.aget_entry(key)
+        return None if entry is None else entry[0]
+
+    async def aget_entry(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        if self._sync_due():
+            self._apply_generation(await asyncio.to_thread(self.shared.generation))
+        entry = self.local.get_entry(key)
+        if entry is None:
+            entry = await self.shared.aget_entry(key)
+            if entry is not None:
+                self.local.set(key, entry[0], ttl_seconds=entry[1])
+        return entry
+
+    async def aset(self, key: str, value: Dict[str, Any]) -> None:
+        self.local.set(key, value)
+        await self.shared.aset(key, value)
+
+    def delete(self, key: str) -> bool:
+        removed_local = self.local.delete(key)
+        removed_shared = self.shared.delete(key)
+        return removed_local or removed_shared
+
+    def clear(self) -> int:
+        self.local.clear()
+        return self.shared.clear()
+
+    def generation(self) -> int:
+        return self.shared.generation()
+
+    def _sync_due(self) -> bool:
+        """Whether the sync interval has passed since the last check of the generation."""
+        now = self._clock()
+        if now - self._synced_at < self.sync_interval:
+            return False
+        self._synced_at = now
+        return True
+
+    def _apply_generation(self, generation: int) -> None:
+        """Drop the local tier if entries were removed from the shared tier since the last check."""
+        if generation != self._generation:
+            self._generation = generation
+            self.local.clear()
+
+
+def create_result_cache(settings: Settings) -> Optional[ResultCache]:
+    """
+    Build the result cache described by the application settings.
+
+    Args:
+        settings (Settings): Application settings.
+
+    Returns:
+        Optional[ResultCache]: The configured cache, or None if caching is disabled.
+
+    Raises:
+        ValueError: If the shared backend is not recognised.
+    """
+    if not settings.CACHE_ENABLED:
+        return None
+
+    local = MemoryResultCache(
+        max_bytes=settings.CACHE_MAX_BYTES,
+        ttl_seconds=settings.CACHE_TTL_SECONDS,
+    )
+    if settings.CACHE_SHARED_BACKEND is None:
+        return local
+    if settings.CACHE_SHARED_BACKEND == "sqlite":
+        shared = SQLiteResultCache(settings.CACHE_SQLITE_PATH, settings.CACHE_TTL_SECONDS)
+        return TieredResultCache(local, shared)
+    raise ValueError(f"Unknown cache backend: {settings.CACHE_SHARED_BACKEND}")
@@ -0,0 +1,104 @@
+"""
+Coalescing of identical in-flight requests.
+
+This module contains a single-flight helper that lets concurrent callers with the
+same key share one upstream call instead of each issuing their own.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict
+
+from app.core.logging import setup_logger
+
+# Set up logger for this module
+logger = setup_logger(__name__)
+
+
+class SingleFlight:
+    """
+    Shares one in-flight call between concurrent callers using the same key.
+
+    The shared call runs as its own task, so a caller that goes away (for example
+    a disconnected client) does not cancel the work the other waiters depend on.
+    """
+
+    def __init__(self, max_tracked_keys: int = 1000):
+        """
+        Initialize the single-flight group.
+
+        Args:
+            max_tracked_keys (int): Maximum number of keys kept in the waiter statistics.
+        """
+        self.max_tracked_keys = max_tracked_keys
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        self._waiters: Dict[str, int] = {}
+        self._stats: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func for the key, or join the call already in flight for it.
+
+        Args:
+            key (str): Key identifying equivalent calls.
+            func (Callable[[], Awaitable[Any]]): Coroutine factory performing the call.
+
+        Returns:
+            Any: The result of the shared call.
+
+        Raises:
+            Exception: Whatever the shared call raised, delivered to every waiter.
+        """
+        task = self._inflight.get(key)
+        stats = self._key_stats(key)
+        stats["requests"] += 1
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            stats["coalesced"] += 1
+            logger.info("Joining in-flight request for key: '%s'", key)
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        stats["peak_waiters"] = max(stats["peak_waiters"], self._waiters[key])
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[key] -= 1
+            if self._waiters[key] == 0:
+                del self._waiters[key]
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get per-key waiter statistics.
+
+        Returns:
+            Dict[str, Dict[str, int]]: For each tracked key, the current number of
+                waiters, the total requests, how many of them were coalesced, and
+                the peak number of concurrent waiters.
+        """
+        return {
+            key: {"waiters": self._waiters.get(key, 0), **stats}
+            for key, stats in self._stats.items()
+        }
+
+    def _key_stats(self, key: str) -> Dict[str, int]:
+        """Get the statistics entry for a key, evicting the oldest keys beyond the bound."""
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = {"requests": 0, "coalesced": 0, "peak_waiters": 0}
+            self._stats[key] = stats
+            while len(self._stats) > self.max_tracked_keys:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(key)
+        return stats
+
+    def _finish(self, key: str, task: "asyncio.Task[Any]") -> None:
+        """Forget a completed call so the next request for the key starts a new one."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every waiter has gone away
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,384 @@
+"""
+Conversation handles for follow-up research.
+
+This module keeps the sessions and message history of recent research answers
+under opaque handles, so that a client can ask for the same answer in another
+format, or in more depth, with one short chat instead of a new research cycle.
+"""
+
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import Settings
+from app.core.logging import setup_logger
+from app.core.metrics import REGISTRY, Counter
+
+# Set up logger for this module
+logger = setup_logger(__name__)
+
+
+CONVERSATIONS = REGISTRY.register(Counter(
+    "research_conversations_total",
+    "Conversation handle events: opened, followed_up, expired and evicted",
+    labelnames=("event",),
+))
+
+
+class Conversation:
+    """
+    A research answer that can be followed up on.
+    """
+
+    def __init__(
+        self,
+        handle: str,
+        topic: str,
+        output_format: str,
+        profile: Optional[str],
+        session_id: Optional[str],
+        saved_messages: int,
+        messages: List[Dict[str, str]],
+        clock: Callable[[], float]
+    ):
+        """
+        Initialize the conversation.
+
+        Args:
+            handle (str): Opaque handle given to the client.
+            topic (str): The research topic.
+            output_format (str): Format of the latest answer.
+            profile (Optional[str]): Agent profile that answered, or None for the routed one.
+            session_id (Optional[str]): Dedicated session the answer came from, or None
+                if it came from the cache or a pooled session, which is leased again.
+            saved_messages (int): Number of leading messages already in the session's
+                own history, which are not sent again.
+            messages (List[Dict[str, str]]): The user and assistant messages so far.
+            clock (Callable[[], float]): Time source used for idle tracking.
+        """
+        self.handle = handle
+        self.topic = topic
+        self.output_format = output_format
+        self.profile = profile
+        self.session_id = session_id
+        self.saved_messages = saved_messages
+        self.messages = messages
+        self.last_used_at = clock()
+
+    @property
+    def unsaved_messages(self) -> List[Dict[str, str]]:
+        """Messages that must be sent with a follow-up for the agent to see them."""
+        return self.messages[self.saved_messages:]
+
+
+class ConversationRegistry(ABC):
+    """
+    Interface for registries of conversations, expired after sitting idle.
+    """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of conversations kept."""
+
+    @abstractmethod
+    def open(
+        self,
+        topic: str,
+        output_format: str,
+        profile: Optional[str],
+        session_id: Optional[str],
+        saved_messages: int,
+        messages: List[Dict[str, str]]
+    ) -> Conversation:
+        """
+        Register a new conversation.
+
+        Args:
+            topic (str): The research topic.
+            output_format (str): Format of the answer.
+            profile (Optional[str]): Agent profile that answered, if known.
+            session_id (Optional[str]): Dedicated session the answer came from, if any.
+            saved_messages (int): Leading messages already in the session's history.
+            messages (List[Dict[str, str]]): The research prompt and answer.
+
+        Returns:
+            Conversation: The conversation, under a new random handle.
+        """
+
+    @abstractmethod
+    def get(self, handle: str) -> Optional[Conversation]:
+        """
+        Look up a conversation and mark it as used.
+
+        Args:
+            handle (str): The conversation handle.
+
+        Returns:
+            Optional[Conversation]: The conversation, or None if it is unknown or expired.
+        """
+
+    @abstractmethod
+    def save(self, conversation: Conversation) -> None:
+        """
+        Store the changes made to a conversation by a follow-up.
+
+        Args:
+            conversation (Conversation): The updated conversation.
+        """
+
+
+class MemoryConversationRegistry(ConversationRegistry):
+    """
+    Bounded in-memory registry of conversations, kept by one process.
+    """
+
+    def __init__(self, max_entries: int, idle_ttl: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the registry.
+
+        Args:
+            max_entries (int): Conversations kept; the least recently used are evicted beyond this.
+            idle_ttl (float): Seconds after its last use that a conversation expires.
+            clock (Callable[[], float]): Time source, replaceable in tests.
+        """
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self._clock = clock
+        self._conversations: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._conversations)
+
+    def open(
+        self,
+        topic: str,
+        output_format: str,
+        profile: Optional[str],
+        session_id: Optional[str],
+        saved_messages: int,
+        messages: List[Dict[str, str]]
+    ) -> Conversation:
+        """Register a new conversation under a new random handle."""
+        conversation = Conversation(
+            secrets.token_urlsafe(16), topic, output_format, profile,
+            session_id, saved_messages, messages, self._clock
+        )
+        with self._lock:
+            self._expire()
+            self._conversations[conversation.handle] = conversation
+            while len(self._conversations) > self.max_entries:
+                self._conversations.popitem(last=False)
+                CONVERSATIONS.inc(event="evicted")
+        CONVERSATIONS.inc(event="opened")
+        return conversation
+
+    def get(self, handle: str) -> Optional[Conversation]:
+        """Look up a conversation and mark it as used."""
+        with self._lock:
+            self._expire()
+            conversation = self._conversations.get(handle)
+            if conversation is None:
+                return None
+            conversation.last_used_at = self._clock()
+            self._conversations.move_to_end(handle)
+            return conversation
+
+    def save(self, conversation: Conversation) -> None:
+        """Mark a conversation as used; it is kept by reference, with its changes."""
+        with self._lock:
+            conversation.last_used_at = self._clock()
+            if conversation.handle in self._conversations:
+                self._conversations.move_to_end(conversation.handle)
+
+    def _expire(self) -> None:
+        """Drop idle conversations; the least recently used come first."""
+        deadline = self._clock() - self.idle_ttl
+        while self._conversations:
+            oldest = next(iter(self._conversations.values()))
+            if oldest.last_used_at > deadline:
+                break
+            del self._conversations[oldest.handle]
+            CONVERSATIONS.inc(event="expired")
+
+
+class SQLiteConversationRegistry(ConversationRegistry):
+    """
+    Conversation registry in a SQLite database that several processes can share,
+    so that a follow-up may reach any worker.
+    """
+
+    _COLUMNS = "handle, topic, output_format, profile, session_id, saved_messages, messages, last_used_at"
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int,
+        idle_ttl: float,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the registry, creating the backing table if needed.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            max_entries (int): Conversations kept; the least recently used are evicted beyond this.
+            idle_ttl (float): Seconds after its last use that a conversation expires.
+            clock (Callable[[], float]): Wall-clock time source shared by the processes,
+                replaceable in tests.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS research_conversations ("
+            "handle TEXT PRIMARY KEY, topic TEXT NOT NULL, output_format TEXT NOT NULL, "
+            "profile TEXT, session_id TEXT, saved_messages INTEGER NOT NULL, "
+            "messages TEXT NOT NULL, last_used_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS research_conversations_used "
+            "ON research_conversations (last_used_at)"
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM research_conversations").fetchone()[0]
+
+    def open(
+        self,
+        topic: str,
+        output_format: str,
+        profile: Optional[str],
+        session_id: Optional[str],
+        saved_messages: int,
+        messages: List[Dict[str, str]]
+    ) -> Conversation:
+        """Register a new conversation under a new random handle."""
+        conversation = Conversation(
+            secrets.token_urlsafe(16), topic, output_format, profile,
+            session_id, saved_messages, messages, self._clock
+        )
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._expire()
+                self._conn.execute(
+                    f"INSERT INTO research_conversations ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._to_row(conversation)
+                )
+                evicted = self._conn.execute(
+                    "DELETE FROM research_conversations WHERE handle IN ("
+                    "SELECT handle FROM research_conversations ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                ).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if evicted > 0:
+            CONVERSATIONS.inc(evicted, event="evicted")
+        CONVERSATIONS.inc(event="opened")
+        return conversation
+
+    def get(self, handle: str) -> Optional[Conversation]:
+        """Look up a conversation and mark it as used."""
+        now = self._clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._expire()
+                row = self._conn.execute(
+                    f"SELECT {self._COLUMNS} FROM research_conversations WHERE handle = ?", (handle,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE research_conversations SET last_used_at = ? WHERE handle = ?", (now, handle)
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        conversation = Conversation(
+            row["handle"], row["topic"], row["output_format"], row["profile"], row["session_id"],
+            row["saved_messages"], json.loads(row["messages"]), self._clock
+        )
+        conversation.last_used_at = now
+        return conversation
+
+    def save(self, conversation: Conversation) -> None:
+        """
+        Store the changes made to a conversation by a follow-up.
+
+        A conversation that expired in the meantime is stored again, since the
+        client is about to get its handle back.
+        """
+        conversation.last_used_at = self._clock()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO research_conversations ({self._COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self._to_row(conversation)
+            )
+
+    def _expire(self) -> None:
+        """Drop idle conversations; called inside a transaction."""
+        expired = self._conn.execute(
+            "DELETE FROM research_conversations WHERE last_used_at <= ?", (self._clock() - self.idle_ttl,)
+        ).rowcount
+        if expired > 0:
+            CONVERSATIONS.inc(expired, event="expired")
+
+    @staticmethod
+    def _to_row(conversation: Conversation) -> tuple:
+        """Convert a conversation to the values of a table row."""
+        return (
+            conversation.handle, conversation.topic, conversation.output_format, conversation.profile,
+            conversation.session_id, conversation.saved_messages, json.dumps(conversation.messages),
+            conversation.last_used_at,
+        )
+
+
+def create_conversation_registry(settings: Settings) -> Optional[ConversationRegistry]:
+    """
+    Build the conversation registry described by the application settings.
+
+    Handles are kept in CONVERSATION_DB_PATH, where every worker process finds
+    them. Without it they are kept in memory, which only works with one worker;
+    with more, no handles are issued rather than ones that other workers reject.
+
+    Args:
+        settings (Settings): Application settings.
+
+    Returns:
+        Optional[ConversationRegistry]: The registry, or None if follow-ups are disabled.
+    """
+    if not settings.CONVERSATIONS_ENABLED:
+        return None
+    if settings.CONVERSATION_DB_PATH:
+        return SQLiteConversationRegistry(
+            settings.CONVERSATION_DB_PATH,
+            max_entries=settings.CONVERSATION_MAX_HANDLES,
+            idle_ttl=settings.CONVERSATION_IDLE_TTL,
+        )
+    if (settings.WORKERS or os.cpu_count() or 1) > 1:
+        logger.warning("Follow-ups need CONVERSATION_DB_PATH with several workers; not issuing handles")
+        return None
+    return MemoryConversationRegistry(
+        max_entries=settings.CONVERSATION_MAX_HANDLES,
+        idle_ttl=settings.CONVERSATION_IDLE_TTL,
+    )
@@ -0,0 +1,65 @@
+"""
+Research service exceptions.
+
+This module contains the exception hierarchy shared by the research service and
+the components it is built from.
+"""
+
+
+class ResearchError(Exception):
+    """Base exception for research service errors."""
+    pass
+
+
+class AgentSessionError(ResearchError):
+    """Exception raised when there's an error with agent sessions."""
+    pass
+
+
+class ResearchResponseError(ResearchError):
+    """Exception raised when there's an error with research responses."""
+    pass
+
+
+class AdmissionRejected(ResearchError):
+    """Exception raised when a request is not admitted to call upstream."""
+    
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        """
+        Initialize the exception.
+        
+        Args:
+            message (str): Description of the rejection.
+            status_code (int): HTTP status to report, 429 or 503.
+            retry_after (int): Seconds the client should wait before retrying.
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class UpstreamUnavailable(ResearchError):
+    """Exception raised when upstream is shedding load or the request ran out of time."""
+    
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        """
+        Initialize the exception.
+        
+        Args:
+            message (str): Description of the failure.
+            status_code (int): HTTP status to report, 503 or 504.
+            retry_after (int): Seconds the client should wait before retrying.
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class InputTooLarge(ResearchError):
+    """Exception raised when a request's input is over its token budget and is rejected."""
+    pass
+
+
+class ConversationNotFound(ResearchError):
+    """Exception raised when a conversation handle is unknown or has expired."""
+    pass
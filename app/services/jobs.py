@@ -0,0 +1,718 @@
+"""
+Background research jobs.
+
+This module contains the durable SQLite job store and the in-process runner that
+works through queued jobs, so clients can submit research and collect the result
+later by polling or through a callback URL instead of holding a connection open.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import get_settings, Settings
+from app.core.logging import setup_logger
+from app.core.metrics import REGISTRY, Counter, Gauge
+from app.services.errors import AdmissionRejected, UpstreamUnavailable
+from app.services.research import ResearchService, get_research_service
+from app.services.scheduling import set_client_context
+
+# Set up logger for this module
+logger = setup_logger(__name__)
+
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+# Attempts made to deliver a job to its callback URL
+CALLBACK_ATTEMPTS = 3
+
+# Longest wait between polls after the job store failed
+MAX_ERROR_BACKOFF = 30.0
+
+# Errors after which a job is retried later instead of failing: upstream is
+# shedding load or busy, which passes
+TRANSIENT_ERRORS = (AdmissionRejected, UpstreamUnavailable)
+
+# Delay before the first retry of a job, doubled on each later one up to the maximum
+RETRY_BASE_DELAY = 5.0
+MAX_RETRY_DELAY = 300.0
+
+JOBS_QUEUED = REGISTRY.register(Gauge(
+    "research_jobs_queued",
+    "Research jobs waiting to run in this process's view of the job store",
+))
+JOBS_RETRIED = REGISTRY.register(Counter(
+    "research_jobs_retried_total",
+    "Research jobs put back in the queue after a transient error",
+))
+JOBS_FINISHED = REGISTRY.register(Counter(
+    "research_jobs_finished_total",
+    "Research jobs finished, by final status",
+    labelnames=("status",),
+))
+CALLBACKS = REGISTRY.register(Counter(
+    "research_job_callbacks_total",
+    "Job callback deliveries, by outcome",
+    labelnames=("outcome",),
+))
+
+
+class JobStore:
+    """
+    Research jobs stored in a SQLite database that several processes can share.
+
+    Running jobs are leased by the store that claimed them. The owner renews the
+    lease while the job runs, and only jobs whose lease has expired, because their
+    owner stopped or hung, are put back in the queue for other owners.
+    """
+
+    _COLUMNS = (
+        "id, topic, format, profile, status, result, error, callback_url, "
+        "client_id, priority, created_at, updated_at, expires_at, owner, lease_expires_at, "
+        "attempts, not_before"
+    )
+
+    def __init__(self, path: str, owner: Optional[str] = None):
+        """
+        Initialize the store, creating the backing table if needed.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            owner (Optional[str]): Name under which this store leases jobs; unique
+                to the process when not given.
+        """
+        self.path = path
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS research_jobs ("
+            "id TEXT PRIMARY KEY, topic TEXT NOT NULL, format TEXT NOT NULL, profile TEXT, "
+            "status TEXT NOT NULL, result TEXT, error TEXT, callback_url TEXT, "
+            "client_id TEXT NOT NULL, priority TEXT NOT NULL, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, expires_at REAL, "
+            "owner TEXT, lease_expires_at REAL, attempts INTEGER NOT NULL DEFAULT 0, not_before REAL)"
+        )
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(research_jobs)")}
+        if "profile" not in columns:
+            # Stores created before jobs recorded the requested agent profile
+            self._conn.execute("ALTER TABLE research_jobs ADD COLUMN profile TEXT")
+        if "owner" not in columns:
+            # Stores created before running jobs were leased; their running jobs count as expired
+            self._conn.execute("ALTER TABLE research_jobs ADD COLUMN owner TEXT")
+            self._conn.execute("ALTER TABLE research_jobs ADD COLUMN lease_expires_at REAL")
+        if "attempts" not in columns:
+            # Stores created before jobs were retried after transient errors
+            self._conn.execute("ALTER TABLE research_jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("ALTER TABLE research_jobs ADD COLUMN not_before REAL")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS research_jobs_queue ON research_jobs (status, created_at)"
+        )
+
+    def create(
+        self,
+        topic: str,
+        output_format: str,
+        callback_url: Optional[str],
+        client_id: str,
+        priority: str,
+        profile: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue a new job.
+
+        Args:
+            topic (str): The research topic.
+            output_format (str): The desired output format.
+            callback_url (Optional[str]): URL notified when the job finishes.
+            client_id (str): Identifier of the submitting client.
+            priority (str): Priority class the job runs in.
+            profile (Optional[str]): Requested agent profile, if any.
+
+        Returns:
+            Dict[str, Any]: The stored job.
+        """
+        now = time.time()
+        job = {
+            "id": uuid.uuid4().hex,
+            "topic": topic,
+            "format": output_format,
+            "profile": profile,
+            "status": JOB_QUEUED,
+            "result": None,
+            "error": None,
+            "callback_url": callback_url,
+            "client_id": client_id,
+            "priority": priority,
+            "created_at": now,
+            "updated_at": now,
+            "expires_at": None,
+            "owner": None,
+            "lease_expires_at": None,
+            "attempts": 0,
+            "not_before": None,
+        }
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO research_jobs ({self._COLUMNS}) VALUES "
+                "(:id, :topic, :format, :profile, :status, :result, :error, :callback_url, "
+                ":client_id, :priority, :created_at, :updated_at, :expires_at, :owner, :lease_expires_at, "
+                ":attempts, :not_before)",
+                job
+            )
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job by ID.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            Optional[Dict[str, Any]]: The job, or None if it does not exist or has expired.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM research_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = self._to_job(row)
+        if job["expires_at"] is not None and job["expires_at"] <= time.time():
+            return None
+        return job
+
+    def claim(self, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the oldest queued job and mark it running under a lease.
+
+        Jobs waiting to be retried are skipped until their delay has passed.
+
+        Args:
+            lease_seconds (float): Seconds the job stays leased unless renewed.
+
+        Returns:
+            Optional[Dict[str, Any]]: The claimed job, or None if no job is ready.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    f"SELECT {self._COLUMNS} FROM research_jobs WHERE status = ? "
+                    "AND (not_before IS NULL OR not_before <= ?) ORDER BY created_at LIMIT 1",
+                    (JOB_QUEUED, now)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE research_jobs SET status = ?, updated_at = ?, owner = ?, "
+                        "lease_expires_at = ? WHERE id = ?",
+                        (JOB_RUNNING, now, self.owner, now + lease_seconds, row["id"])
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return {
+            **self._to_job(row),
+            "status": JOB_RUNNING,
+            "owner": self.owner,
+            "lease_expires_at": now + lease_seconds,
+        }
+
+    def renew(self, job_ids: List[str], lease_seconds: float) -> int:
+        """
+        Extend the leases of running jobs owned by this store.
+
+        Args:
+            job_ids (List[str]): The jobs to renew.
+            lease_seconds (float): Seconds from now the leases last.
+
+        Returns:
+            int: The number of leases renewed; jobs whose lease was lost are not.
+        """
+        expires_at = time.time() + lease_seconds
+        with self._lock:
+            cursor = self._conn.executemany(
+                "UPDATE research_jobs SET lease_expires_at = ? WHERE id = ? AND status = ? AND owner = ?",
+                [(expires_at, job_id, JOB_RUNNING, self.owner) for job_id in job_ids]
+            )
+            return cursor.rowcount
+
+    def finish(
+        self,
+        job_id: str,
+        status: str,
+        ttl_seconds: float,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> bool:
+        """
+        Record the outcome of a job, if this store still holds its lease.
+
+        Args:
+            job_id (str): The job ID.
+            status (str): JOB_SUCCEEDED or JOB_FAILED.
+            ttl_seconds (float): How long the outcome is kept.
+            result (Optional[Dict[str, Any]]): The research results, if the job succeeded.
+            error (Optional[str]): The error message, if the job failed.
+
+        Returns:
+            bool: Whether the outcome was recorded; False if the lease was lost and
+                the job was requeued for another owner.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE research_jobs SET status = ?, result = ?, error = ?, updated_at = ?, "
+                "expires_at = ?, owner = NULL, lease_expires_at = NULL "
+                "WHERE id = ? AND status = ? AND owner = ?",
+                (status, None if result is None else json.dumps(result), error, now, now + ttl_seconds,
+                 job_id, JOB_RUNNING, self.owner)
+            )
+            return cursor.rowcount > 0
+
+    def requeue(self, job_ids: List[str]) -> int:
+        """
+        Put running jobs owned by this store back in the queue.
+
+        Args:
+            job_ids (List[str]): The jobs to requeue.
+
+        Returns:
+            int: The number of jobs requeued.
+        """
+        with self._lock:
+            cursor = self._conn.executemany(
+                "UPDATE research_jobs SET status = ?, owner = NULL, lease_expires_at = NULL "
+                "WHERE id = ? AND status = ? AND owner = ?",
+                [(JOB_QUEUED, job_id, JOB_RUNNING, self.owner) for job_id in job_ids]
+            )
+            return cursor.rowcount
+
+    def retry(self, job_id: str, delay: float) -> bool:
+        """
+        Put a running job owned by this store back in the queue to run again later.
+
+        Args:
+            job_id (str): The job ID.
+            delay (float): Seconds before the job may be claimed again.
+
+        Returns:
+            bool: Whether the job was requeued; False if the lease was lost.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE research_jobs SET status = ?, owner = NULL, lease_expires_at = NULL, "
+                "attempts = attempts + 1, not_before = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? AND owner = ?",
+                (JOB_QUEUED, now + delay, now, job_id, JOB_RUNNING, self.owner)
+            )
+            return cursor.rowcount > 0
+
+    def requeue_expired(self) -> int:
+        """
+        Put running jobs whose lease has expired back in the queue.
+
+        Such jobs were left behind by an owner that stopped or hung without
+        finishing them. Jobs leased by live owners are left alone.
+
+        Returns:
+            int: The number of jobs requeued.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE research_jobs SET status = ?, owner = NULL, lease_expires_at = NULL "
+                "WHERE status = ? AND (lease_expires_at IS NULL OR lease_expires_at <= ?)",
+                (JOB_QUEUED, JOB_RUNNING, time.time())
+            )
+            return cursor.rowcount
+
+    def count_queued(self) -> int:
+        """Get the number of queued jobs."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM research_jobs WHERE status = ?", (JOB_QUEUED,)
+            ).fetchone()[0]
+
+    def purge_expired(self) -> int:
+        """
+        Delete finished jobs whose outcome has expired.
+
+        Returns:
+            int: The number of jobs deleted.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM research_jobs WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),)
+            )
+            return cursor.rowcount
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a database row to a job dictionary."""
+        job = dict(row)
+        if job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+
+class JobRunner:
+    """
+    Runs queued research jobs on a pool of in-process worker tasks.
+
+    Workers wake up as soon as a job is submitted to this process and also poll
+    the store, which picks up jobs queued before a restart or by other processes.
+    A heartbeat renews the leases of running jobs and requeues jobs whose owner
+    has stopped renewing theirs. Store calls run in the default executor, so that
+    a locked database never blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        service: ResearchService,
+        workers: int,
+        result_ttl: float,
+        max_queued: int,
+        poll_interval: float = 1.0,
+        callback_timeout: float = 10.0,
+        lease_seconds: float = 60.0,
+        callback_hosts: Optional[List[str]] = None,
+        callback_allow_http: bool = False,
+        max_attempts: int = 5
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            store (JobStore): Durable job store.
+            service (ResearchService): Service performing the research.
+            workers (int): Number of jobs run at once.
+            result_ttl (float): Seconds finished jobs are kept.
+            max_queued (int): Maximum number of queued jobs before submissions are rejected.
+            poll_interval (float): Seconds between polls of the store when idle.
+            callback_timeout (float): Timeout of each callback delivery in seconds.
+            lease_seconds (float): Seconds a running job stays leased without a
+                heartbeat; the heartbeat renews leases three times per period.
+            callback_hosts (Optional[List[str]]): Hosts callback URLs may point at;
+                entries starting with "." also allow subdomains. None or empty
+                disables callbacks.
+            callback_allow_http (bool): Whether callback URLs may use plain HTTP.
+            max_attempts (int): Runs of a job, counting retries after transient
+                errors, before it is marked failed.
+        """
+        self.store = store
+        self.service = service
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self.max_queued = max_queued
+        self.poll_interval = poll_interval
+        self.callback_timeout = callback_timeout
+        self.lease_seconds = lease_seconds
+        self.callback_hosts = [host.lower() for host in callback_hosts or []]
+        self.callback_allow_http = callback_allow_http
+        self.max_attempts = max_attempts
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._running: Dict[str, "asyncio.Task[None]"] = {}
+        self._queued = 0
+
+    @property
+    def saturation(self) -> float:
+        """Fill of the job queue from 0 to 1, as of the last count of the queue."""
+        if self.max_queued <= 0:
+            return 1.0
+        return min(1.0, self._queued / self.max_queued)
+
+    def check_callback_url(self, url: str) -> None:
+        """
+        Check that a callback URL points at an allowed host.
+
+        Args:
+            url (str): The callback URL.
+
+        Raises:
+            ValueError: If callbacks are disabled, or the URL's scheme or host is not allowed.
+        """
+        if not self.callback_hosts:
+            raise ValueError("Callbacks are disabled on this server")
+        parts = urlsplit(url)
+        schemes = ("https", "http") if self.callback_allow_http else ("https",)
+        if parts.scheme not in schemes:
+            raise ValueError(f"Callback URLs must use {' or '.join(schemes)}")
+        host = (parts.hostname or "").lower()
+        if not any(host == allowed or (allowed.startswith(".") and host.endswith(allowed))
+                   for allowed in self.callback_hosts):
+            raise ValueError(f"Callbacks to host '{host}' are not allowed")
+
+    async def submit(
+        self,
+        topic: str,
+        output_format: str,
+        callback_url: Optional[str],
+        client_id: str,
+        priority: str,
+        profile: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue a research job.
+
+        Args:
+            topic (str): The research topic.
+            output_format (str): The desired output format.
+            callback_url (Optional[str]): URL notified when the job finishes.
+            client_id (str): Identifier of the submitting client.
+            priority (str): Priority class the job runs in.
+            profile (Optional[str]): Requested agent profile, if any.
+
+        Returns:
+            Dict[str, Any]: The queued job.
+
+        Raises:
+            ValueError: If the callback URL is not allowed.
+            AdmissionRejected: With status 429 if the job queue is full.
+        """
+        if callback_url is not None:
+            self.check_callback_url(callback_url)
+        queued = await self._count_queued()
+        if queued >= self.max_queued:
+            raise AdmissionRejected("Too many research jobs are queued", status_code=429, retry_after=60)
+        job = await asyncio.to_thread(
+            self.store.create, topic, output_format, callback_url, client_id, priority, profile
+        )
+        self._queued += 1
+        logger.info("Queued research job %s for topic: '%s'", job["id"], topic)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job by ID.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            Optional[Dict[str, Any]]: The job, or None if it does not exist or has expired.
+        """
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    def start(self) -> None:
+        """Start the worker tasks and the heartbeat, which first requeues abandoned jobs."""
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.ensure_future(self._heartbeat())]
+        self._tasks += [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Stop the workers, returning the jobs they were running to the queue."""
+        # Taken first, since cancelled workers forget their jobs on the way out
+        interrupted = list(self._running)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if interrupted:
+            await asyncio.to_thread(self.store.requeue, interrupted)
+            logger.info("Returned %s running research job(s) to the queue", len(interrupted))
+
+    async def _count_queued(self) -> int:
+        """Count the queued jobs and remember the count for saturation."""
+        self._queued = await asyncio.to_thread(self.store.count_queued)
+        JOBS_QUEUED.set(self._queued)
+        return self._queued
+
+    async def _heartbeat(self) -> None:
+        """Renew the leases of running jobs and requeue abandoned ones until cancelled."""
+        while True:
+            try:
+                if self._running:
+                    await asyncio.to_thread(self.store.renew, list(self._running), self.lease_seconds)
+                requeued = await asyncio.to_thread(self.store.requeue_expired)
+                if requeued:
+                    logger.info("Requeued %s research job(s) whose owner stopped", requeued)
+                    self._wakeup.set()
+                purged = await asyncio.to_thread(self.store.purge_expired)
+                if purged:
+                    logger.info("Purged %s expired research job(s)", purged)
+                await self._count_queued()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Job store heartbeat failed: %s", e)
+            await asyncio.sleep(self.lease_seconds / 3)
+
+    async def _work(self) -> None:
+        """Run jobs until cancelled, backing off while the job store fails."""
+        backoff = self.poll_interval
+        while True:
+            try:
+                job = await asyncio.to_thread(self.store.claim, self.lease_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Could not claim a research job, retrying in %.1fs: %s", backoff, e)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, MAX_ERROR_BACKOFF)
+                continue
+            backoff = self.poll_interval
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._queued = max(0, self._queued - 1)
+            self._running[job["id"]] = asyncio.current_task()
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # The job keeps its lease until it expires and another owner retries it
+                logger.error("Research job %s could not be completed: %s", job["id"], e)
+            finally:
+                self._running.pop(job["id"], None)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        """Run one job, record its outcome and deliver the callback."""
+        logger.info("Running research job %s", job["id"])
+        # Schedule the upstream call as the client that submitted the job
+        set_client_context(job["client_id"], job["priority"])
+        try:
+            result = await self.service.perform_research(job["topic"], job["format"], job["profile"])
+        except asyncio.CancelledError:
+            raise
+        except TRANSIENT_ERRORS as e:
+            if job["attempts"] + 1 < self.max_attempts:
+                await self._retry_later(job, e)
+                return
+            logger.warning("Research job %s failed after %s attempts: %s", job["id"], self.max_attempts, e)
+            status, outcome = JOB_FAILED, {"error": str(e)}
+        except Exception as e:
+            logger.warning("Research job %s failed: %s", job["id"], e)
+            status, outcome = JOB_FAILED, {"error": str(e)}
+        else:
+            status = JOB_SUCCEEDED
+            outcome = {"result": {"topic": result["topic"], "format": result["format"], "result": result["result"]}}
+        recorded = await asyncio.to_thread(self.store.finish, job["id"], status, self.result_ttl, **outcome)
+        if not recorded:
+            # Another owner took the job over after its lease expired and reports it
+            logger.warning("Research job %s lost its lease; discarding its outcome", job["id"])
+            return
+        JOBS_FINISHED.inc(status=status)
+
+        if job["callback_url"]:
+            finished = await asyncio.to_thread(self.store.get, job["id"])
+            if finished is not None:
+                await self._deliver(finished)
+
+    async def _retry_later(self, job: Dict[str, Any], error: Union[AdmissionRejected, UpstreamUnavailable]) -> None:
+        """Put a job that hit a transient error back in the queue with a growing delay."""
+        delay = min(MAX_RETRY_DELAY, max(RETRY_BASE_DELAY * 2 ** job["attempts"], error.retry_after))
+        if await asyncio.to_thread(self.store.retry, job["id"], delay):
+            JOBS_RETRIED.inc()
+            self._queued += 1
+            logger.info("Research job %s will be retried in %.0fs: %s", job["id"], delay, error)
+        else:
+            logger.warning("Research job %s lost its lease; not retrying it", job["id"])
+
+    async def _deliver(self, job: Dict[str, Any]) -> None:
+        """POST a finished job to its callback URL, retrying failed deliveries."""
+        try:
+            # Jobs may have been queued before the allowed hosts changed
+            self.check_callback_url(job["callback_url"])
+        except ValueError as e:
+            logger.warning("Not delivering callback for research job %s: %s", job["id"], e)
+            CALLBACKS.inc(outcome="refused")
+            return
+        payload = {key: job[key] for key in ("id", "status", "topic", "format", "result", "error")}
+        async with httpx.AsyncClient(timeout=self.callback_timeout) as client:
+            for attempt in range(1, CALLBACK_ATTEMPTS + 1):
+                try:
+                    response = await client.post(job["callback_url"], json=payload)
+                    if response.status_code < 500:
+                        CALLBACKS.inc(outcome="delivered")
+                        return
+                    error: Any = f"status {response.status_code}"
+                except httpx.HTTPError as e:
+                    error = e
+                logger.warning(
+                    "Callback for research job %s failed (attempt %s): %s", job["id"], attempt, error
+                )
+                if attempt < CALLBACK_ATTEMPTS:
+                    await asyncio.sleep(2 ** attempt)
+        CALLBACKS.inc(outcome="failed")
+
+
+def create_job_runner(settings: Settings, service: ResearchService) -> Optional[JobRunner]:
+    """
+    Build the job runner described by the application settings.
+
+    Args:
+        settings (Settings): Application settings.
+        service (ResearchService): Service performing the research.
+
+    Returns:
+        Optional[JobRunner]: The job runner, or None if background jobs are disabled.
+    """
+    if not settings.JOBS_ENABLED:
+        return None
+    return JobRunner(
+        store=JobStore(settings.JOBS_DB_PATH),
+        service=service,
+        workers=settings.JOBS_WORKERS,
+        result_ttl=settings.JOBS_RESULT_TTL,
+        max_queued=settings.JOBS_MAX_QUEUED,
+        poll_interval=settings.JOBS_POLL_INTERVAL,
+        callback_timeout=settings.JOBS_CALLBACK_TIMEOUT,
+        lease_seconds=settings.JOBS_LEASE_SECONDS,
+        callback_hosts=settings.JOBS_CALLBACK_ALLOWED_HOSTS,
+        callback_allow_http=settings.JOBS_CALLBACK_ALLOW_HTTP,
+        max_attempts=settings.JOBS_MAX_ATTEMPTS,
+    )
+
+
+_job_runner: Optional[JobRunner] = None
+_job_runner_built = False
+_job_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> Optional[JobRunner]:
+    """
+    Get the shared job runner, building it on first use.
+
+    Returns:
+        Optional[JobRunner]: The job runner of this process, or None if background
+            jobs are disabled.
+    """
+    global _job_runner, _job_runner_built
+    if not _job_runner_built:
+        with _job_runner_lock:
+            if not _job_runner_built:
+                _job_runner = create_job_runner(get_settings(), get_research_service())
+                _job_runner_built = True
+    return _job_runner
@@ -0,0 +1,347 @@
+"""
+Result cache priming.
+
+This module warms the configured result cache from a list of topics, read from
+a CSV or JSONL file or taken from the most requested topics in the application
+logs. Items are researched at a bounded rate in a low priority class, so that
+priming never crowds out interactive traffic, and progress is checkpointed so
+that an interrupted run resumes where it stopped.
+"""
+
+import asyncio
+import csv
+import json
+import os
+import re
+from collections import Counter as TallyCounter
+from contextlib import contextmanager
+from typing import Any, Awaitable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - fcntl is POSIX only
+    fcntl = None
+
+from app.core.config import Settings
+from app.core.logging import setup_logger
+from app.core.metrics import REGISTRY, Counter
+from app.services.cache import CACHE_MISS, make_cache_key
+from app.services.errors import ResearchError
+from app.services.research import ResearchService
+from app.services.scheduling import TokenBucket, set_client_context
+
+# Set up logger for this module
+logger = setup_logger(__name__)
+
+
+# Client that priming requests are attributed to
+PRIMER_CLIENT = "primer"
+
+# Item to prime: topic, output format and requested agent profile
+PrimingItem = Tuple[str, str, Optional[str]]
+
+# Request log lines written by the research endpoints
+REQUEST_LOG_LINE = re.compile(r"research request - Topic: '(?P<topic>.*)', Format: '(?P<format>.*)'")
+
+PRIMED = REGISTRY.register(Counter(
+    "cache_priming_items_total",
+    "Items processed by cache priming, by outcome",
+    labelnames=("outcome",),
+))
+
+
+def read_items(path: str) -> Iterator[PrimingItem]:
+    """
+    Stream the items of a topic list file.
+
+    CSV files have the columns topic, format and profile, of which only the topic
+    is required, with an optional header row naming them in any order. JSONL files have one object per line
+    with the same keys. Rows without a topic are skipped.
+
+    Args:
+        path (str): Path of a .csv or .jsonl file.
+
+    Yields:
+        PrimingItem: The topic, output format and profile of each row.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            rows = _jsonl_rows(f, path)
+        else:
+            rows = _csv_rows(f)
+        for row in rows:
+            topic = (row.get("topic") or "").strip()
+            if topic:
+                yield topic, (row.get("format") or "summary").strip(), (row.get("profile") or "").strip() or None
+
+
+def _csv_rows(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """Parse CSV rows into dictionaries, with or without a header row."""
+    columns = ["topic", "format", "profile"]
+    for index, values in enumerate(csv.reader(lines)):
+        names = [value.strip().lower() for value in values]
+        if index == 0 and "topic" in names:
+            columns = names
+            continue
+        yield dict(zip(columns, values))
+
+
+def _jsonl_rows(lines: Iterable[str], path: str) -> Iterator[Dict[str, Any]]:
+    """Parse JSONL rows, skipping malformed lines."""
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            logger.warning("Skipping malformed line %s of %s", number, path)
+            continue
+        if isinstance(row, dict):
+            yield row
+
+
+def top_logged_topics(path: str, top_n: int) -> List[PrimingItem]:
+    """
+    Find the most requested topics in an application log.
+
+    Text and JSON log lines are both understood. Requests are counted by cache
+    key, so different spellings of a topic add up, and each key is primed with
+    the spelling seen first.
+
+    Args:
+        path (str): Path of the log file, read line by line.
+        top_n (int): Number of topics to return.
+
+    Returns:
+        List[PrimingItem]: The most requested topics and formats, most requested first.
+    """
+    counts: TallyCounter = TallyCounter()
+    spellings: Dict[str, Tuple[str, str]] = {}
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("{"):
+                try:
+                    line = json.loads(line).get("message", "")
+                except ValueError:
+                    continue
+            match = REQUEST_LOG_LINE.search(line)
+            if match is None:
+                continue
+            key = make_cache_key(match.group("topic"), match.group("format"))
+            counts[key] += 1
+            spellings.setdefault(key, (match.group("topic"), match.group("format")))
+    return [(*spellings[key], None) for key, _ in counts.most_common(top_n)]
+
+
+class CachePrimer:
+    """
+    Researches a stream of items at a bounded rate to fill the result cache.
+    """
+
+    def __init__(
+        self,
+        service: ResearchService,
+        rate: float,
+        concurrency: int,
+        priority: str,
+        checkpoint_path: Optional[str] = None,
+        progress_interval: int = 100
+    ):
+        """
+        Initialize the primer.
+
+        Args:
+            service (ResearchService): Service performing the research.
+            rate (float): Items started per second.
+            concurrency (int): Items researched at once.
+            priority (str): Priority class of the priming requests.
+            checkpoint_path (Optional[str]): File recording the progress of each
+                source, or None to always start from the beginning.
+            progress_interval (int): Items between progress reports and checkpoints.
+        """
+        self.service = service
+        self.rate = rate
+        self.concurrency = concurrency
+        self.priority = priority
+        self.checkpoint_path = checkpoint_path
+        self.progress_interval = progress_interval
+
+    async def prime(self, items: Iterable[PrimingItem], source: str, restart: bool = False) -> Dict[str, int]:
+        """
+        Research every item, resuming after the items a previous run completed.
+
+        Args:
+            items (Iterable[PrimingItem]): The items, in a stable order.
+            source (str): Name of the item source, under which progress is checkpointed.
+            restart (bool): Whether to ignore the checkpoint and start over.
+
+        Returns:
+            Dict[str, int]: The number of items "skipped" as already done by an earlier
+                run, and of items "primed", already "cached" and "failed" in this run.
+                All are zero if another process holds the checkpoint.
+        """
+        with self._checkpoint_lock() as locked:
+            if not locked:
+                logger.warning("Another process is priming with checkpoint %s; not priming", self.checkpoint_path)
+                return {"skipped": 0, "primed": 0, "cached": 0, "failed": 0}
+            return await self._prime(items, source, restart)
+
+    async def _prime(self, items: Iterable[PrimingItem], source: str, restart: bool) -> Dict[str, int]:
+        """Prime the items while holding the checkpoint; see prime."""
+        if self.service.cache is None:
+            logger.warning("Result caching is disabled; priming will not store any results")
+        set_client_context(PRIMER_CLIENT, self.priority)
+
+        completed = 0 if restart else self._load_checkpoint().get(source, 0)
+        stats = {"skipped": 0, "primed": 0, "cached": 0, "failed": 0}
+        bucket = TokenBucket(rate=self.rate, burst=1.0)
+        slots = asyncio.Semaphore(self.concurrency)
+        finished: Set[int] = set()
+        tasks: Set["asyncio.Task[None]"] = set()
+        if completed:
+            logger.info("Resuming priming of %s after %s item(s)", source, completed)
+
+        async def prime_one(index: int, item: PrimingItem) -> None:
+            nonlocal completed
+            try:
+                outcome = await self._research(*item)
+            finally:
+                slots.release()
+            stats[outcome] += 1
+            finished.add(index)
+            # Items may finish out of order; the checkpoint only covers a complete prefix
+            while completed in finished:
+                finished.remove(completed)
+                completed += 1
+            done = stats["primed"] + stats["cached"] + stats["failed"]
+            if done % self.progress_interval == 0:
+                logger.info("Priming %s: %s", source, stats)
+                self._save_checkpoint(source, completed)
+
+        try:
+            for index, item in enumerate(items):
+                if index < completed:
+                    stats["skipped"] += 1
+                    continue
+                await slots.acquire()
+                wait = bucket.try_take()
+                while wait > 0:
+                    await asyncio.sleep(wait)
+                    wait = bucket.try_take()
+                task = asyncio.ensure_future(prime_one(index, item))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in list(tasks):
+                task.cancel()
+            self._save_checkpoint(source, completed)
+        logger.info("Finished priming %s: %s", source, stats)
+        return stats
+
+    async def _research(self, topic: str, output_format: str, profile: Optional[str]) -> str:
+        """Research one item and classify the outcome as primed, cached or failed."""
+        try:
+            result = await self.service.perform_research(topic, output_format, profile)
+        except ResearchError as e:
+            logger.warning("Could not prime topic '%s' in format '%s': %s", topic, output_format, e)
+            PRIMED.inc(outcome="failed")
+            return "failed"
+        outcome = "primed" if result.get("cache_status") == CACHE_MISS else "cached"
+        PRIMED.inc(outcome=outcome)
+        return outcome
+
+    @contextmanager
+    def _checkpoint_lock(self) -> Iterator[bool]:
+        """Hold an exclusive lock on the checkpoint, yielding whether it was acquired."""
+        if self.checkpoint_path is None or fcntl is None:
+            yield True
+            return
+        with open(f"{self.checkpoint_path}.lock", "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_checkpoint(self) -> Dict[str, int]:
+        """Read the number of completed items of each source."""
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return {}
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable priming checkpoint %s: %s", self.checkpoint_path, e)
+            return {}
+
+    def _save_checkpoint(self, source: str, completed: int) -> None:
+        """Record the number of completed items of a source."""
+        if self.checkpoint_path is None:
+            return
+        checkpoint = self._load_checkpoint()
+        checkpoint[source] = completed
+        temporary = self.checkpoint_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(temporary, self.checkpoint_path)
+
+
+def create_cache_primer(settings: Settings, service: ResearchService) -> CachePrimer:
+    """
+    Build the cache primer described by the application settings.
+
+    Args:
+        settings (Settings): Application settings.
+        service (ResearchService): Service performing the research.
+
+    Returns:
+        CachePrimer: The cache primer.
+    """
+    return CachePrimer(
+        service=service,
+        rate=settings.PRIME_RATE,
+        concurrency=settings.PRIME_CONCURRENCY,
+        priority=settings.PRIME_PRIORITY_CLASS,
+        checkpoint_path=settings.PRIME_CHECKPOINT_FILE,
+    )
+
+
+async def prime_in_background(
+    primer: CachePrimer,
+    path: str,
+    after: Optional[Awaitable[Any]] = None,
+    shared: bool = False
+) -> None:
+    """
+    Prime the cache from a topic list file once startup work has finished.
+
+    The whole list is primed on every start, since a checkpoint from an earlier
+    process says nothing about the cache of this one; items still in a shared
+    cache are cheap hits. With a shared cache, worker processes compete for the
+    checkpoint lock and only the one that gets it primes. Otherwise every worker
+    primes its own in-process cache, without a checkpoint.
+
+    Failures are logged rather than raised, since nothing awaits this task.
+
+    Args:
+        primer (CachePrimer): The cache primer.
+        path (str): Path of the topic list file.
+        after (Optional[Awaitable[Any]]): Work to wait for first, such as the warm-up.
+        shared (bool): Whether the result cache is shared between processes.
+    """
+    if not shared:
+        primer.checkpoint_path = None
+    try:
+        if after is not None:
+            await after
+        await primer.prime(read_items(path), source=os.path.abspath(path), restart=True)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error("Cache priming from %s failed: %s", path, e)
@@ -4,28 +4,139 @@ Research service implementation.
 This module contains the business logic for performing research using the Julep AI agent.
 """
 
-from typing import Dict, Any
+import asyncio
+import math
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
 
-from app.core.agent import agent_manager
+from app.core.agent import AgentProfile, JulepAgentManager, get_agent_manager
+from app.core.config import Settings, get_settings
 from app.core.logging import setup_logger
+from app.core.metrics import timed
+from app.core.resilience import CircuitOpenError, DeadlineExceeded, deadline
+from app.core.session_pool import SessionLease
+from app.services.admission import REJECTIONS, AdmissionController, create_admission_controller
+from app.services.cache import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_SEMANTIC_HIT,
+    ResultCache,
+    create_result_cache,
+    make_cache_key,
+    normalize_format,
+)
+from app.services.coalesce import SingleFlight
+from app.services.conversations import CONVERSATIONS, ConversationRegistry, create_conversation_registry
+from app.services.semantic_cache import SemanticCache, create_semantic_cache
+from app.services.shaping import RequestShaper, create_request_shaper, record_tokens
+from app.services.scheduling import ClientContext, ClientRateLimiter, create_rate_limiter, current_client
+from app.services.errors import (
+    AdmissionRejected,
+    AgentSessionError,
+    ConversationNotFound,
+    InputTooLarge,
+    ResearchError,
+    ResearchResponseError,
+    UpstreamUnavailable,
+)
 
 # Set up logger for this module
 logger = setup_logger(__name__)
 
 
-class ResearchError(Exception):
-    """Base exception for research service errors."""
-    pass
+def build_prompt(topic: str, output_format: str, word_limit: Optional[int] = None) -> str:
+    """
+    Construct the user message asking the agent to research a topic.
+    
+    Args:
+        topic (str): The research topic.
+        output_format (str): The desired output format.
+        word_limit (Optional[int]): Maximum length of the answer in words, if any.
+        
+    Returns:
+        str: The prompt sent to the agent.
+    """
+    prompt = (
+        f"Please research the topic '{topic}' and provide the "
+        f"information in '{output_format}' format."
+    )
+    if word_limit is not None:
+        prompt += f" Keep the answer under {word_limit} words."
+    return prompt
 
 
-class AgentSessionError(ResearchError):
-    """Exception raised when there's an error with agent sessions."""
-    pass
+def build_follow_up_prompt(instruction: Optional[str], output_format: Optional[str]) -> str:
+    """
+    Construct the user message asking the agent to rework its previous answer.
+    
+    Args:
+        instruction (Optional[str]): What the client wants changed or expanded, if anything.
+        output_format (Optional[str]): Format to rewrite the answer in, if it changes.
+        
+    Returns:
+        str: The prompt sent to the agent.
+    """
+    parts = []
+    if output_format is not None:
+        parts.append(f"Please provide the same information in '{output_format}' format.")
+    if instruction:
+        parts.append(instruction)
+    if not parts:
+        parts.append("Please expand on your previous answer in more depth.")
+    return " ".join(parts)
+
+
+def response_content(response: Any) -> str:
+    """
+    Get the text of a chat response.
+    
+    Args:
+        response (Any): The response from the agent.
+        
+    Returns:
+        str: The content of the first choice.
+        
+    Raises:
+        ResearchResponseError: If the response is not shaped like a chat completion.
+    """
+    if not hasattr(response, 'choices') or not response.choices:
+        error_msg = "Invalid response format: missing 'choices'"
+        logger.error(error_msg)
+        raise ResearchResponseError(error_msg)
+    
+    if not hasattr(response.choices[0], 'message') or not hasattr(response.choices[0].message, 'content'):
+        error_msg = "Invalid response format: missing 'message.content'"
+        logger.error(error_msg)
+        raise ResearchResponseError(error_msg)
+    
+    return response.choices[0].message.content
 
 
-class ResearchResponseError(ResearchError):
-    """Exception raised when there's an error with research responses."""
-    pass
+def _as_unavailable(error: Exception) -> Optional[UpstreamUnavailable]:
+    """
+    Translate load shedding and deadline errors from the agent manager.
+    
+    Args:
+        error (Exception): The error raised by an upstream call.
+        
+    Returns:
+        Optional[UpstreamUnavailable]: The error to report, or None if the error
+            is of another kind.
+    """
+    if isinstance(error, CircuitOpenError):
+        return UpstreamUnavailable(
+            "Research service is temporarily unavailable",
+            status_code=503,
+            retry_after=max(1, math.ceil(error.retry_after))
+        )
+    if isinstance(error, DeadlineExceeded):
+        return UpstreamUnavailable(
+            "Research request did not complete in time",
+            status_code=504,
+            retry_after=1
+        )
+    return None
 
 
 class ResearchService:
@@ -33,79 +144,674 @@ class ResearchService:
     Service for handling research requests.
     """
     
-    @staticmethod
-    async def perform_research(topic: str, output_format: str) -> Dict[str, Any]:
+    def __init__(
+        self,
+        cache: Optional[ResultCache] = None,
+        coalescer: Optional[SingleFlight] = None,
+        admission: Optional[AdmissionController] = None,
+        rate_limiter: Optional[ClientRateLimiter] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        agent_manager: Optional[JulepAgentManager] = None,
+        shaper: Optional[RequestShaper] = None,
+        conversations: Optional[ConversationRegistry] = None
+    ):
+        """
+        Initialize the research service.
+        
+        Args:
+            cache (Optional[ResultCache]): Cache for research results, or None to disable caching.
+            coalescer (Optional[SingleFlight]): Group sharing identical in-flight requests,
+                or None to send every request upstream.
+            admission (Optional[AdmissionController]): Limiter for upstream calls, or None
+                to leave them unbounded.
+            rate_limiter (Optional[ClientRateLimiter]): Per-client request rate limits,
+                or None to disable rate limiting.
+            semantic_cache (Optional[SemanticCache]): Index matching paraphrased topics to
+                cached results, or None to only serve exact matches. Requires a cache.
+            agent_manager (Optional[JulepAgentManager]): Manager of the Julep agents,
+                or None to use the shared one.
+            shaper (Optional[RequestShaper]): Per-format token budgets of requests,
+                or None to send topics and output limits upstream as they are.
+            conversations (Optional[ConversationRegistry]): Registry of answers that can
+                be followed up on, or None to disable follow-ups.
+        """
+        self.cache = cache
+        self.coalescer = coalescer
+        self.admission = admission
+        self.rate_limiter = rate_limiter
+        self.semantic_cache = semantic_cache if cache is not None else None
+        self.agent_manager = agent_manager if agent_manager is not None else get_agent_manager()
+        self.shaper = shaper
+        self.conversations = conversations
+    
+    def check_rate_limit(self, client: ClientContext) -> None:
         """
-        Perform research on the given topic and format the results.
+        Count a request against the client's rate limit.
+        
+        Args:
+            client (ClientContext): The client making the request.
+            
+        Raises:
+            AdmissionRejected: With status 429 if the client is over its rate limit.
+        """
+        if self.rate_limiter is None:
+            return
+        wait = self.rate_limiter.check(client.client_id)
+        if wait > 0:
+            REJECTIONS.inc(reason="rate_limited")
+            logger.warning("Client %s is over its rate limit", client.client_id)
+            raise AdmissionRejected(
+                "Rate limit exceeded",
+                status_code=429,
+                retry_after=max(1, math.ceil(wait))
+            )
+    
+    async def perform_research(
+        self,
+        topic: str,
+        output_format: str,
+        profile: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Perform research on the given topic, serving repeated requests from the cache.
+        
+        Concurrent requests for the same normalized topic and format share a single
+        upstream call, and every waiter receives its result or its error. Upstream
+        calls are bounded by the REQUEST_DEADLINE_SECONDS deadline. Cached and
+        coalesced results are shared between agent profiles. Topics over the token
+        budget of their format are truncated or rejected first.
         
         Args:
             topic (str): The research topic.
             output_format (str): The desired output format.
+            profile (Optional[str]): Agent profile requested instead of the one
+                routed by format; unknown profiles are ignored.
             
         Returns:
-            Dict[str, Any]: Dictionary containing the research results.
+            Dict[str, Any]: Dictionary containing the research results, a
+                'cache_status' entry of HIT, SEMANTIC_HIT or MISS and, unless served
+                from the cache, the 'session' that answered, for open_conversation.
             
         Raises:
             AgentSessionError: If there's an error creating a session.
             ResearchResponseError: If there's an error getting a response.
+            UpstreamUnavailable: If upstream is shedding load or the deadline passes.
+            InputTooLarge: If the topic is over budget and oversized topics are rejected.
             ResearchError: For other research-related errors.
         """
-        logger.info(f"Starting research on topic: '{topic}' in format: '{output_format}'")
+        topic = self.shape_topic(topic, output_format)
+        with deadline(get_settings().REQUEST_DEADLINE_SECONDS):
+            return await self._perform_research(topic, output_format, profile)
+    
+    async def _perform_research(
+        self,
+        topic: str,
+        output_format: str,
+        profile: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Perform research within the current deadline; see perform_research."""
+        key = make_cache_key(topic, output_format)
+        cached, cache_status = await self._lookup_cached(key, topic, output_format)
+        if cached is not None:
+            logger.info("Cache hit for topic: '%s' in format: '%s'", topic, output_format)
+            return {**cached, "topic": topic, "format": output_format, "cache_status": cache_status}
         
-        try:
-            # Create a descriptive situation for the session
-            situation = (
-                f"User wants to research about '{topic}' and receive "
-                f"results in '{output_format}' format."
+        if self.coalescer is None:
+            result = await self._research_and_store(key, topic, output_format, profile)
+        else:
+            result = await self.coalescer.do(
+                key, lambda: self._research_and_store(key, topic, output_format, profile)
             )
+        return {**result, "topic": topic, "format": output_format, "cache_status": CACHE_MISS}
+    
+    def shape_topic(self, topic: str, output_format: str) -> str:
+        """
+        Keep a topic within the input token budget of its format.
+        
+        Args:
+            topic (str): The research topic.
+            output_format (str): The desired output format.
+            
+        Returns:
+            str: The topic, truncated if it was over budget.
+            
+        Raises:
+            InputTooLarge: If the topic is over budget and oversized topics are rejected.
+        """
+        if self.shaper is None:
+            return topic
+        return self.shaper.shape_topic(topic, output_format)
+    
+    def _chat_request(
+        self,
+        topic: str,
+        output_format: str,
+        definition: AgentProfile
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """
+        Build the messages and output limit of a research chat.
+        
+        Args:
+            topic (str): The research topic.
+            output_format (str): The desired output format.
+            definition (AgentProfile): Agent profile answering the request.
+            
+        Returns:
+            Tuple[List[Dict[str, str]], Dict[str, Any]]: The messages, and the chat
+                options limiting the completion length of the format.
+        """
+        prompt = self._research_prompt(topic, output_format)
+        record_tokens(output_format, "prompt", prompt)
+        return [{"role": "user", "content": prompt}], self._output_options(output_format, definition)
+    
+    def _research_prompt(self, topic: str, output_format: str) -> str:
+        """Build the research prompt, with the word limit of the format if shaping is enabled."""
+        if self.shaper is None:
+            return build_prompt(topic, output_format)
+        return build_prompt(topic, output_format, self.shaper.word_limit(output_format))
+    
+    def _output_options(self, output_format: str, definition: AgentProfile) -> Dict[str, Any]:
+        """Get the chat options limiting the completion length of a format."""
+        if self.shaper is None:
+            return {}
+        max_tokens = self.shaper.max_output_tokens(output_format, definition.max_tokens)
+        return {} if max_tokens is None else {"max_tokens": max_tokens}
+    
+    async def open_conversation(self, result: Dict[str, Any]) -> Optional[str]:
+        """
+        Register a research answer so that it can be followed up on.
+        
+        Only dedicated sessions stay with the conversation. A pooled session goes
+        back to the pool for other requests, and follow-ups lease one again.
+        
+        Args:
+            result (Dict[str, Any]): Research results returned by perform_research.
+            
+        Returns:
+            Optional[str]: The conversation handle, or None if follow-ups are disabled.
+        """
+        if self.conversations is None:
+            return None
+        session = result.get("session")
+        messages = [
+            {"role": "user", "content": self._research_prompt(result["topic"], result["format"])},
+            {"role": "assistant", "content": result["result"]},
+        ]
+        dedicated = session is not None and session["saved"]
+        conversation = await asyncio.to_thread(
+            self.conversations.open,
+            topic=result["topic"],
+            output_format=result["format"],
+            profile=session["profile"] if session else None,
+            session_id=session["id"] if dedicated else None,
+            # Dedicated sessions saved the research exchange in their own history
+            saved_messages=len(messages) if dedicated else 0,
+            messages=messages,
+        )
+        return conversation.handle
+    
+    async def follow_up(
+        self,
+        handle: str,
+        instruction: Optional[str] = None,
+        output_format: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Rework a previous answer with one chat on the session that produced it.
+        
+        The agent sees the earlier exchange, so reformatting or deepening an answer
+        does not repeat the research. Follow-ups are neither cached nor saved in the
+        session's history; the conversation keeps the history instead. Answers from
+        the cache or a pooled session are followed up on a newly leased session.
+        
+        Args:
+            handle (str): Conversation handle returned with the earlier answer.
+            instruction (Optional[str]): What to change or expand, if anything.
+            output_format (Optional[str]): Format to rewrite the answer in; the
+                format of the latest answer when not given.
+            
+        Returns:
+            Dict[str, Any]: Dictionary containing the reworked results and the handle
+                under 'conversation'.
+            
+        Raises:
+            ConversationNotFound: If the handle is unknown or has expired.
+            InputTooLarge: If the instruction is over budget and oversized input is rejected.
+            AgentSessionError: If there's an error creating a session.
+            ResearchResponseError: If there's an error getting a response.
+            UpstreamUnavailable: If upstream is shedding load or the deadline passes.
+        """
+        conversation = None
+        if self.conversations is not None:
+            conversation = await asyncio.to_thread(self.conversations.get, handle)
+        if conversation is None:
+            raise ConversationNotFound(f"Unknown or expired conversation: {handle}")
+        new_format = output_format or conversation.output_format
+        if instruction:
+            instruction = self.shape_topic(instruction, new_format)
+        prompt = build_follow_up_prompt(instruction, output_format)
+        definition = self.agent_manager.resolve_profile(normalize_format(new_format), conversation.profile)
+        messages = conversation.unsaved_messages + [{"role": "user", "content": prompt}]
+        record_tokens(new_format, "prompt", prompt)
+        logger.info("Following up on conversation %s in format: '%s'", handle, new_format)
+        
+        with deadline(get_settings().REQUEST_DEADLINE_SECONDS):
+            async with self._admitted(new_format):
+                session_id = conversation.session_id
+                lease = None
+                if session_id is None:
+                    lease = await self._lease_session(conversation.topic, new_format, definition)
+                    session_id = lease.id
+                failed = True
+                try:
+                    response = await self.agent_manager.achat(
+                        session_id, messages, profile=definition, save=False,
+                        **self._output_options(new_format, definition)
+                    )
+                    failed = False
+                except Exception as response_error:
+                    unavailable = _as_unavailable(response_error)
+                    if unavailable is not None:
+                        logger.warning("Follow-up response unavailable: %s", response_error)
+                        raise unavailable from response_error
+                    error_msg = f"Failed to get follow-up response: {str(response_error)}"
+                    logger.error(error_msg)
+                    raise ResearchResponseError(error_msg) from response_error
+                finally:
+                    if lease is not None:
+                        self.agent_manager.release_session(lease, failed=failed)
+        answer = response_content(response)
+        record_tokens(new_format, "completion", answer)
+        
+        if lease is None or not lease.pooled:
+            conversation.session_id = session_id
+        conversation.output_format = new_format
+        conversation.profile = definition.name
+        conversation.messages += [{"role": "user", "content": prompt}, {"role": "assistant", "content": answer}]
+        await asyncio.to_thread(self.conversations.save, conversation)
+        CONVERSATIONS.inc(event="followed_up")
+        return {"topic": conversation.topic, "format": new_format, "result": answer, "conversation": handle}
+    
+    def invalidate(self, topic: Optional[str] = None, output_format: str = "summary") -> int:
+        """
+        Remove cached research results.
+        
+        Args:
+            topic (Optional[str]): Topic to invalidate, or None to clear the whole cache.
+            output_format (str): Output format of the entry to invalidate.
+            
+        Returns:
+            int: The number of entries removed.
+        """
+        if self.cache is None:
+            return 0
+        if topic is None:
+            if self.semantic_cache is not None:
+                self.semantic_cache.clear()
+            return self.cache.clear()
+        key = make_cache_key(topic, output_format)
+        if self.semantic_cache is not None:
+            self.semantic_cache.remove(key)
+        return int(self.cache.delete(key))
+    
+    def close(self) -> None:
+        """Persist state that should survive a restart."""
+        if self.semantic_cache is not None:
+            self.semantic_cache.flush()
+    
+    def coalescing_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get per-key statistics about coalesced in-flight requests.
+        
+        Returns:
+            Dict[str, Dict[str, int]]: Waiter statistics keyed by cache key.
+        """
+        if self.coalescer is None:
+            return {}
+        return self.coalescer.snapshot()
+    
+    async def _research_and_store(
+        self,
+        key: str,
+        topic: str,
+        output_format: str,
+        profile: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Perform research upstream and store the result in the cache.
+        
+        Args:
+            key (str): Cache key of the request.
+            topic (str): The research topic.
+            output_format (str): The desired output format.
+            profile (Optional[str]): Requested agent profile, if any.
             
-            # Create a session for this research request
+        Returns:
+            Dict[str, Any]: Dictionary containing the research results.
+        """
+        async with self._admitted(output_format):
+            result = await self._research_upstream(topic, output_format, profile)
+        await self._store(key, topic, output_format, result)
+        return result
+    
+    async def _lookup_cached(
+        self,
+        key: str,
+        topic: str,
+        output_format: str
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Look up a cached result, by exact key and then by topic similarity.
+        
+        Args:
+            key (str): Cache key of the request.
+            topic (str): The research topic.
+            output_format (str): The desired output format.
+            
+        Returns:
+            Tuple[Optional[Dict[str, Any]], str]: The cached result, or None, and the
+                cache status to report.
+        """
+        if self.cache is None:
+            return None, CACHE_MISS
+        with timed("cache_lookup"):
+            cached = await self.cache.aget(key)
+        if cached is not None:
+            return cached, CACHE_HIT
+        if self.semantic_cache is None:
+            return None, CACHE_MISS
+        
+        with timed("semantic_lookup"):
+            match = self.semantic_cache.lookup(topic, output_format)
+            if match is None:
+                return None, CACHE_MISS
+            cached = await self.cache.aget(match)
+        if cached is None:
+            # The matched result has expired or been evicted
+            self.semantic_cache.remove(match)
+            return None, CACHE_MISS
+        return cached, CACHE_SEMANTIC_HIT
+    
+    async def _store(self, key: str, topic: str, output_format: str, result: Dict[str, Any]) -> None:
+        """
+        Cache a research result and index its topic for similarity matching.
+        
+        Args:
+            key (str): Cache key of the request.
+            topic (str): The research topic.
+            output_format (str): The desired output format.
+            result (Dict[str, Any]): The research results.
+        """
+        if self.cache is None:
+            return
+        # The session that answered is only meant for the requests that waited on it
+        await self.cache.aset(key, {name: value for name, value in result.items() if name != "session"})
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(key, topic, output_format)
+    
+    @asynccontextmanager
+    async def _admitted(self, output_format: str) -> AsyncIterator[None]:
+        """
+        Hold an upstream slot from the admission controller, if one is configured.
+        
+        The slot is scheduled fairly according to the client and priority class of
+        the current request.
+        
+        Args:
+            output_format (str): The desired output format.
+            
+        Raises:
+            AdmissionRejected: If the request is not admitted.
+        """
+        if self.admission is None:
+            yield
+            return
+        client = current_client()
+        with timed("admission_wait"):
+            await self.admission.acquire(
+                normalize_format(output_format),
+                client_id=client.client_id,
+                priority=client.priority
+            )
+        try:
+            yield
+        finally:
+            self.admission.release(normalize_format(output_format))
+    
+    async def perform_batch(
+        self,
+        items: List[Tuple[str, str, Optional[str]]],
+        concurrency: int
+    ) -> AsyncIterator[Tuple[int, Union[Dict[str, Any], Exception]]]:
+        """
+        Perform research for many items with bounded parallelism.
+        
+        Items with the same normalized topic and format are researched once and
+        the outcome is shared between them. Outcomes are yielded as they complete,
+        so callers must use the index to restore request order.
+        
+        Args:
+            items (List[Tuple[str, str, Optional[str]]]): (topic, output_format, profile)
+                triples to research, where the profile is an optional routing hint.
+            concurrency (int): Maximum number of distinct items researched at once.
+            
+        Yields:
+            Tuple[int, Union[Dict[str, Any], Exception]]: The index of an item and either
+                its research results or the exception it failed with.
+        """
+        indexes_by_key: Dict[str, List[int]] = {}
+        for index, (topic, output_format, _) in enumerate(items):
+            indexes_by_key.setdefault(make_cache_key(topic, output_format), []).append(index)
+        logger.info("Starting batch of %s item(s), %s distinct", len(items), len(indexes_by_key))
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run(indexes: List[int]) -> Tuple[List[int], Union[Dict[str, Any], Exception]]:
+            topic, output_format, profile = items[indexes[0]]
+            async with semaphore:
+                try:
+                    return indexes, await self.perform_research(topic, output_format, profile)
+                except Exception as e:
+                    return indexes, e
+        
+        tasks = [asyncio.ensure_future(run(indexes)) for indexes in indexes_by_key.values()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                indexes, outcome = await next_done
+                for index in indexes:
+                    if isinstance(outcome, Exception):
+                        yield index, outcome
+                    else:
+                        topic, output_format, _ = items[index]
+                        yield index, {**outcome, "topic": topic, "format": output_format}
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def stream_research(
+        self,
+        topic: str,
+        output_format: str,
+        profile: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Perform research on the given topic, yielding the response as it is generated.
+        
+        Cached results are replayed as a single token event. Streamed results are
+        stored in the cache once complete.
+        
+        Args:
+            topic (str): The research topic.
+            output_format (str): The desired output format.
+            profile (Optional[str]): Agent profile requested instead of the one
+                routed by format; unknown profiles are ignored.
+            
+        Yields:
+            Dict[str, Any]: Events of the form {"event": "token", "text": ...} for each
+                piece of the response, then one {"event": "result", "data": ...} event
+                whose data has the same fields as perform_research returns.
+            
+        Raises:
+            AgentSessionError: If there's an error creating a session.
+            ResearchResponseError: If there's an error streaming the response.
+            InputTooLarge: If the topic is over budget and oversized topics are rejected.
+        """
+        topic = self.shape_topic(topic, output_format)
+        key = make_cache_key(topic, output_format)
+        cached, cache_status = await self._lookup_cached(key, topic, output_format)
+        if cached is not None:
+            logger.info("Cache hit for streamed topic: '%s' in format: '%s'", topic, output_format)
+            yield {"event": "token", "text": cached["result"]}
+            yield {
+                "event": "result",
+                "data": {**cached, "topic": topic, "format": output_format, "cache_status": cache_status}
+            }
+            return
+        
+        logger.info("Starting streamed research on topic: '%s' in format: '%s'", topic, output_format)
+        definition = self.agent_manager.resolve_profile(normalize_format(output_format), profile)
+        async with self._admitted(output_format):
+            lease = await self._lease_session(topic, output_format, definition)
+            messages, options = self._chat_request(topic, output_format, definition)
+            pieces = []
+            failed = True
             try:
-                session = agent_manager.create_session(situation=situation)
-                logger.info(f"Created research session with ID: {session.id}")
-            except Exception as session_error:
-                error_msg = f"Failed to create research session: {str(session_error)}"
+                async for text in self.agent_manager.astream_chat(
+                    lease.id, messages, profile=definition, save=not lease.pooled, **options
+                ):
+                    pieces.append(text)
+                    yield {"event": "token", "text": text}
+                failed = False
+            except Exception as response_error:
+                unavailable = _as_unavailable(response_error)
+                if unavailable is not None:
+                    logger.warning("Research stream unavailable: %s", response_error)
+                    raise unavailable from response_error
+                error_msg = f"Failed to stream research response: {str(response_error)}"
                 logger.error(error_msg)
-                raise AgentSessionError(error_msg) from session_error
+                raise ResearchResponseError(error_msg) from response_error
+            finally:
+                self.agent_manager.release_session(lease, failed=failed)
+        
+        result = {"topic": topic, "format": output_format, "result": "".join(pieces)}
+        record_tokens(output_format, "completion", result["result"])
+        await self._store(key, topic, output_format, result)
+        logger.info("Streamed research completed successfully for topic: '%s'", topic)
+        session = {"id": lease.id, "profile": definition.name, "saved": not lease.pooled}
+        yield {"event": "result", "data": {**result, "session": session, "cache_status": CACHE_MISS}}
+    
+    async def _lease_session(
+        self,
+        topic: str,
+        output_format: str,
+        profile: Optional[AgentProfile] = None
+    ) -> SessionLease:
+        """
+        Lease a session for a research request.
+        
+        Args:
+            topic (str): The research topic.
+            output_format (str): The desired output format.
+            profile (Optional[AgentProfile]): Agent profile of the session; the
+                profile routed for the format when not given.
             
-            # Construct the user message
-            prompt = (
-                f"Please research the topic '{topic}' and provide the "
-                f"information in '{output_format}' format."
+        Returns:
+            SessionLease: The leased session.
+            
+        Raises:
+            AgentSessionError: If there's an error creating a session.
+        """
+        # Create a descriptive situation for dedicated sessions
+        situation = (
+            f"User wants to research about '{topic}' and receive "
+            f"results in '{output_format}' format."
+        )
+        try:
+            lease = await self.agent_manager.lease_session(
+                output_format=normalize_format(output_format),
+                situation=situation,
+                profile=profile
             )
+            logger.info("Leased research session with ID: %s", lease.id)
+            return lease
+        except Exception as session_error:
+            unavailable = _as_unavailable(session_error)
+            if unavailable is not None:
+                logger.warning("Could not lease research session: %s", session_error)
+                raise unavailable from session_error
+            error_msg = f"Failed to create research session: {str(session_error)}"
+            logger.error(error_msg)
+            raise AgentSessionError(error_msg) from session_error
+    
+    async def _research_upstream(
+        self,
+        topic: str,
+        output_format: str,
+        profile: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Perform research on the given topic with the Julep agent and format the results.
+        
+        The agent is chosen by routing the output format to an agent profile, or by
+        the requested profile when it names a known one.
+        
+        Args:
+            topic (str): The research topic.
+            output_format (str): The desired output format.
+            profile (Optional[str]): Requested agent profile, if any.
             
-            # Send the research request to the agent
+        Returns:
+            Dict[str, Any]: Dictionary containing the research results.
+            
+        Raises:
+            AgentSessionError: If there's an error creating a session.
+            ResearchResponseError: If there's an error getting a response.
+            ResearchError: For other research-related errors.
+        """
+        definition = self.agent_manager.resolve_profile(normalize_format(output_format), profile)
+        logger.info(
+            "Starting research on topic: '%s' in format: '%s' with profile '%s'",
+            topic, output_format, definition.name
+        )
+        
+        try:
+            with timed("session_lease"):
+                lease = await self._lease_session(topic, output_format, definition)
+            
+            # Send the research request to the agent, without saving history on shared sessions
             try:
-                messages = [{"role": "user", "content": prompt}]
-                response = agent_manager.chat(session.id, messages)
+                messages, options = self._chat_request(topic, output_format, definition)
+                response = await self.agent_manager.achat(
+                    lease.id, messages, profile=definition, save=not lease.pooled, **options
+                )
                 logger.info("Successfully received research response")
             except Exception as response_error:
+                self.agent_manager.release_session(lease, failed=True)
+                unavailable = _as_unavailable(response_error)
+                if unavailable is not None:
+                    logger.warning("Research response unavailable: %s", response_error)
+                    raise unavailable from response_error
                 error_msg = f"Failed to get research response: {str(response_error)}"
                 logger.error(error_msg)
                 raise ResearchResponseError(error_msg) from response_error
+            self.agent_manager.release_session(lease)
             
             # Validate response structure
-            if not hasattr(response, 'choices') or not response.choices:
-                error_msg = "Invalid response format: missing 'choices'"
-                logger.error(error_msg)
-                raise ResearchResponseError(error_msg)
+            with timed("validate"):
+                # Extract and return the research results, with the session that
+                # answered for follow-ups
+                result = {
+                    "topic": topic,
+                    "format": output_format,
+                    "result": response_content(response),
+                    "session": {"id": lease.id, "profile": definition.name, "saved": not lease.pooled}
+                }
+            record_tokens(output_format, "completion", result["result"] or "")
             
-            if not hasattr(response.choices[0], 'message') or not hasattr(response.choices[0].message, 'content'):
-                error_msg = "Invalid response format: missing 'message.content'"
-                logger.error(error_msg)
-                raise ResearchResponseError(error_msg)
-            
-            # Extract and return the research results
-            result = {
-                "topic": topic,
-                "format": output_format,
-                "result": response.choices[0].message.content
-            }
-            
-            logger.info(f"Research completed successfully for topic: '{topic}'")
+            logger.info("Research completed successfully for topic: '%s'", topic)
             return result
             
-        except (AgentSessionError, ResearchResponseError):
+        except ResearchError:
             # Re-raise specific exceptions that we've already logged
             raise
         except Exception as e:
@@ -115,5 +821,44 @@ class ResearchService:
             raise ResearchError(error_msg) from e
 
 
-# Create a singleton instance
-research_service = ResearchService()
\ No newline at end of file
+def create_research_service(settings: Settings) -> ResearchService:
+    """
+    Build the research service described by the application settings.
+    
+    Args:
+        settings (Settings): Application settings.
+        
+    Returns:
+        ResearchService: The research service, using the shared agent manager.
+    """
+    return ResearchService(
+        cache=create_result_cache(settings),
+        coalescer=SingleFlight() if settings.COALESCING_ENABLED else None,
+        admission=create_admission_controller(settings),
+        rate_limiter=create_rate_limiter(settings),
+        semantic_cache=create_semantic_cache(settings),
+        agent_manager=get_agent_manager(),
+        shaper=create_request_shaper(settings),
+        conversations=create_conversation_registry(settings),
+    )
+
+
+_research_service: Optional[ResearchService] = None
+_research_service_lock = threading.Lock()
+
+
+def get_research_service() -> ResearchService:
+    """
+    Get the shared research service, building it on first use.
+    
+    Returns:
+        ResearchService: The research service of this process.
+    """
+    global _research_service
+    service = _research_service
+    if service is None:
+        with _research_service_lock:
+            if _research_service is None:
+                _research_service = create_research_service(get_settings())
+            service = _research_service
+    return service
@@ -0,0 +1,194 @@
+"""
+Client identity, priority classes and per-client rate limits.
+
+This module records which client a request comes from and its priority class,
+for the admission controller to schedule upstream calls fairly, and contains the
+token buckets used to rate limit each client.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from app.core.config import Settings
+from app.core.logging import setup_logger
+
+# Set up logger for this module
+logger = setup_logger(__name__)
+
+
+# Client and priority class used when a request does not identify itself
+ANONYMOUS_CLIENT = "anonymous"
+DEFAULT_PRIORITY = "interactive"
+
+
+class ClientContext:
+    """
+    Identity and priority class of the client making the current request.
+    """
+
+    def __init__(self, client_id: str, priority: str):
+        """
+        Initialize the client context.
+
+        Args:
+            client_id (str): Stable identifier of the client.
+            priority (str): Name of the client's priority class.
+        """
+        self.client_id = client_id
+        self.priority = priority
+
+    def __repr__(self) -> str:
+        return f"ClientContext(client_id={self.client_id!r}, priority={self.priority!r})"
+
+
+_client_context: ContextVar[Optional[ClientContext]] = ContextVar("client_context", default=None)
+
+
+def set_client_context(client_id: str, priority: str) -> ClientContext:
+    """
+    Record the client of the current request.
+
+    Tasks started by the request inherit the client, including a coalesced
+    upstream call, which runs with the client of the request that started it.
+
+    Args:
+        client_id (str): Stable identifier of the client.
+        priority (str): Name of the client's priority class.
+
+    Returns:
+        ClientContext: The recorded context.
+    """
+    context = ClientContext(client_id, priority)
+    _client_context.set(context)
+    return context
+
+
+def current_client() -> ClientContext:
+    """
+    Get the client of the current request.
+
+    Returns:
+        ClientContext: The recorded client, or an anonymous interactive client
+            outside of a request.
+    """
+    context = _client_context.get()
+    if context is None:
+        return ClientContext(ANONYMOUS_CLIENT, DEFAULT_PRIORITY)
+    return context
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a fixed rate up to a burst size.
+    """
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            burst (float): Maximum number of tokens held.
+            clock (Callable[[], float]): Time source, replaceable in tests.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated = clock()
+
+    def try_take(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens if enough are available.
+
+        Args:
+            tokens (float): Number of tokens to take.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the seconds until they
+                will be available.
+        """
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update."""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class ClientRateLimiter:
+    """
+    Per-client token buckets, bounded to the most recently seen clients.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_clients: int = 10000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate (float): Requests per second allowed for each client.
+            burst (float): Requests a client may send at once after being idle.
+            max_clients (int): Maximum number of client buckets kept.
+            clock (Callable[[], float]): Time source, replaceable in tests.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._clock = clock
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, client_id: str) -> float:
+        """
+        Count a request against a client's rate limit.
+
+        Args:
+            client_id (str): Identifier of the client.
+
+        Returns:
+            float: 0 if the request is allowed, otherwise the seconds until the
+                client may send another request.
+        """
+        with self._lock:
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst, self._clock)
+                self._buckets[client_id] = bucket
+                self._evict()
+            else:
+                self._buckets.move_to_end(client_id)
+            return bucket.try_take()
+
+    def _evict(self) -> None:
+        """Forget the least recently seen clients beyond the bound; the caller holds the lock."""
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+
+
+def create_rate_limiter(settings: Settings) -> Optional[ClientRateLimiter]:
+    """
+    Build the per-client rate limiter described by the application settings.
+
+    Args:
+        settings (Settings): Application settings.
+
+    Returns:
+        Optional[ClientRateLimiter]: The rate limiter, or None if rate limiting is disabled.
+    """
+    if settings.RATE_LIMIT_PER_CLIENT is None:
+        return None
+    return ClientRateLimiter(rate=settings.RATE_LIMIT_PER_CLIENT, burst=settings.RATE_LIMIT_BURST)
@@ -0,0 +1,522 @@
+"""
+Semantic near-duplicate matching for cached research results.
+
+This module vectorizes topics with hashed word and character n-gram features and
+keeps a similarity index per output format, so that paraphrased topics can be
+served from the result cache. Vector similarity only proposes candidates: a match
+is accepted when every content word of each topic, numbers included, has a
+counterpart in the other. Each process keeps its own index in memory and can
+snapshot it to disk to survive restarts. It requires numpy, which is an optional
+dependency.
+"""
+
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+from app.core.config import Settings
+from app.core.logging import setup_logger
+from app.core.metrics import REGISTRY, Counter, Gauge
+from app.services.cache import FORMAT_ALIASES, normalize_format
+
+# Set up logger for this module
+logger = setup_logger(__name__)
+
+
+# Formats with a similarity index; other formats only use exact matching
+SEMANTIC_FORMATS = frozenset(FORMAT_ALIASES.values())
+
+# Words that carry no meaning for matching topics
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "about", "by", "for", "from", "how", "in", "is",
+    "of", "on", "or", "the", "to", "what", "with",
+})
+
+# Suffixes stripped from words before aligning terms, longest first
+SUFFIXES = ("ations", "ation", "ings", "ians", "ing", "ers", "ian", "ans", "ies", "er", "an", "es", "ed", "al", "s", "e")
+
+# Best-scoring entries checked for aligned terms on each lookup
+LOOKUP_CANDIDATES = 5
+
+# Weight of whole-word features relative to character trigrams
+WORD_WEIGHT = 2.0
+
+# Index writes between automatic saves of the index metadata
+FLUSH_EVERY = 64
+
+LOOKUPS = REGISTRY.register(Counter(
+    "semantic_cache_lookups_total",
+    "Semantic cache lookups by result",
+    labelnames=("result",),
+))
+HIT_RATIO = REGISTRY.register(Gauge(
+    "semantic_cache_hit_ratio",
+    "Fraction of semantic cache lookups that found a match",
+))
+HIT_RATIO.set_callback(lambda: {
+    (): LOOKUPS.value(result="hit") / max(1.0, LOOKUPS.value(result="hit") + LOOKUPS.value(result="miss"))
+})
+
+
+def topic_features(topic: str) -> Iterator[Tuple[str, float]]:
+    """
+    Extract the weighted features of a topic.
+
+    Features are the topic's words, the initials of runs of two or three words
+    (so that "artificial intelligence" also matches "AI"), and character trigrams
+    of each word, which tolerate inflections and small spelling differences.
+
+    Args:
+        topic (str): The research topic.
+
+    Yields:
+        Tuple[str, float]: Each feature and its weight.
+    """
+    words = [word for word in re.findall(r"[a-z0-9]+", topic.lower()) if word not in STOPWORDS]
+    for position, word in enumerate(words):
+        yield f"w:{word}", WORD_WEIGHT
+        for length in (2, 3):
+            run = words[position:position + length]
+            if len(run) == length:
+                yield "w:" + "".join(part[0] for part in run), WORD_WEIGHT / 2
+        padded = f" {word} "
+        for start in range(len(padded) - 2):
+            yield f"c:{padded[start:start + 3]}", 1.0
+
+
+def topic_terms(topic: str) -> List[str]:
+    """
+    Get the content words of a topic, crudely stemmed, in order.
+
+    Args:
+        topic (str): The research topic.
+
+    Returns:
+        List[str]: The stems of the words that are not stopwords.
+    """
+    terms = []
+    for word in re.findall(r"[a-z0-9]+", topic.lower()):
+        if word in STOPWORDS:
+            continue
+        for suffix in SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[:-len(suffix)]
+                break
+        terms.append(word)
+    return terms
+
+
+def _initials(terms: List[str]) -> str:
+    """Join the first letters of some terms."""
+    return "".join(term[0] for term in terms)
+
+
+def _is_acronym(term: str) -> bool:
+    """Whether a term could be an acronym, such as "ai" or "nasa"."""
+    return 2 <= len(term) <= 4 and term.isalpha()
+
+
+def _covered(terms: List[str], other: List[str]) -> bool:
+    """Whether every term has an exact or acronym counterpart among the other terms."""
+    covered = [term in other for term in terms]
+    acronyms = {term for term in other if _is_acronym(term)}
+    for start, term in enumerate(terms):
+        # The term abbreviates a run of the other terms
+        if _is_acronym(term) and any(
+            _initials(other[position:position + len(term)]) == term
+            for position in range(len(other) - len(term) + 1)
+        ):
+            covered[start] = True
+        # A run starting here is abbreviated among the other terms
+        for length in range(2, 5):
+            if start + length <= len(terms) and _initials(terms[start:start + length]) in acronyms:
+                covered[start:start + length] = [True] * length
+    return all(covered)
+
+
+def terms_match(first: str, second: str) -> bool:
+    """
+    Check that two topics are about the same things.
+
+    Every content word of each topic, numbers included, must appear in the other,
+    up to simple inflections such as "rome" and "roman", or as part of an acronym
+    such as "ai" for "artificial intelligence". This keeps near misses such as
+    "world war 1" and "world war 2", or "effects of smoking" and "smoking", apart
+    however similar their vectors are. Topics without content words never match.
+
+    Args:
+        first (str): A topic.
+        second (str): Another topic.
+
+    Returns:
+        bool: Whether the topics' terms align.
+    """
+    first_terms, second_terms = topic_terms(first), topic_terms(second)
+    if not first_terms or not second_terms:
+        return False
+    return _covered(first_terms, second_terms) and _covered(second_terms, first_terms)
+
+
+def vectorize(topic: str, dim: int) -> "np.ndarray":
+    """
+    Map a topic to a unit vector with the hashing trick.
+
+    Feature hashes use CRC32 rather than hash(), so vectors stay comparable across
+    processes and restarts.
+
+    Args:
+        topic (str): The research topic.
+        dim (int): Number of dimensions.
+
+    Returns:
+        np.ndarray: An L2-normalized float32 vector, all zeros for an empty topic.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature, weight in topic_features(topic):
+        digest = zlib.crc32(feature.encode("utf-8"))
+        vector[digest % dim] += weight if digest & 0x80000000 else -weight
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+class SemanticIndex:
+    """
+    Bounded cosine-similarity index of cache keys, evicting the least recently used.
+
+    Vectors are held in an in-memory float32 matrix with one row per slot. When a
+    path is given, the index is loaded from it on creation and snapshots of the
+    keys, vectors and recency are written to it atomically. Worker processes each
+    keep their own index, so they never write into each other's vectors; the last
+    snapshot written wins.
+    """
+
+    def __init__(self, dim: int, capacity: int, path: Optional[str] = None):
+        """
+        Initialize the index, loading it from disk when a path is given.
+
+        Args:
+            dim (int): Number of vector dimensions.
+            capacity (int): Maximum number of entries.
+            path (Optional[str]): Path of the .npz snapshot file, or None to keep
+                the index in memory only.
+        """
+        self.dim = dim
+        self.capacity = capacity
+        self.path = path
+        self._keys: List[Optional[str]] = [None] * capacity
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._clock = 0
+        self._high_water = 0
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self._vectors = self._open()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def lookup(
+        self,
+        vector: "np.ndarray",
+        threshold: float,
+        accept: Optional[Callable[[str], bool]] = None
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar entry that is accepted.
+
+        Args:
+            vector (np.ndarray): Unit query vector.
+            threshold (float): Minimum cosine similarity of a match.
+            accept (Optional[Callable[[str], bool]]): Check of a candidate key; the
+                best LOOKUP_CANDIDATES entries above the threshold are tried in order.
+
+        Returns:
+            Optional[Tuple[str, float]]: The matching key and its similarity, or None.
+        """
+        with self._lock:
+            if not self._slots:
+                return None
+            scores = self._vectors[:self._high_water] @ vector
+            count = min(LOOKUP_CANDIDATES, len(scores))
+            best = np.argpartition(-scores, count - 1)[:count]
+            for slot in best[np.argsort(-scores[best])]:
+                slot = int(slot)
+                score = float(scores[slot])
+                key = self._keys[slot]
+                if score < threshold:
+                    break
+                if key is None or (accept is not None and not accept(key)):
+                    continue
+                self._touch(slot)
+                return key, score
+            return None
+
+    def add(self, key: str, vector: "np.ndarray") -> None:
+        """
+        Add or replace an entry, evicting the least recently used one when full.
+
+        Args:
+            key (str): The cache key the vector stands for.
+            vector (np.ndarray): Unit vector of the entry's topic.
+        """
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._free_slot()
+                self._keys[slot] = key
+                self._slots[key] = slot
+                self._high_water = max(self._high_water, slot + 1)
+            self._vectors[slot] = vector
+            self._touch(slot)
+            self._unsaved += 1
+            if self._unsaved >= FLUSH_EVERY:
+                self._save()
+
+    def remove(self, key: str) -> bool:
+        """
+        Remove an entry.
+
+        Args:
+            key (str): The cache key to remove.
+
+        Returns:
+            bool: Whether the key was present.
+        """
+        with self._lock:
+            slot = self._slots.pop(key, None)
+            if slot is None:
+                return False
+            self._clear_slot(slot)
+            self._free.append(slot)
+            return True
+
+    def clear(self) -> int:
+        """
+        Remove every entry.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._lock:
+            count = len(self._slots)
+            for slot in self._slots.values():
+                self._clear_slot(slot)
+            self._slots.clear()
+            self._free.clear()
+            self._high_water = 0
+            return count
+
+    def flush(self) -> None:
+        """Write the index to disk, if it is persisted."""
+        with self._lock:
+            self._save()
+
+    def _free_slot(self) -> int:
+        """Get an unused slot, evicting the least recently used entry if none is left; holds the lock."""
+        if self._free:
+            return self._free.pop()
+        if self._high_water < self.capacity:
+            return self._high_water
+        slot = int(np.argmin(self._last_used))
+        del self._slots[self._keys[slot]]
+        self._keys[slot] = None
+        return slot
+
+    def _clear_slot(self, slot: int) -> None:
+        """Forget the entry in a slot; holds the lock."""
+        self._keys[slot] = None
+        self._vectors[slot] = 0.0
+        self._last_used[slot] = 0
+
+    def _touch(self, slot: int) -> None:
+        """Mark a slot as just used; holds the lock."""
+        self._clock += 1
+        self._last_used[slot] = self._clock
+
+    def _open(self) -> "np.ndarray":
+        """Create the vector matrix, loading the saved snapshot when one matches."""
+        vectors = np.zeros((self.capacity, self.dim), dtype=np.float32)
+        if self.path is None or not os.path.exists(self.path):
+            return vectors
+
+        try:
+            with np.load(self.path, allow_pickle=False) as snapshot:
+                keys = json.loads(str(snapshot["keys"]))
+                saved = snapshot["vectors"]
+                last_used = snapshot["last_used"]
+            if saved.shape != (len(keys), self.dim):
+                raise ValueError(f"snapshot shape {saved.shape} does not match {self.dim} dimensions")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring semantic index snapshot %s: %s", self.path, e)
+            return vectors
+
+        # Keep the most recently used entries if the capacity has shrunk
+        order = np.argsort(-last_used)[:self.capacity]
+        for slot, row in enumerate(sorted(order, key=lambda row: last_used[row])):
+            vectors[slot] = saved[row]
+            self._keys[slot] = keys[row]
+            self._slots[keys[row]] = slot
+            self._last_used[slot] = slot + 1
+        self._clock = self._high_water = len(self._slots)
+        logger.info("Loaded semantic index %s with %s entries", self.path, len(self._slots))
+        return vectors
+
+    def _save(self) -> None:
+        """Atomically write a snapshot of the index; holds the lock."""
+        self._unsaved = 0
+        if self.path is None:
+            return
+        keys = list(self._slots)
+        slots = [self._slots[key] for key in keys]
+        # Unique per process, so that workers saving at once do not share a file
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as snapshot:
+            np.savez(
+                snapshot,
+                keys=np.array(json.dumps(keys)),
+                vectors=self._vectors[slots],
+                last_used=self._last_used[slots],
+            )
+        os.replace(temp_path, self.path)
+
+
+class SemanticCache:
+    """
+    Finds cache keys of earlier research on similar topics, per output format.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        dim: int,
+        max_entries: int,
+        directory: Optional[str] = None
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            threshold (float): Minimum cosine similarity for topics to match.
+            dim (int): Number of vector dimensions.
+            max_entries (int): Maximum number of entries per output format.
+            directory (Optional[str]): Directory of the persisted indexes, or None
+                to keep them in memory.
+        """
+        self.threshold = threshold
+        self.dim = dim
+        self.max_entries = max_entries
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._indexes: Dict[str, SemanticIndex] = {}
+
+    def lookup(self, topic: str, output_format: str) -> Optional[str]:
+        """
+        Find the cache key of research on a similar topic in the same format.
+
+        Args:
+            topic (str): The research topic.
+            output_format (str): The requested output format.
+
+        Returns:
+            Optional[str]: The cache key of the best match above the threshold, or None.
+        """
+        index = self._index(normalize_format(output_format))
+        match = None
+        if index is not None:
+            match = index.lookup(
+                vectorize(topic, self.dim),
+                self.threshold,
+                # Keys end with the normalized topic they were stored under
+                accept=lambda key: terms_match(topic, key.split("::", 1)[-1])
+            )
+        if match is None:
+            LOOKUPS.inc(result="miss")
+            return None
+        LOOKUPS.inc(result="hit")
+        key, score = match
+        logger.info("Semantic cache match for topic '%s': %s (similarity %.2f)", topic, key, score)
+        return key
+
+    def add(self, key: str, topic: str, output_format: str) -> None:
+        """
+        Index a cached result under its topic.
+
+        Args:
+            key (str): Cache key of the result.
+            topic (str): The research topic.
+            output_format (str): The requested output format.
+        """
+        index = self._index(normalize_format(output_format))
+        if index is not None:
+            index.add(key, vectorize(topic, self.dim))
+
+    def remove(self, key: str) -> bool:
+        """
+        Remove a cache key from the index of its format.
+
+        Args:
+            key (str): Cache key, as built by make_cache_key.
+
+        Returns:
+            bool: Whether the key was indexed.
+        """
+        index = self._index(key.split("::", 1)[0])
+        return index is not None and index.remove(key)
+
+    def clear(self) -> None:
+        """Remove every entry from every format's index."""
+        for index in self._indexes.values():
+            index.clear()
+
+    def flush(self) -> None:
+        """Write every persisted index to disk."""
+        for index in self._indexes.values():
+            index.flush()
+
+    def _index(self, output_format: str) -> Optional[SemanticIndex]:
+        """Get the index of a normalized format, or None if the format has none."""
+        if output_format not in SEMANTIC_FORMATS:
+            return None
+        index = self._indexes.get(output_format)
+        if index is None:
+            path = None
+            if self.directory is not None:
+                path = os.path.join(self.directory, output_format.replace(" ", "_") + ".npz")
+            index = self._indexes[output_format] = SemanticIndex(self.dim, self.max_entries, path)
+        return index
+
+
+def create_semantic_cache(settings: Settings) -> Optional[SemanticCache]:
+    """
+    Build the semantic cache described by the application settings.
+
+    Args:
+        settings (Settings): Application settings.
+
+    Returns:
+        Optional[SemanticCache]: The semantic cache, or None if it is disabled,
+            the result cache is disabled, or numpy is not installed.
+    """
+    if not settings.SEMANTIC_CACHE_ENABLED or not settings.CACHE_ENABLED:
+        return None
+    if np is None:
+        logger.warning("SEMANTIC_CACHE_ENABLED is set but numpy is not installed; semantic cache disabled")
+        return None
+    return SemanticCache(
+        threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+        dim=settings.SEMANTIC_CACHE_DIM,
+        max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+        directory=settings.SEMANTIC_CACHE_DIR,
+    )
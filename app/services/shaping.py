@@ -0,0 +1,222 @@
+"""
+Request shaping by token budget.
+
+This module estimates token counts locally, without a model tokenizer, and
+keeps research requests within per-format budgets: oversized topics are
+truncated or rejected before they reach Julep, and each format gets a word
+limit in the prompt and a completion token limit upstream.
+"""
+
+import math
+import re
+from typing import Callable, Dict, Optional
+
+from app.core.config import Settings
+from app.core.logging import setup_logger
+from app.core.metrics import REGISTRY, Counter, Histogram
+from app.services.cache import format_label, normalize_format
+from app.services.errors import InputTooLarge
+
+# Set up logger for this module
+logger = setup_logger(__name__)
+
+
+# Oversized topic policies
+TRUNCATE = "truncate"
+REJECT = "reject"
+
+# Words and individual punctuation marks
+TOKEN_PIECE = re.compile(r"\w+|[^\w\s]")
+
+REQUEST_TOKENS = REGISTRY.register(Histogram(
+    "research_request_tokens",
+    "Estimated tokens per research request, by format and kind",
+    labelnames=("format", "kind"),
+    buckets=(16, 32, 64, 128, 256, 512, 1024, 2048, 4096),
+))
+SHAPED = REGISTRY.register(Counter(
+    "research_topics_shaped_total",
+    "Topics over their token budget, by format and action taken",
+    labelnames=("format", "action"),
+))
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text.
+
+    Uses the usual rules of thumb for BPE tokenizers on English text, about four
+    characters or three quarters of a word per token, and takes the larger of the
+    two, so long words, numbers and punctuation are not undercounted.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int: The estimated token count.
+    """
+    if not text:
+        return 0
+    return max(math.ceil(len(text) / 4), math.ceil(len(TOKEN_PIECE.findall(text)) * 4 / 3))
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """
+    Cut a text at a word boundary so that its estimated token count fits a budget.
+
+    Args:
+        text (str): The text.
+        budget (int): Maximum estimated tokens.
+
+    Returns:
+        str: The longest prefix of whole words within the budget, or, if not even
+            the first word fits, the longest prefix of characters within it.
+    """
+    ends = [match.end() for match in TOKEN_PIECE.finditer(text)]
+    kept = _longest_prefix(len(ends), lambda count: estimate_tokens(text[:ends[count - 1]]) <= budget)
+    if kept:
+        return text[:ends[kept - 1]]
+    return text[:_longest_prefix(len(text), lambda length: estimate_tokens(text[:length]) <= budget)]
+
+
+def _longest_prefix(size: int, fits: Callable[[int], bool]) -> int:
+    """Binary search for the largest count up to size that fits, as the estimate grows with the prefix."""
+    low, high = 0, size
+    while low < high:
+        middle = (low + high + 1) // 2
+        if fits(middle):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+class RequestShaper:
+    """
+    Per-format token budgets of research requests.
+    """
+
+    def __init__(
+        self,
+        input_budgets: Dict[str, int],
+        default_input_budget: int,
+        output_budgets: Optional[Dict[str, int]] = None,
+        word_limits: Optional[Dict[str, int]] = None,
+        oversized: str = TRUNCATE
+    ):
+        """
+        Initialize the shaper.
+
+        Args:
+            input_budgets (Dict[str, int]): Maximum estimated topic tokens per
+                normalized output format.
+            default_input_budget (int): Maximum estimated topic tokens of other formats.
+            output_budgets (Optional[Dict[str, int]]): Completion token limit per
+                normalized output format; formats not listed are only limited by
+                their agent profile.
+            word_limits (Optional[Dict[str, int]]): Answer length in words asked for
+                in the prompt, per normalized output format.
+            oversized (str): What to do with topics over budget, "truncate" or "reject".
+        """
+        self.input_budgets = input_budgets
+        self.default_input_budget = default_input_budget
+        self.output_budgets = output_budgets or {}
+        self.word_limits = word_limits or {}
+        self.oversized = oversized
+
+    def shape_topic(self, topic: str, output_format: str) -> str:
+        """
+        Keep a topic within the input budget of its format.
+
+        Args:
+            topic (str): The research topic.
+            output_format (str): The requested output format.
+
+        Returns:
+            str: The topic, truncated at a word boundary if it was over budget.
+
+        Raises:
+            InputTooLarge: If the topic is over budget and the policy is to reject it,
+                or if truncating it would leave nothing to research.
+        """
+        normalized = normalize_format(output_format)
+        budget = self.input_budgets.get(normalized, self.default_input_budget)
+        tokens = estimate_tokens(topic)
+        if tokens <= budget:
+            return topic
+        if self.oversized == REJECT:
+            SHAPED.inc(format=format_label(normalized), action="rejected")
+            raise InputTooLarge(
+                f"Topic is about {tokens} tokens long; the limit for '{normalized}' is {budget} tokens"
+            )
+        truncated = truncate_to_tokens(topic, budget).strip()
+        if not truncated:
+            SHAPED.inc(format=format_label(normalized), action="rejected")
+            raise InputTooLarge(
+                f"Topic is about {tokens} tokens long and cannot be cut to the "
+                f"{budget} token limit for '{normalized}'"
+            )
+        SHAPED.inc(format=format_label(normalized), action="truncated")
+        logger.warning("Truncating topic of about %s tokens to the %s token budget of '%s'", tokens, budget, normalized)
+        return truncated
+
+    def max_output_tokens(self, output_format: str, profile_limit: Optional[int] = None) -> Optional[int]:
+        """
+        Get the completion token limit of a request.
+
+        Args:
+            output_format (str): The requested output format.
+            profile_limit (Optional[int]): The limit of the agent profile, if any.
+
+        Returns:
+            Optional[int]: The smaller of the format's and the profile's limits, or
+                None if neither sets one.
+        """
+        limits = [limit for limit in (self.output_budgets.get(normalize_format(output_format)), profile_limit)
+                  if limit is not None]
+        return min(limits) if limits else None
+
+    def word_limit(self, output_format: str) -> Optional[int]:
+        """
+        Get the answer length in words asked for in the prompt.
+
+        Args:
+            output_format (str): The requested output format.
+
+        Returns:
+            Optional[int]: The word limit, or None for no limit.
+        """
+        return self.word_limits.get(normalize_format(output_format))
+
+
+def record_tokens(output_format: str, kind: str, text: str) -> None:
+    """
+    Record the estimated tokens of a prompt or completion.
+
+    Args:
+        output_format (str): The requested output format.
+        kind (str): "prompt" or "completion".
+        text (str): The prompt or completion text.
+    """
+    REQUEST_TOKENS.observe(estimate_tokens(text), format=format_label(output_format), kind=kind)
+
+
+def create_request_shaper(settings: Settings) -> Optional[RequestShaper]:
+    """
+    Build the request shaper described by the application settings.
+
+    Args:
+        settings (Settings): Application settings.
+
+    Returns:
+        Optional[RequestShaper]: The shaper, or None if request shaping is disabled.
+    """
+    if not settings.SHAPING_ENABLED:
+        return None
+    return RequestShaper(
+        input_budgets=settings.INPUT_TOKEN_BUDGETS,
+        default_input_budget=settings.DEFAULT_INPUT_TOKEN_BUDGET,
+        output_budgets=settings.OUTPUT_TOKEN_BUDGETS,
+        word_limits=settings.OUTPUT_WORD_LIMITS,
+        oversized=settings.OVERSIZED_TOPIC_POLICY,
+    )
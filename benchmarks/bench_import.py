@@ -0,0 +1,125 @@
+"""
+Import-time benchmark of the application entry points.
+
+Imports a module in a fresh interpreter with `python -X importtime`, reports the
+total import time and the slowest top-level packages, and fails when the import
+exceeds a time budget or loads a package that must stay lazy, such as the Julep
+SDK, which is only imported on the first upstream call.
+
+Usage:
+    python -m benchmarks.bench_import [--module M] [--repeat N] [--budget-ms MS] [--forbid PKG ...]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+# Packages that must not be loaded by importing the application
+DEFAULT_FORBIDDEN = ["julep", "openai"]
+
+# Line format of -X importtime: "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(output: str) -> Dict[str, int]:
+    """
+    Parse the report of `-X importtime`.
+
+    Args:
+        output (str): The standard error of the interpreter.
+
+    Returns:
+        Dict[str, int]: Cumulative import time in microseconds per module.
+    """
+    modules = {}
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2))
+    return modules
+
+
+def measure(module: str) -> Dict[str, int]:
+    """
+    Import a module in a fresh interpreter and collect its import times.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        Dict[str, int]: Cumulative import time in microseconds of every module loaded.
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    env.setdefault("JULEP_API_KEY", "benchmark")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr}")
+    return parse_importtime(completed.stderr)
+
+
+def run(module: str, repeat: int, forbidden: List[str]) -> dict:
+    """
+    Measure the import of a module and check it against the lazy packages.
+
+    The fastest of the repeated imports is reported, as slower ones mostly
+    measure a cold file system cache.
+
+    Args:
+        module (str): The module to import.
+        repeat (int): Number of fresh interpreters to measure.
+        forbidden (List[str]): Top-level packages the import must not load.
+
+    Returns:
+        dict: Total import time in milliseconds, the slowest top-level packages
+            and the forbidden packages that were loaded.
+    """
+    best = None
+    for _ in range(repeat):
+        modules = measure(module)
+        if best is None or modules[module] < best[module]:
+            best = modules
+    top_level = {name: us for name, us in best.items() if "." not in name and name != module}
+    return {
+        "total_ms": best[module] / 1000,
+        "slowest": sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:10],
+        "forbidden_loaded": sorted({name.split(".")[0] for name in best} & set(forbidden)),
+    }
+
+
+def main() -> None:
+    """Run the benchmark, print the results and exit non-zero if a check fails."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app.api.endpoints", help="Module to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters to measure")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail above this import time")
+    parser.add_argument("--forbid", nargs="*", default=DEFAULT_FORBIDDEN, help="Packages that must stay lazy")
+    args = parser.parse_args()
+
+    results = run(args.module, args.repeat, args.forbid)
+    print(f"import {args.module}: {results['total_ms']:10.1f} ms")
+    for name, us in results["slowest"]:
+        print(f"  {name:<30} {us / 1000:10.1f} ms")
+
+    failed = False
+    if results["forbidden_loaded"]:
+        print(f"FAIL: importing {args.module} loaded {', '.join(results['forbidden_loaded'])}")
+        failed = True
+    if args.budget_ms is not None and results["total_ms"] > args.budget_ms:
+        print(f"FAIL: import time is above the budget of {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
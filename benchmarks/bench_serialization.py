@@ -0,0 +1,108 @@
+"""
+Microbenchmark of serializing and compressing research responses.
+
+Compares the previous response path, where FastAPI validated the returned
+ResearchResponse again and encoded it with the standard json module, with the
+FastJSONResponse path, and reports the bytes sent on the wire uncompressed, with
+gzip and, when installed, with brotli, for report-sized results.
+
+Usage:
+    python -m benchmarks.bench_serialization [--iterations N] [--paragraphs N]
+"""
+
+import argparse
+import json
+import random
+import timeit
+from typing import Any, Dict
+
+from pydantic import TypeAdapter
+
+from app.api.models import ResearchResponse
+from app.api.responses import brotli, compress, dumps
+
+# Source of the words of the sample result
+PARAGRAPH = (
+    "Artificial intelligence ethics examines how automated systems affect people and "
+    "society. Key concerns include privacy, fairness and bias in training data, the "
+    "transparency of model decisions, accountability when systems cause harm, and the "
+    "concentration of power in the organizations that build them. Regulators have "
+    "proposed risk-based frameworks, while many companies publish principles that are "
+    "difficult to audit in practice. "
+)
+
+
+def sample_result(paragraphs: int) -> Dict[str, Any]:
+    """
+    Build a research result of the given number of paragraphs.
+
+    The words of PARAGRAPH are shuffled into each paragraph, so that the text does
+    not repeat verbatim and compresses roughly like prose rather than unrealistically well.
+    """
+    rng = random.Random(0)
+    words = PARAGRAPH.split()
+    text = "\n\n".join(" ".join(rng.sample(words, len(words))) for _ in range(paragraphs))
+    return {"topic": "artificial intelligence ethics", "format": "short report", "result": text}
+
+
+def run(iterations: int, paragraphs: int) -> dict:
+    """
+    Time both serialization paths and measure compressed sizes.
+
+    Args:
+        iterations (int): Number of responses to serialize for each variant.
+        paragraphs (int): Paragraphs in the sample result.
+
+    Returns:
+        dict: Mean microseconds per response for each variant, and body sizes in bytes.
+    """
+    result = sample_result(paragraphs)
+    adapter = TypeAdapter(ResearchResponse)
+
+    def previous() -> bytes:
+        # Build the model, validate it against the response model and encode with json
+        content = adapter.dump_python(adapter.validate_python(ResearchResponse(**result)), mode="json")
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+    def fast() -> bytes:
+        return dumps({"topic": result["topic"], "format": result["format"], "result": result["result"]})
+
+    body = fast()
+    assert json.loads(previous()) == json.loads(body)
+    results = {
+        "previous_us_per_response": timeit.timeit(previous, number=iterations) / iterations * 1e6,
+        "fast_us_per_response": timeit.timeit(fast, number=iterations) / iterations * 1e6,
+        "identity_bytes": len(body),
+        "gzip_bytes": len(compress(body, "gzip")),
+        "gzip_us_per_response": timeit.timeit(lambda: compress(body, "gzip"), number=iterations) / iterations * 1e6,
+    }
+    if brotli is not None:
+        results["br_bytes"] = len(compress(body, "br"))
+        results["br_us_per_response"] = (
+            timeit.timeit(lambda: compress(body, "br"), number=iterations) / iterations * 1e6
+        )
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--paragraphs", type=int, default=8, help="Paragraphs in the sample result")
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.paragraphs)
+    print(f"Previous path per response:  {results['previous_us_per_response']:10.2f} us")
+    print(f"Fast path per response:      {results['fast_us_per_response']:10.2f} us")
+    print(f"Identity body:               {results['identity_bytes']:10d} bytes")
+    print(f"gzip body:                   {results['gzip_bytes']:10d} bytes"
+          f" ({results['gzip_us_per_response']:.2f} us)")
+    if "br_bytes" in results:
+        print(f"brotli body:                 {results['br_bytes']:10d} bytes"
+              f" ({results['br_us_per_response']:.2f} us)")
+    else:
+        print("brotli body:                 not measured, brotli is not installed")
+
+
+if __name__ == "__main__":
+    main()
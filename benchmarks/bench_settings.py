@@ -0,0 +1,49 @@
+"""
+Microbenchmark of the per-request cost of resolving application settings.
+
+Compares building a new Settings instance, which re-reads the environment and the
+.env file and is what every request used to do, with the memoized get_settings().
+
+Usage:
+    python -m benchmarks.bench_settings [--iterations N]
+"""
+
+import argparse
+import timeit
+
+from app.core.config import Settings, get_settings
+
+
+def run(iterations: int) -> dict:
+    """
+    Time both ways of resolving settings.
+    
+    Args:
+        iterations (int): Number of calls to time for each variant.
+        
+    Returns:
+        dict: Mean microseconds per call for each variant.
+    """
+    get_settings()
+    uncached = timeit.timeit(Settings, number=iterations)
+    cached = timeit.timeit(get_settings, number=iterations)
+    return {
+        "uncached_us_per_call": uncached / iterations * 1e6,
+        "cached_us_per_call": cached / iterations * 1e6,
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    
+    results = run(args.iterations)
+    print(f"Settings() per call:      {results['uncached_us_per_call']:10.2f} us")
+    print(f"get_settings() per call:  {results['cached_us_per_call']:10.2f} us")
+    print(f"Speed-up:                 {results['uncached_us_per_call'] / results['cached_us_per_call']:10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
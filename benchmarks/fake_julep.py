@@ -0,0 +1,177 @@
+"""
+Fake Julep API server with injected latency and errors, for offline benchmarks.
+
+Serves the endpoints the research assistant calls (agents, tools, sessions and
+chat, streaming or not) with the response shapes the Julep SDK expects, like the
+MockJulep client used in the tests but over HTTP, so the whole client stack is
+exercised. Latency is drawn from a configurable distribution and a fraction of
+calls can be made to fail.
+
+Latency specs:
+    constant:SECONDS
+    uniform:LOW,HIGH
+    exponential:MEAN
+    lognormal:MEDIAN,SIGMA
+
+Usage:
+    python -m benchmarks.fake_julep [--port 8100] [--latency lognormal:0.8,0.5]
+        [--error-rate 0.01] [--token-interval 0.02]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+# Words the fake agent answers with, one streamed chunk per word
+FAKE_RESULT = (
+    "This is a fake research result produced by the benchmark server. "
+    "It has roughly the length of a short summary so that serialization, "
+    "caching and streaming costs resemble those of real responses."
+)
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """
+    Build a latency sampler from a distribution spec.
+
+    Args:
+        spec (str): Distribution name and parameters, e.g. "lognormal:0.8,0.5".
+
+    Returns:
+        Callable[[], float]: Returns a latency in seconds on each call.
+
+    Raises:
+        ValueError: If the distribution or its parameters are not recognised.
+    """
+    name, _, raw_params = spec.partition(":")
+    params = [float(value) for value in raw_params.split(",") if value]
+    if name == "constant" and len(params) == 1:
+        return lambda: params[0]
+    if name == "uniform" and len(params) == 2:
+        return lambda: random.uniform(params[0], params[1])
+    if name == "exponential" and len(params) == 1:
+        return lambda: random.expovariate(1.0 / params[0]) if params[0] > 0 else 0.0
+    if name == "lognormal" and len(params) == 2:
+        return lambda: random.lognormvariate(math.log(params[0]), params[1])
+    raise ValueError(f"Unknown latency spec: {spec}")
+
+
+def create_fake_julep_app(
+    latency: Callable[[], float] = lambda: 0.0,
+    error_rate: float = 0.0,
+    error_status: int = 503,
+    token_interval: float = 0.0
+) -> FastAPI:
+    """
+    Build the fake Julep API application.
+
+    Args:
+        latency (Callable[[], float]): Sampler for the delay before each response
+            (before the first chunk when streaming).
+        error_rate (float): Fraction of session and chat calls that fail.
+        error_status (int): HTTP status returned by failed calls.
+        token_interval (float): Delay between streamed chunks in seconds.
+
+    Returns:
+        FastAPI: The fake API.
+    """
+    app = FastAPI(title="Fake Julep API")
+    counters: Dict[str, int] = {}
+
+    async def simulate(operation: str) -> Any:
+        """Count the call, wait for the injected latency and maybe fail it."""
+        counters[operation] = counters.get(operation, 0) + 1
+        await asyncio.sleep(latency())
+        if random.random() < error_rate:
+            return JSONResponse(status_code=error_status, content={"detail": "Injected failure"})
+        return None
+
+    def now() -> str:
+        return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+    @app.get("/healthz")
+    async def healthz() -> Dict[str, Any]:
+        return {"status": "ok", "calls": counters}
+
+    @app.post("/agents")
+    async def create_agent(request: Request) -> Dict[str, Any]:
+        body = await request.json()
+        counters["agents.create"] = counters.get("agents.create", 0) + 1
+        return {"id": str(uuid.uuid4()), "name": body.get("name"), "created_at": now(), "updated_at": now()}
+
+    @app.post("/agents/{agent_id}/tools")
+    async def create_tool(agent_id: str) -> Dict[str, Any]:
+        return {"id": str(uuid.uuid4()), "created_at": now()}
+
+    @app.post("/sessions")
+    async def create_session() -> Any:
+        failure = await simulate("sessions.create")
+        if failure is not None:
+            return failure
+        return {"id": str(uuid.uuid4()), "created_at": now(), "updated_at": now()}
+
+    @app.post("/sessions/{session_id}/chat")
+    async def chat(session_id: str, request: Request) -> Any:
+        body = await request.json()
+        failure = await simulate("sessions.chat")
+        if failure is not None:
+            return failure
+
+        if not body.get("stream"):
+            return {
+                "id": str(uuid.uuid4()),
+                "created_at": now(),
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": FAKE_RESULT},
+                }],
+            }
+
+        async def events() -> AsyncIterator[str]:
+            words = FAKE_RESULT.split(" ")
+            for position, word in enumerate(words):
+                if position:
+                    await asyncio.sleep(token_interval)
+                piece = word if position == len(words) - 1 else word + " "
+                chunk = {"choices": [{"index": 0, "delta": {"role": "assistant", "content": piece}}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main() -> None:
+    """Run the fake Julep API server."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="constant:0.5", help="Latency distribution spec")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--token-interval", type=float, default=0.02)
+    args = parser.parse_args()
+
+    app = create_fake_julep_app(
+        latency=parse_latency(args.latency),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        token_interval=args.token_interval,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
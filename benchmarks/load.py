@@ -0,0 +1,316 @@
+"""
+Load test of the research API against the fake Julep server.
+
+Starts the fake Julep API and the application as subprocesses, drives /research
+(or /research/stream) at a target request rate with bounded concurrency, and
+reports throughput, latency percentiles, the server's event loop lag and its
+resident memory. Results are written as JSON so that runs on different commits
+can be compared with --compare.
+
+Requests are sent open-loop: each one is scheduled at a fixed time, and its
+latency is measured from that time, so a server that falls behind is charged
+for the queueing it causes instead of silently lowering the offered load.
+
+Usage:
+    python -m benchmarks.load [--rps 50] [--concurrency 64] [--duration 30]
+        [--latency lognormal:0.8,0.5] [--error-rate 0.01] [--stream]
+        [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+
+# Metrics compared by --compare, and whether a higher value is better
+COMPARED_METRICS = {
+    "throughput_rps": True,
+    "latency_ms.p50": False,
+    "latency_ms.p99": False,
+    "error_rate": False,
+    "event_loop_lag_ms.p99": False,
+    "rss_mb.peak": False,
+}
+
+
+def free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(ordered: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted values."""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def rss_mb(pid: int) -> float:
+    """
+    Resident memory of a process and its descendants, from /proc.
+
+    Args:
+        pid (int): ID of the root process.
+
+    Returns:
+        float: Total resident set size in MiB, or 0 where /proc is unavailable.
+    """
+    total_kb = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+            with open(f"/proc/{current}/task/{current}/children") as children:
+                pending.extend(int(child) for child in children.read().split())
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            continue
+    return total_kb / 1024
+
+
+def scrape_quantiles(metrics_text: str, name: str) -> Dict[str, float]:
+    """
+    Read the quantiles of a histogram from the /metrics exposition text.
+
+    Args:
+        metrics_text (str): Output of the /metrics endpoint.
+        name (str): Name of the histogram.
+
+    Returns:
+        Dict[str, float]: Quantile values keyed by quantile.
+    """
+    pattern = re.compile(rf'^{name}_quantile\{{quantile="([0-9.]+)"\}} ([0-9.eE+-]+)$', re.MULTILINE)
+    return {quantile: float(value) for quantile, value in pattern.findall(metrics_text)}
+
+
+def git_commit() -> Optional[str]:
+    """Get the current commit, if the benchmark runs inside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def wait_until_healthy(url: str, timeout: float = 30.0) -> None:
+    """
+    Poll a URL until it answers 200.
+
+    Raises:
+        RuntimeError: If the URL does not become healthy in time.
+    """
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} did not become healthy within {timeout}s")
+
+
+async def drive(
+    base_url: str,
+    rps: float,
+    concurrency: int,
+    duration: float,
+    distinct_topics: int,
+    stream: bool,
+    server_pid: int
+) -> Dict[str, Any]:
+    """
+    Send requests at the target rate and collect the results.
+
+    Args:
+        base_url (str): URL of the application.
+        rps (float): Requests started per second.
+        concurrency (int): Maximum requests in flight.
+        duration (float): Seconds to keep sending.
+        distinct_topics (int): Number of distinct topics cycled through.
+        stream (bool): Whether to use the streaming endpoint.
+        server_pid (int): Process ID of the application, for memory sampling.
+
+    Returns:
+        Dict[str, Any]: The benchmark results.
+    """
+    path = "/research/stream" if stream else "/research"
+    total = int(rps * duration)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    rss_samples: List[float] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async def sample_memory() -> None:
+        while True:
+            rss_samples.append(rss_mb(server_pid))
+            await asyncio.sleep(0.5)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120.0) as client:
+        async def one(index: int, scheduled: float) -> None:
+            await asyncio.sleep(max(0.0, scheduled - time.monotonic()))
+            payload = {"topic": f"benchmark topic {index % distinct_topics}", "format": "summary"}
+            async with semaphore:
+                try:
+                    response = await client.post(path, json=payload)
+                    await response.aread()
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+            latencies.append(time.monotonic() - scheduled)
+            statuses[status] = statuses.get(status, 0) + 1
+
+        memory_task = asyncio.ensure_future(sample_memory())
+        started = time.monotonic()
+        await asyncio.gather(*(one(index, started + index / rps) for index in range(total)))
+        elapsed = time.monotonic() - started
+        memory_task.cancel()
+        metrics_text = (await client.get("/metrics")).text
+
+    rss_samples.append(rss_mb(server_pid))
+    ordered = sorted(latencies)
+    lag = scrape_quantiles(metrics_text, "event_loop_lag_seconds")
+    succeeded = statuses.get("200", 0)
+    return {
+        "requests": total,
+        "status_counts": statuses,
+        "throughput_rps": succeeded / elapsed,
+        "error_rate": (total - succeeded) / total if total else 0.0,
+        "latency_ms": {
+            "mean": sum(ordered) / len(ordered) * 1000 if ordered else None,
+            **{
+                f"p{int(q * 100)}": percentile(ordered, q) * 1000 if ordered else None
+                for q in (0.5, 0.9, 0.95, 0.99)
+            },
+            "max": ordered[-1] * 1000 if ordered else None,
+        },
+        "event_loop_lag_ms": {f"p{int(float(q) * 100)}": value * 1000 for q, value in lag.items()},
+        "rss_mb": {"peak": max(rss_samples), "final": rss_samples[-1]},
+    }
+
+
+def lookup(results: Dict[str, Any], dotted: str) -> Optional[float]:
+    """Get a nested result by dotted path."""
+    value: Any = results
+    for part in dotted.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Describe how the key metrics changed from a baseline run.
+
+    Args:
+        current (Dict[str, Any]): Results of this run.
+        baseline (Dict[str, Any]): Results of the baseline run.
+
+    Returns:
+        List[str]: One line per metric, flagging regressions.
+    """
+    lines = []
+    for name, higher_is_better in COMPARED_METRICS.items():
+        new, old = lookup(current, name), lookup(baseline, name)
+        if new is None or old is None:
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        worse = change < 0 if higher_is_better else change > 0
+        flag = "  REGRESSION" if worse and abs(change) >= 10 else ""
+        lines.append(f"{name:24} {old:12.2f} -> {new:12.2f} ({change:+6.1f}%){flag}")
+    return lines
+
+
+def main() -> None:
+    """Run the load test and report the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rps", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--distinct-topics", type=int, default=1_000_000,
+                        help="Topics cycled through; lower values exercise the cache")
+    parser.add_argument("--stream", action="store_true", help="Drive /research/stream")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--latency", default="lognormal:0.8,0.5", help="Fake Julep latency spec")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--token-interval", type=float, default=0.02)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    args = parser.parse_args()
+
+    fake_port, app_port = free_port(), free_port()
+    fake = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.fake_julep",
+        "--port", str(fake_port),
+        "--latency", args.latency,
+        "--error-rate", str(args.error_rate),
+        "--token-interval", str(args.token_interval),
+    ])
+    env = {
+        **os.environ,
+        "HOST": "127.0.0.1",
+        "PORT": str(app_port),
+        "WORKERS": str(args.workers),
+        "JULEP_API_KEY": "benchmark",
+        "JULEP_BASE_URL": f"http://127.0.0.1:{fake_port}",
+        "JULEP_AGENT_ID": "benchmark-agent",
+        "LOG_LEVEL": "WARNING",
+    }
+    server = subprocess.Popen([sys.executable, "main.py"], env=env)
+    try:
+        asyncio.run(wait_until_healthy(f"http://127.0.0.1:{fake_port}/healthz"))
+        asyncio.run(wait_until_healthy(f"http://127.0.0.1:{app_port}/health"))
+        results = asyncio.run(drive(
+            f"http://127.0.0.1:{app_port}",
+            rps=args.rps,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            distinct_topics=args.distinct_topics,
+            stream=args.stream,
+            server_pid=server.pid,
+        ))
+    finally:
+        server.terminate()
+        fake.terminate()
+        server.wait()
+        fake.wait()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": vars(args),
+        **results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f"\nCompared with {args.compare} (commit {baseline.get('commit')}):")
+        for line in compare(report, baseline):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,25 +2,156 @@
 Julep Research Assistant API.
 
 This module serves as the entry point for the Julep Research Assistant application,
-initializing and starting the FastAPI server.
+initializing and starting the FastAPI server, or priming the result cache:
+
+    python main.py [serve]
+    python main.py prime topics.csv
+    python main.py prime --from-log app.log --top 100
 """
 
+import argparse
+import asyncio
+import os
+from typing import Dict, List, Optional
+
 import uvicorn
-from app.api.endpoints import app
 
+from app.core.agent import get_agent_manager
+from app.core.config import get_settings
+from app.core.logging import setup_logger
+
+# Set up logger for this module
+logger = setup_logger(__name__)
 
-def main() -> None:
+
+def bootstrap_shared_state() -> None:
     """
-    Main entry point for the application.
-    Starts the FastAPI server using uvicorn.
+    Bootstrap state shared by all worker processes before they start.
+    
+    The agent is resolved once in the parent process and its ID is exported as
+    JULEP_AGENT_ID, which every worker inherits, so workers skip their own bootstrap.
+    If bootstrapping fails here, each worker falls back to bootstrapping on startup.
+    """
+    try:
+        os.environ["JULEP_AGENT_ID"] = get_agent_manager().bootstrap()
+    except Exception as e:
+        logger.warning("Could not bootstrap agent before starting workers: %s", e)
+
+
+def serve() -> None:
+    """
+    Start the FastAPI server using uvicorn.
+    
+    Each worker builds its own application through the factory, so this process
+    never imports the application or the Julep SDK unless it bootstraps the agent.
     """
+    settings = get_settings()
+    workers = settings.WORKERS or os.cpu_count() or 1
+    
+    if workers > 1:
+        bootstrap_shared_state()
+    
+    logger.info("Starting server on %s:%s with %s worker(s)", settings.HOST, settings.PORT, workers)
     uvicorn.run(
-        "app.api.endpoints:app",
-        host="0.0.0.0",
-        port=8001,
+        "app.api.endpoints:create_application",
+        factory=True,
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=workers,
+        loop=settings.UVICORN_LOOP,
+        http=settings.UVICORN_HTTP,
+        timeout_keep_alive=settings.KEEPALIVE_TIMEOUT,
+        backlog=settings.BACKLOG,
         reload=False
     )
 
 
+async def prime(args: argparse.Namespace) -> Dict[str, int]:
+    """
+    Fill the result cache from a topic list file or the most requested logged topics.
+    
+    Args:
+        args (argparse.Namespace): Options of the prime command.
+        
+    Returns:
+        Dict[str, int]: Counts of skipped, primed, already cached and failed items.
+    """
+    # Imported here so that serving does not load the research service in this process
+    from app.services.priming import CachePrimer, read_items, top_logged_topics
+    from app.services.research import get_research_service
+    
+    settings = get_settings()
+    if settings.CACHE_ENABLED and settings.CACHE_SHARED_BACKEND is None:
+        logger.warning(
+            "CACHE_SHARED_BACKEND is not set, so primed results stay in this process; "
+            "set it to 'sqlite' to share them with the server, or use PRIME_FILE"
+        )
+    if args.from_log:
+        items = top_logged_topics(args.from_log, args.top)
+        source = f"log:{os.path.abspath(args.from_log)}"
+    else:
+        items = read_items(args.file)
+        source = os.path.abspath(args.file)
+    
+    agent_manager = get_agent_manager()
+    service = get_research_service()
+    primer = CachePrimer(
+        service=service,
+        rate=args.rate or settings.PRIME_RATE,
+        concurrency=args.concurrency or settings.PRIME_CONCURRENCY,
+        priority=settings.PRIME_PRIORITY_CLASS,
+        checkpoint_path=args.checkpoint or settings.PRIME_CHECKPOINT_FILE,
+        progress_interval=args.progress_interval,
+    )
+    try:
+        await agent_manager.abootstrap()
+        return await primer.prime(items, source=source, restart=args.restart)
+    finally:
+        service.close()
+        agent_manager.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line.
+    
+    Args:
+        argv (Optional[List[str]]): Arguments after the program name; sys.argv when None.
+        
+    Returns:
+        argparse.Namespace: The command and its options.
+    """
+    parser = argparse.ArgumentParser(description="Julep Research Assistant")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("serve", help="Run the API server (the default)")
+    
+    prime_parser = commands.add_parser("prime", help="Fill the result cache ahead of traffic")
+    source = prime_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("file", nargs="?", help="CSV or JSONL file of topic, format and profile")
+    source.add_argument("--from-log", metavar="LOG", help="Replay the most requested topics of an application log")
+    prime_parser.add_argument("--top", type=int, default=100, help="Topics to replay with --from-log")
+    prime_parser.add_argument("--rate", type=float, help="Items started per second; PRIME_RATE by default")
+    prime_parser.add_argument("--concurrency", type=int, help="Items researched at once; PRIME_CONCURRENCY by default")
+    prime_parser.add_argument("--checkpoint", help="Progress file; PRIME_CHECKPOINT_FILE by default")
+    prime_parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+    prime_parser.add_argument("--progress-interval", type=int, default=100, help="Items between progress reports")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Main entry point for the application.
+    
+    Args:
+        argv (Optional[List[str]]): Arguments after the program name; sys.argv when None.
+    """
+    args = parse_args(argv)
+    if args.command == "prime":
+        stats = asyncio.run(prime(args))
+        print(", ".join(f"{outcome}: {count}" for outcome, count in stats.items()))
+    else:
+        serve()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
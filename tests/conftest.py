@@ -2,11 +2,20 @@
 Pytest configuration for testing the Julep Research Assistant.
 """
 
+import json
+import os
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 
-from app.api.endpoints import app
+from app.api.endpoints import get_application
 from app.core.agent import JulepAgentManager
+from app.core.config import get_settings
+from app.services.research import get_research_service
+
+
+MOCK_RESULT = "Mock research result about the requested topic."
 
 
 # Mock Julep client responses
@@ -26,8 +35,14 @@ class MockJulep:
     class MockSessions:
         """Mock Sessions class."""
         
+        def __init__(self, latency=0.0):
+            """Initialize mock sessions with an optional injected latency."""
+            self.latency = latency
+            self.with_streaming_response = MockJulep.MockStreamingSessions(latency)
+        
         def create(self, **kwargs):
             """Mock create method."""
+            time.sleep(self.latency)
             class MockSession:
                 id = "mock-session-id"
             
@@ -35,10 +50,11 @@ class MockJulep:
         
         def chat(self, **kwargs):
             """Mock chat method."""
+            time.sleep(self.latency)
             class MockResponse:
                 class MockChoice:
                     class MockMessage:
-                        content = "Mock research result about the requested topic."
+                        content = MOCK_RESULT
                     
                     message = MockMessage()
                 
@@ -46,10 +62,68 @@ class MockJulep:
             
             return MockResponse()
     
-    def __init__(self, api_key):
+    class MockStreamingResponse:
+        """Mock raw streaming response relaying the result word by word as SSE lines."""
+        
+        def __init__(self, latency):
+            """Initialize the mock streaming response."""
+            self.latency = latency
+        
+        def __enter__(self):
+            return self
+        
+        def __exit__(self, *exc_info):
+            return False
+        
+        def iter_lines(self):
+            """Yield server-sent event lines, one chunk per word."""
+            words = MOCK_RESULT.split(" ")
+            pieces = [word + " " for word in words[:-1]] + [words[-1]]
+            for piece in pieces:
+                time.sleep(self.latency)
+                chunk = {"choices": [{"index": 0, "delta": {"role": "assistant", "content": piece}}]}
+                yield f"data: {json.dumps(chunk)}"
+                yield ""
+            yield "data: [DONE]"
+    
+    class MockStreamingSessions:
+        """Mock streaming variant of the Sessions class."""
+        
+        def __init__(self, latency=0.0):
+            """Initialize mock streaming sessions with an optional injected latency."""
+            self.latency = latency
+        
+        def chat(self, **kwargs):
+            """Mock streaming chat method."""
+            return MockJulep.MockStreamingResponse(self.latency)
+    
+    def __init__(self, api_key, latency=0.0):
         """Initialize mock Julep client."""
         self.agents = self.MockAgents()
-        self.sessions = self.MockSessions()
+        self.sessions = self.MockSessions(latency=latency)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def sqlite_paths(tmp_path_factory):
+    """
+    Fixture keeping the job queue and conversation handles in a temporary directory.
+    
+    Args:
+        tmp_path_factory: Pytest temporary directory factory.
+    """
+    directory = tmp_path_factory.mktemp("data")
+    paths = {
+        "JOBS_DB_PATH": str(directory / "research_jobs.sqlite3"),
+        "CONVERSATION_DB_PATH": str(directory / "research_conversations.sqlite3"),
+    }
+    settings = get_settings()
+    for name, path in paths.items():
+        # The environment covers settings reloaded during tests
+        os.environ[name] = path
+        setattr(settings, name, path)
+    yield
+    for name in paths:
+        os.environ.pop(name, None)
 
 
 @pytest.fixture
@@ -65,10 +139,13 @@ def mock_julep_agent_manager(monkeypatch):
     """
     # Create a mocked agent manager
     agent_manager = JulepAgentManager()
+    # Use a private copy so tests can change settings without affecting each other
+    agent_manager.settings = agent_manager.settings.model_copy()
     
     # Replace the Julep client with our mock
     agent_manager.julep = MockJulep(api_key="mock-api-key")
     agent_manager._agent_id = "mock-agent-id"
+    agent_manager._profile_agent_ids = {profile: "mock-agent-id" for profile in agent_manager.profiles}
     
     return agent_manager
 
@@ -81,4 +158,31 @@ def client():
     Returns:
         TestClient: A FastAPI TestClient.
     """
-    return TestClient(app)
\ No newline at end of file
+    return TestClient(get_application())
+
+
+@pytest.fixture
+def research_service():
+    """
+    Fixture providing the research service used by the application.
+    
+    Returns:
+        ResearchService: The shared research service.
+    """
+    return get_research_service()
+
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    """
+    Fixture configuring an admin key, in the current settings and for reloads.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture.
+        
+    Returns:
+        dict: Headers authorizing admin requests.
+    """
+    monkeypatch.setenv("ADMIN_API_KEY", "test-admin-key")
+    monkeypatch.setattr(get_settings(), "ADMIN_API_KEY", "test-admin-key")
+    return {"X-Admin-Key": "test-admin-key"}
@@ -0,0 +1,121 @@
+"""
+Tests for admission control of upstream research calls.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.admission import AdmissionController
+from app.services.errors import AdmissionRejected
+from app.services.research import ResearchService
+
+
+def test_concurrency_is_bounded():
+    """
+    Test that no more than the global limit of requests run at once.
+    """
+    controller = AdmissionController(max_concurrency=2, max_queue=10, max_queue_time=5)
+    running = []
+    peak = []
+    
+    async def work():
+        async with controller.admit("summary"):
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+    
+    async def run():
+        await asyncio.gather(*(work() for _ in range(6)))
+    
+    asyncio.run(run())
+    
+    assert max(peak) == 2
+    assert controller.active == 0
+    assert controller.queue_depth == 0
+
+
+def test_full_queue_rejects_with_429():
+    """
+    Test that requests beyond the queue bound are rejected immediately.
+    """
+    controller = AdmissionController(max_concurrency=1, max_queue=1, max_queue_time=5)
+    
+    async def run():
+        await controller.acquire("summary")
+        queued = asyncio.ensure_future(controller.acquire("summary"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("summary")
+        controller.release("summary")
+        await queued
+        controller.release("summary")
+        return rejected.value
+    
+    rejected = asyncio.run(run())
+    
+    assert rejected.status_code == 429
+    assert rejected.retry_after == 5
+
+
+def test_queue_timeout_rejects_with_503():
+    """
+    Test that a request waiting longer than the maximum queue time is rejected.
+    """
+    controller = AdmissionController(max_concurrency=1, max_queue=5, max_queue_time=0.01)
+    
+    async def run():
+        await controller.acquire("summary")
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("summary")
+        return rejected.value
+    
+    rejected = asyncio.run(run())
+    
+    assert rejected.status_code == 503
+    assert rejected.retry_after == 1
+    assert controller.queue_depth == 0
+
+
+def test_format_limits_do_not_block_other_formats():
+    """
+    Test that a saturated format does not hold back requests for other formats.
+    """
+    controller = AdmissionController(
+        max_concurrency=10,
+        max_queue=10,
+        max_queue_time=0.05,
+        format_limits={"short report": 1}
+    )
+    
+    async def run():
+        await controller.acquire("short report")
+        waiting_report = asyncio.ensure_future(controller.acquire("short report"))
+        await asyncio.sleep(0)
+        await controller.acquire("summary")
+        with pytest.raises(AdmissionRejected):
+            await waiting_report
+    
+    asyncio.run(run())
+
+
+def test_rejection_response_has_retry_after(client, research_service, monkeypatch):
+    """
+    Test that an admission rejection becomes a 429 response with Retry-After.
+    
+    Args:
+        client: TestClient fixture.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    async def rejected_research(topic, output_format, profile=None):
+        raise AdmissionRejected("queue full", status_code=429, retry_after=3)
+    
+    monkeypatch.setattr(research_service, "perform_research", rejected_research)
+    
+    response = client.post("/research", json={"topic": "overload"})
+    
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+    assert 'admission_queue_depth' in client.get("/metrics").text
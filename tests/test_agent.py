@@ -2,9 +2,14 @@
 Tests for the Julep agent manager.
 """
 
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
-from app.core.agent import JulepAgentManager
+from app.core.agent import PROFILE_COST, PROFILE_TOKENS, JulepAgentManager
 
 
 def test_agent_creation(mock_julep_agent_manager):
@@ -59,4 +64,204 @@ def test_chat(mock_julep_agent_manager):
     assert hasattr(response.choices[0], 'message')
     assert hasattr(response.choices[0].message, 'content')
     assert isinstance(response.choices[0].message.content, str)
-    assert response.choices[0].message.content == "Mock research result about the requested topic."
\ No newline at end of file
+    assert response.choices[0].message.content == "Mock research result about the requested topic."
+
+
+@pytest.fixture
+def counting_agent_manager(mock_julep_agent_manager, tmp_path):
+    """
+    Fixture providing an unbootstrapped agent manager that counts created agents.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+        tmp_path: Pytest temporary directory fixture.
+        
+    Returns:
+        JulepAgentManager: The agent manager, with a `created` list of agent IDs.
+    """
+    manager = mock_julep_agent_manager
+    manager._agent_id = None
+    manager.settings.JULEP_AGENT_ID = None
+    manager.settings.AGENT_STATE_FILE = str(tmp_path / "agent_state.json")
+    manager.reload_profiles()
+    manager.created = []
+    original_create = manager.julep.agents.create
+    
+    def slow_create(**kwargs):
+        time.sleep(0.05)
+        agent = original_create(**kwargs)
+        manager.created.append(agent.id)
+        return agent
+    
+    manager.julep.agents.create = slow_create
+    return manager
+
+
+def test_concurrent_bootstrap_creates_one_agent(counting_agent_manager):
+    """
+    Test that concurrent first accesses to the agent ID create a single agent.
+    
+    Args:
+        counting_agent_manager: The counting agent manager.
+    """
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        agent_ids = list(executor.map(lambda _: counting_agent_manager.agent_id, range(8)))
+    
+    assert agent_ids == ["mock-agent-id"] * 8
+    assert len(counting_agent_manager.created) == 1
+
+
+def test_bootstrap_reuses_persisted_agent(counting_agent_manager):
+    """
+    Test that a restarted manager reuses the persisted agent for the same definition.
+    
+    Args:
+        counting_agent_manager: The counting agent manager.
+    """
+    counting_agent_manager.bootstrap()
+    
+    # Simulate a process restart
+    counting_agent_manager._agent_id = None
+    assert counting_agent_manager.bootstrap() == "mock-agent-id"
+    assert len(counting_agent_manager.created) == 1
+    
+    # A definition change requires a new agent
+    counting_agent_manager.settings.JULEP_MODEL = "gpt-4o-mini"
+    counting_agent_manager.reload_profiles()
+    assert not counting_agent_manager.bootstrapped
+    counting_agent_manager.bootstrap()
+    assert len(counting_agent_manager.created) == 2
+    
+    with open(counting_agent_manager.settings.AGENT_STATE_FILE) as state_file:
+        assert len(json.load(state_file)["agents"]) == 2
+
+
+def test_bootstrap_uses_configured_agent_id(counting_agent_manager):
+    """
+    Test that a configured agent ID skips agent creation entirely.
+    
+    Args:
+        counting_agent_manager: The counting agent manager.
+    """
+    counting_agent_manager.settings.JULEP_AGENT_ID = "configured-agent-id"
+    counting_agent_manager.reload_profiles()
+    
+    assert counting_agent_manager.agent_id == "configured-agent-id"
+    assert counting_agent_manager.created == []
+
+
+def test_formats_route_to_profiles(mock_julep_agent_manager):
+    """
+    Test that formats are routed to profiles and that a known hint overrides the route.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+    """
+    manager = mock_julep_agent_manager
+    
+    assert manager.resolve_profile("summary").name == "brief"
+    assert manager.resolve_profile("short report").name == "research"
+    assert manager.resolve_profile("haiku").name == "research"
+    assert manager.resolve_profile("summary", hint="research").name == "research"
+    assert manager.resolve_profile("summary", hint="unknown").name == "brief"
+    assert manager.resolve_profile("summary").model == manager.settings.JULEP_FAST_MODEL
+
+
+def test_configured_profiles_override_builtins(mock_julep_agent_manager):
+    """
+    Test that AGENT_PROFILES changes built-in profiles and adds new ones.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+    """
+    manager = mock_julep_agent_manager
+    manager.settings.AGENT_PROFILES = {"brief": {"max_tokens": 200}, "deep": {"model": "o1", "max_tokens": 2000}}
+    manager.settings.AGENT_ROUTES = {"short report": "deep"}
+    manager.reload_profiles()
+    
+    assert manager.profiles["brief"].max_tokens == 200
+    assert manager.profiles["brief"].model == manager.settings.JULEP_FAST_MODEL
+    assert manager.resolve_profile("short report").model == "o1"
+    assert manager.resolve_profile("summary").name == "research"
+
+
+def test_profiles_are_built_once_until_reloaded(mock_julep_agent_manager):
+    """
+    Test that profiles are cached, and that a reload only forgets agents whose definition changed.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+    """
+    manager = mock_julep_agent_manager
+    profiles = manager.profiles
+    assert manager.profiles is profiles
+    assert manager.resolve_profile("summary") is profiles["brief"]
+    
+    settings = manager.settings.model_copy(update={"JULEP_FAST_MODEL": "gpt-4.1-nano"})
+    manager.reload_profiles(settings)
+    
+    assert manager.profiles is not profiles
+    assert manager.profiles["brief"].model == "gpt-4.1-nano"
+    assert "brief" not in manager._profile_agent_ids
+    assert manager.bootstrapped
+
+
+def test_each_profile_bootstraps_its_own_agent(counting_agent_manager):
+    """
+    Test that a profile's agent is created once, with the profile's model, and persisted.
+    
+    Args:
+        counting_agent_manager: The counting agent manager.
+    """
+    models = []
+    create = counting_agent_manager.julep.agents.create
+    
+    def recording_create(**kwargs):
+        models.append(kwargs["model"])
+        return create(**kwargs)
+    
+    counting_agent_manager.julep.agents.create = recording_create
+    counting_agent_manager._profile_agent_ids = {}
+    
+    counting_agent_manager.bootstrap()
+    counting_agent_manager.profile_agent_id("brief")
+    counting_agent_manager.profile_agent_id("brief")
+    
+    settings = counting_agent_manager.settings
+    assert models == [settings.JULEP_MODEL, settings.JULEP_FAST_MODEL]
+    with open(settings.AGENT_STATE_FILE) as state_file:
+        assert len(json.load(state_file)["agents"]) == 2
+
+
+def test_profile_chat_records_tokens_and_cost(mock_julep_agent_manager, monkeypatch):
+    """
+    Test that a profiled chat applies the token limit and counts usage and cost.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    manager = mock_julep_agent_manager
+    profile = manager.profiles["brief"]
+    options = {}
+    
+    class Usage:
+        prompt_tokens = 1000
+        completion_tokens = 500
+    
+    class Response:
+        usage = Usage()
+    
+    def chat(session_id, messages, **chat_options):
+        options.update(chat_options)
+        return Response()
+    
+    monkeypatch.setattr(manager, "chat", chat)
+    tokens_before = PROFILE_TOKENS.value(profile="brief", kind="completion")
+    cost_before = PROFILE_COST.value(profile="brief")
+    
+    asyncio.run(manager.achat("session", [], profile=profile))
+    
+    assert options["max_tokens"] == profile.max_tokens
+    assert PROFILE_TOKENS.value(profile="brief", kind="completion") - tokens_before == 500
+    assert PROFILE_COST.value(profile="brief") - cost_before == pytest.approx(profile.cost(1000, 500))
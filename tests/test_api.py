@@ -2,11 +2,19 @@
 Tests for the API endpoints.
 """
 
+import asyncio
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 
 from app.api.endpoints import app
-from app.services.research import research_service
+from app.core.agent import get_agent_manager
+from app.core.config import get_settings
+from app.services.admission import AdmissionController
+from app.services.cache import MemoryResultCache, make_cache_key
+from app.services.jobs import get_job_runner
+from app.services.research import ResearchError
 
 
 def test_health_check(client):
@@ -21,16 +29,134 @@ def test_health_check(client):
     assert response.json() == {"status": "healthy"}
 
 
-def test_research_endpoint(client, monkeypatch):
+@pytest.fixture
+def probed_client(client, mock_julep_agent_manager, research_service, monkeypatch):
+    """
+    Fixture serving the readiness probe with a mocked agent manager and no job runner.
+    
+    Args:
+        client: TestClient fixture.
+        mock_julep_agent_manager: The mocked agent manager.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    
+    Returns:
+        TestClient: The test client.
+    """
+    overrides = client.app.dependency_overrides
+    monkeypatch.setitem(overrides, get_agent_manager, lambda: mock_julep_agent_manager)
+    monkeypatch.setitem(overrides, get_job_runner, lambda: None)
+    monkeypatch.setattr(research_service, "admission", AdmissionController(
+        max_concurrency=1, max_queue=10, max_queue_time=1.0
+    ))
+    return client
+
+
+def test_liveness_probe(client):
+    """
+    Test that the liveness probe answers while the process serves requests.
+    
+    Args:
+        client: TestClient fixture.
+    """
+    response = client.get("/livez")
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+def test_readiness_waits_for_warm_up(probed_client, mock_julep_agent_manager):
+    """
+    Test that the replica only becomes ready once the warm-up has finished.
+    
+    Args:
+        probed_client: Test client with a mocked agent manager.
+        mock_julep_agent_manager: The mocked agent manager.
+    """
+    response = probed_client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["checks"] == {"agent": True, "warm_up": False, "upstream": True, "admission": True}
+    
+    asyncio.run(mock_julep_agent_manager.warm_up())
+    
+    response = probed_client.get("/readyz")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_readiness_reports_bootstrap_failure(probed_client, mock_julep_agent_manager, monkeypatch):
+    """
+    Test that a replica whose agent bootstrap keeps failing stays up, not ready, with the error.
+    
+    Args:
+        probed_client: Test client with a mocked agent manager.
+        mock_julep_agent_manager: The mocked agent manager.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    attempts = []
+    
+    async def flaky_bootstrap():
+        attempts.append(mock_julep_agent_manager.bootstrap_error)
+        if len(attempts) == 1:
+            raise ConnectionError("Julep is unreachable")
+        mock_julep_agent_manager._agent_id = "mock-agent-id"
+        response = probed_client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json()["checks"]["agent"] is True
+        assert response.json()["errors"] == {"agent": "Julep is unreachable"}
+        return "mock-agent-id"
+    
+    monkeypatch.setattr("app.core.agent.BOOTSTRAP_RETRY_INITIAL", 0.0)
+    monkeypatch.setattr(mock_julep_agent_manager, "abootstrap", flaky_bootstrap)
+    mock_julep_agent_manager._agent_id = None
+    
+    response = probed_client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["checks"]["agent"] is False
+    
+    asyncio.run(mock_julep_agent_manager.start_up())
+    
+    assert attempts == [None, "Julep is unreachable"]
+    response = probed_client.get("/readyz")
+    assert response.status_code == 200
+    assert "errors" not in response.json()
+
+
+def test_readiness_reflects_breaker_and_saturation(probed_client, mock_julep_agent_manager, research_service):
+    """
+    Test that an open circuit breaker or a nearly full admission queue fails readiness.
+    
+    Args:
+        probed_client: Test client with a mocked agent manager.
+        mock_julep_agent_manager: The mocked agent manager.
+        research_service: Research service fixture.
+    """
+    mock_julep_agent_manager.warmed_up = True
+    for _ in range(mock_julep_agent_manager.breaker.failure_threshold):
+        mock_julep_agent_manager.breaker.record_failure()
+    
+    response = probed_client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["checks"]["upstream"] is False
+    
+    mock_julep_agent_manager.breaker.record_success()
+    research_service.admission._depth = {"interactive": 9}
+    
+    response = probed_client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["checks"] == {"agent": True, "warm_up": True, "upstream": True, "admission": False}
+
+
+def test_research_endpoint(client, research_service, monkeypatch):
     """
     Test the research endpoint.
     
     Args:
         client: TestClient fixture.
+        research_service: Research service fixture.
         monkeypatch: Pytest monkeypatch fixture.
     """
     # Mock the perform_research method
-    async def mock_perform_research(topic, output_format):
+    async def mock_perform_research(topic, output_format, profile=None):
         return {
             "topic": topic,
             "format": output_format,
@@ -54,16 +180,17 @@ def test_research_endpoint(client, monkeypatch):
     assert "Mock research result" in response.json()["result"]
 
 
-def test_research_endpoint_default_format(client, monkeypatch):
+def test_research_endpoint_default_format(client, research_service, monkeypatch):
     """
     Test the research endpoint with default format.
     
     Args:
         client: TestClient fixture.
+        research_service: Research service fixture.
         monkeypatch: Pytest monkeypatch fixture.
     """
     # Mock the perform_research method
-    async def mock_perform_research(topic, output_format):
+    async def mock_perform_research(topic, output_format, profile=None):
         return {
             "topic": topic,
             "format": output_format,
@@ -84,16 +211,17 @@ def test_research_endpoint_default_format(client, monkeypatch):
     assert "Mock research result" in response.json()["result"]
 
 
-def test_research_endpoint_error_handling(client, monkeypatch):
+def test_research_endpoint_error_handling(client, research_service, monkeypatch):
     """
     Test error handling in the research endpoint.
     
     Args:
         client: TestClient fixture.
+        research_service: Research service fixture.
         monkeypatch: Pytest monkeypatch fixture.
     """
     # Mock the perform_research method to raise an exception
-    async def mock_perform_research_error(topic, output_format):
+    async def mock_perform_research_error(topic, output_format, profile=None):
         raise Exception("Test error message")
     
     monkeypatch.setattr(research_service, "perform_research", mock_perform_research_error)
@@ -106,4 +234,157 @@ def test_research_endpoint_error_handling(client, monkeypatch):
     
     assert response.status_code == 500
     assert "detail" in response.json()
-    assert "Test error message" in response.json()["detail"]
\ No newline at end of file
+    assert "Test error message" in response.json()["detail"]
+
+
+def test_research_endpoint_cache_header(client, research_service, monkeypatch):
+    """
+    Test that the research endpoint reports the cache status in a header.
+    
+    Args:
+        client: TestClient fixture.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    async def mock_perform_research(topic, output_format, profile=None):
+        return {
+            "topic": topic,
+            "format": output_format,
+            "result": "Cached research result.",
+            "cache_status": "HIT"
+        }
+    
+    monkeypatch.setattr(research_service, "perform_research", mock_perform_research)
+    
+    response = client.post("/research", json={"topic": "artificial intelligence"})
+    
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "HIT"
+    assert "cache_status" not in response.json()
+
+
+def test_admin_cache_invalidation(client, research_service, admin_headers, monkeypatch):
+    """
+    Test the admin endpoint for cache invalidation.
+    
+    Args:
+        client: TestClient fixture.
+        research_service: Research service fixture.
+        admin_headers: Headers carrying the configured admin key.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    cache = MemoryResultCache(max_bytes=1024, ttl_seconds=60)
+    cache.set(make_cache_key("climate change", "summary"), {"result": "a"})
+    cache.set(make_cache_key("climate change", "bullet points"), {"result": "b"})
+    monkeypatch.setattr(research_service, "cache", cache)
+    
+    response = client.delete(
+        "/admin/cache", params={"topic": "Climate Change", "format": "bullets"}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json() == {"invalidated": 1}
+    
+    response = client.delete("/admin/cache", headers=admin_headers)
+    assert response.json() == {"invalidated": 1}
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("method, path", [
+    ("DELETE", "/admin/cache"),
+    ("GET", "/admin/coalescing"),
+    ("POST", "/admin/settings/reload"),
+])
+def test_admin_routes_fail_closed(client, monkeypatch, method, path):
+    """
+    Test that admin routes are refused without a configured key, or with the wrong one.
+    
+    Args:
+        client: TestClient fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+        method (str): HTTP method of the route.
+        path (str): Path of the route.
+    """
+    monkeypatch.setattr(get_settings(), "ADMIN_API_KEY", None)
+    response = client.request(method, path, headers={"X-Admin-Key": "guess"})
+    assert response.status_code == 403
+    
+    monkeypatch.setattr(get_settings(), "ADMIN_API_KEY", "test-admin-key")
+    assert client.request(method, path).status_code == 403
+    assert client.request(method, path, headers={"X-Admin-Key": "guess"}).status_code == 403
+
+
+def test_research_batch_endpoint(client, research_service, monkeypatch):
+    """
+    Test that the batch endpoint researches identical items once and keeps request order.
+    
+    Args:
+        client: TestClient fixture.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    calls = []
+    
+    async def mock_perform_research(topic, output_format, profile=None):
+        calls.append((topic, output_format))
+        if topic == "broken":
+            raise ResearchError("Test error message")
+        return {"topic": topic, "format": output_format, "result": f"Result about {topic}."}
+    
+    monkeypatch.setattr(research_service, "perform_research", mock_perform_research)
+    
+    response = client.post("/research/batch", json={"items": [
+        {"topic": "Climate Change"},
+        {"topic": "broken", "format": "bullet points"},
+        {"topic": "climate change", "format": "summary"},
+    ]})
+    
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["index"] for item in results] == [0, 1, 2]
+    assert results[0]["result"] == "Result about Climate Change."
+    assert results[1]["error"] == "Test error message"
+    assert results[1]["result"] is None
+    assert results[2]["topic"] == "climate change"
+    assert len(calls) == 2
+
+
+def test_research_batch_endpoint_streams_ndjson(client, research_service, monkeypatch):
+    """
+    Test that the batch endpoint streams one NDJSON line per item when asked.
+    
+    Args:
+        client: TestClient fixture.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    async def mock_perform_research(topic, output_format, profile=None):
+        return {"topic": topic, "format": output_format, "result": f"Result about {topic}."}
+    
+    monkeypatch.setattr(research_service, "perform_research", mock_perform_research)
+    
+    response = client.post(
+        "/research/batch",
+        json={"items": [{"topic": "a"}, {"topic": "b"}, {"topic": "c"}]},
+        headers={"Accept": "application/x-ndjson"}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1, 2]
+    assert all(line["result"].startswith("Result about") for line in lines)
+
+
+def test_research_batch_endpoint_rejects_oversized_batches(client, monkeypatch):
+    """
+    Test that batches above the configured limit are rejected.
+    
+    Args:
+        client: TestClient fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(get_settings(), "BATCH_MAX_ITEMS", 2)
+    
+    response = client.post("/research/batch", json={"items": [{"topic": "a"}] * 3})
+    
+    assert response.status_code == 422
@@ -0,0 +1,201 @@
+"""
+Tests for the research result cache.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services.cache import (
+    MemoryResultCache,
+    SQLiteResultCache,
+    TieredResultCache,
+    make_cache_key,
+)
+from app.services.research import ResearchService
+
+
+class FakeClock:
+    """Manually advanced clock for TTL tests."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def test_cache_key_normalization():
+    """
+    Test that equivalent topics and format aliases share a cache key.
+    """
+    assert make_cache_key("  Artificial   Intelligence Ethics ", "Bullet-Points") == \
+        make_cache_key("artificial intelligence ethics", "bullets")
+    assert make_cache_key("AI", "report") == make_cache_key("ai", "short report")
+    assert make_cache_key("AI", "summary") != make_cache_key("AI", "bullet points")
+
+
+def test_memory_cache_ttl_expiry():
+    """
+    Test that entries expire once their TTL has passed.
+    """
+    clock = FakeClock()
+    cache = MemoryResultCache(max_bytes=1024, ttl_seconds=10, clock=clock)
+    cache.set("key", {"result": "value"})
+    
+    clock.now = 9
+    assert cache.get("key") == {"result": "value"}
+    
+    clock.now = 10
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_memory_cache_evicts_least_recently_used():
+    """
+    Test that the byte bound evicts the least recently used entries first.
+    """
+    entry_size = len('{"result": "xxxxxxxxxx"}')
+    cache = MemoryResultCache(max_bytes=entry_size * 2, ttl_seconds=60)
+    cache.set("a", {"result": "x" * 10})
+    cache.set("b", {"result": "x" * 10})
+    
+    # Touch "a" so that "b" becomes the eviction candidate
+    assert cache.get("a") is not None
+    cache.set("c", {"result": "x" * 10})
+    
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.size_bytes <= entry_size * 2
+
+
+def test_tiered_cache_reads_through_shared_backend(tmp_path):
+    """
+    Test that a fresh process-local tier is filled from the shared SQLite backend.
+    
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+    """
+    path = str(tmp_path / "cache.sqlite3")
+    writer = TieredResultCache(MemoryResultCache(1024, 60), SQLiteResultCache(path, 60))
+    writer.set("key", {"result": "shared"})
+    
+    reader = TieredResultCache(MemoryResultCache(1024, 60), SQLiteResultCache(path, 60))
+    assert reader.get("key") == {"result": "shared"}
+    assert reader.local.get("key") == {"result": "shared"}
+    
+    assert reader.delete("key")
+    assert writer.shared.get("key") is None
+
+
+def test_tiered_cache_keeps_the_shared_expiry(tmp_path):
+    """
+    Test that an entry copied from the shared tier expires locally when it expires there.
+    
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+    """
+    path = str(tmp_path / "cache.sqlite3")
+    SQLiteResultCache(path, 60).set("key", {"result": "shared"}, ttl_seconds=5)
+    
+    clock = FakeClock()
+    reader = TieredResultCache(MemoryResultCache(1024, 60, clock=clock), SQLiteResultCache(path, 60))
+    assert reader.get("key") == {"result": "shared"}
+    
+    clock.now = 5
+    assert reader.local.get("key") is None
+
+
+def test_tiered_cache_drops_entries_removed_by_another_process(tmp_path):
+    """
+    Test that removals through one tiered cache reach the local tier of another after the sync interval.
+    
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+    """
+    path = str(tmp_path / "cache.sqlite3")
+    clock = FakeClock()
+    admin = TieredResultCache(MemoryResultCache(1024, 60), SQLiteResultCache(path, 60))
+    worker = TieredResultCache(MemoryResultCache(1024, 60), SQLiteResultCache(path, 60), clock=clock)
+    admin.set("a", {"result": "a"})
+    admin.set("b", {"result": "b"})
+    assert worker.get("a") == {"result": "a"}
+    
+    admin.delete("a")
+    assert worker.get("a") == {"result": "a"}
+    
+    clock.now = worker.sync_interval
+    assert worker.get("a") is None
+    assert worker.get("b") == {"result": "b"}
+    
+    admin.clear()
+    clock.now += worker.sync_interval
+    assert asyncio.run(worker.aget("b")) is None
+
+
+def test_sqlite_cache_io_runs_off_the_event_loop(tmp_path, monkeypatch):
+    """
+    Test that the async accessors of a tiered cache query SQLite in worker threads.
+    
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    shared = SQLiteResultCache(str(tmp_path / "cache.sqlite3"), 60)
+    cache = TieredResultCache(MemoryResultCache(1024, 60), shared)
+    threads = []
+    for name in ("get_entry", "set"):
+        original = getattr(shared, name)
+        
+        def recording(*args, original=original):
+            threads.append(threading.get_ident())
+            return original(*args)
+        
+        monkeypatch.setattr(shared, name, recording)
+    
+    async def use_cache():
+        await cache.aset("key", {"result": "shared"})
+        cache.local.clear()
+        return await cache.aget("key"), threading.get_ident()
+    
+    value, loop_thread = asyncio.run(use_cache())
+    
+    assert value == {"result": "shared"}
+    assert len(threads) == 2 and loop_thread not in threads
+
+
+def test_service_serves_repeated_topics_from_cache(mock_julep_agent_manager, monkeypatch):
+    """
+    Test that a repeated request is answered without a new Julep chat.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    calls = []
+    original_chat = mock_julep_agent_manager.chat
+    
+    def counting_chat(session_id, messages, **options):
+        calls.append(messages)
+        return original_chat(session_id, messages, **options)
+    
+    monkeypatch.setattr(mock_julep_agent_manager, "chat", counting_chat)
+    service = ResearchService(
+        cache=MemoryResultCache(max_bytes=1024, ttl_seconds=60),
+        agent_manager=mock_julep_agent_manager,
+    )
+    
+    first = asyncio.run(service.perform_research("AI Ethics", "bullet points"))
+    second = asyncio.run(service.perform_research("ai ethics", "bullets"))
+    
+    assert first["cache_status"] == "MISS"
+    assert second["cache_status"] == "HIT"
+    assert second["topic"] == "ai ethics"
+    assert second["result"] == first["result"]
+    assert len(calls) == 1
+    
+    assert service.invalidate("AI ethics", "bullet points") == 1
+    third = asyncio.run(service.perform_research("ai ethics", "bullets"))
+    assert third["cache_status"] == "MISS"
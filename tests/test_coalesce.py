@@ -0,0 +1,112 @@
+"""
+Tests for coalescing of identical in-flight research requests.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.coalesce import SingleFlight
+from app.services.research import ResearchService, ResearchResponseError
+from tests.conftest import MockJulep
+
+
+def test_single_flight_shares_one_call():
+    """
+    Test that concurrent callers with the same key share one call.
+    """
+    group = SingleFlight()
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "value"
+    
+    async def run():
+        return await asyncio.gather(*(group.do("key", fetch) for _ in range(5)))
+    
+    assert asyncio.run(run()) == ["value"] * 5
+    assert len(calls) == 1
+    
+    stats = group.snapshot()["key"]
+    assert stats == {"waiters": 0, "requests": 5, "coalesced": 4, "peak_waiters": 5}
+
+
+def test_single_flight_delivers_error_to_all_waiters():
+    """
+    Test that every waiter receives the error of the shared call.
+    """
+    group = SingleFlight()
+    
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+    
+    async def run():
+        return await asyncio.gather(
+            *(group.do("key", fail) for _ in range(3)),
+            return_exceptions=True
+        )
+    
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_service_coalesces_identical_requests(mock_julep_agent_manager, monkeypatch):
+    """
+    Test that identical concurrent research requests send a single chat.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    mock_julep_agent_manager.julep = MockJulep(api_key="mock-api-key", latency=0.02)
+    calls = []
+    original_chat = mock_julep_agent_manager.chat
+    
+    def counting_chat(session_id, messages, **options):
+        calls.append(messages)
+        return original_chat(session_id, messages, **options)
+    
+    monkeypatch.setattr(mock_julep_agent_manager, "chat", counting_chat)
+    service = ResearchService(coalescer=SingleFlight(), agent_manager=mock_julep_agent_manager)
+    
+    async def run():
+        return await asyncio.gather(
+            service.perform_research("AI Ethics", "summary"),
+            service.perform_research("ai ethics", "summary"),
+            service.perform_research("AI ethics", "bullet points"),
+        )
+    
+    first, second, other_format = asyncio.run(run())
+    
+    assert len(calls) == 2
+    assert first["result"] == second["result"]
+    assert second["topic"] == "ai ethics"
+    assert other_format["format"] == "bullet points"
+
+
+def test_service_coalesced_errors_reach_every_waiter(monkeypatch):
+    """
+    Test that an upstream failure is raised to every coalesced caller.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    async def failing_upstream(topic, output_format, profile=None):
+        await asyncio.sleep(0.01)
+        raise ResearchResponseError("upstream failed")
+    
+    service = ResearchService(coalescer=SingleFlight())
+    monkeypatch.setattr(service, "_research_upstream", failing_upstream)
+    
+    async def run():
+        return await asyncio.gather(
+            *(service.perform_research("AI", "summary") for _ in range(4)),
+            return_exceptions=True
+        )
+    
+    results = asyncio.run(run())
+    assert all(isinstance(result, ResearchResponseError) for result in results)
+    assert service.coalescing_stats()["summary::ai"]["coalesced"] == 3
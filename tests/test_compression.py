@@ -0,0 +1,124 @@
+"""
+Tests for response serialization and compression.
+"""
+
+import json
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.api import responses
+from app.api.responses import CompressionMiddleware, FastJSONResponse, choose_encoding, dumps
+
+
+LONG_RESULT = "Findings about the topic. " * 200
+
+
+def make_client():
+    """Build a test client for a small app behind the compression middleware."""
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/large")
+    async def large():
+        return {"result": LONG_RESULT}
+
+    @app.get("/small")
+    async def small():
+        return {"result": "short"}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(3):
+                yield "data: " + LONG_RESULT + "\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def test_large_responses_are_compressed():
+    """
+    Test that responses above the size threshold are gzip compressed when accepted.
+    """
+    response = make_client().get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(LONG_RESULT)
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json() == {"result": LONG_RESULT}
+
+
+def test_small_and_unaccepted_responses_are_not_compressed():
+    """
+    Test that small responses and clients not accepting gzip get identity bodies.
+    """
+    client = make_client()
+
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/large", headers={"Accept-Encoding": "identity"}).headers
+    assert "content-encoding" not in client.get("/large", headers={"Accept-Encoding": "gzip;q=0"}).headers
+
+
+def test_streamed_responses_are_not_buffered():
+    """
+    Test that streamed responses pass through uncompressed.
+    """
+    response = make_client().get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.text.count("data: ") == 3
+
+
+def test_choose_encoding():
+    """
+    Test content coding negotiation.
+    """
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("*") in ("br", "gzip")
+    assert choose_encoding("deflate") is None
+    assert choose_encoding("") is None
+
+
+def test_dumps_without_orjson(monkeypatch):
+    """
+    Test that serialization falls back to compact json when orjson is missing.
+
+    Args:
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(responses, "orjson", None)
+    content = {"topic": "é", "result": "a"}
+
+    assert dumps(content) == '{"topic":"é","result":"a"}'.encode("utf-8")
+    assert json.loads(dumps(content)) == content
+
+
+def test_research_endpoint_is_compressed(client, research_service, monkeypatch):
+    """
+    Test that a report-sized /research response is compressed end to end.
+
+    Args:
+        client: TestClient fixture.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    async def mock_perform_research(topic, output_format, profile=None):
+        return {"topic": topic, "format": output_format, "result": LONG_RESULT, "cache_status": "HIT"}
+
+    monkeypatch.setattr(research_service, "perform_research", mock_perform_research)
+
+    response = client.post(
+        "/research",
+        json={"topic": "climate", "format": "short report"},
+        headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["x-cache"] == "HIT"
+    body = response.json()
+    assert body.pop("conversation")
+    assert body == {"topic": "climate", "format": "short report", "result": LONG_RESULT}
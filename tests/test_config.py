@@ -0,0 +1,75 @@
+"""
+Tests for application settings.
+"""
+
+import pytest
+
+from app.core import config
+from app.core.config import get_settings, reload_settings
+
+
+@pytest.fixture(autouse=True)
+def restore_settings():
+    """
+    Fixture restoring the memoized settings after each test.
+    """
+    original = config._settings
+    yield
+    config._settings = original
+
+
+def test_settings_are_memoized():
+    """
+    Test that settings are parsed once and shared between calls.
+    """
+    assert get_settings() is get_settings()
+
+
+def test_reload_swaps_in_new_settings(monkeypatch):
+    """
+    Test that a reload picks up a changed environment.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    before = get_settings()
+    monkeypatch.setenv("JULEP_MODEL", "gpt-4o-mini")
+    
+    # The memoized settings are not affected until a reload
+    assert get_settings().JULEP_MODEL == before.JULEP_MODEL
+    
+    after = reload_settings()
+    assert after is get_settings()
+    assert after.JULEP_MODEL == "gpt-4o-mini"
+
+
+def test_invalid_reload_keeps_current_settings(monkeypatch):
+    """
+    Test that an invalid environment leaves the current settings in place.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    before = get_settings()
+    monkeypatch.setenv("CACHE_MAX_BYTES", "not-a-number")
+    
+    with pytest.raises(Exception):
+        reload_settings()
+    assert get_settings() is before
+
+
+def test_admin_settings_reload_endpoint(client, admin_headers, monkeypatch):
+    """
+    Test reloading settings through the admin endpoint.
+    
+    Args:
+        client: TestClient fixture.
+        admin_headers: Headers carrying the configured admin key.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    monkeypatch.setenv("BATCH_MAX_ITEMS", "7")
+    
+    response = client.post("/admin/settings/reload", headers=admin_headers)
+    
+    assert response.status_code == 200
+    assert get_settings().BATCH_MAX_ITEMS == 7
@@ -0,0 +1,181 @@
+"""
+Tests for follow-up research on conversation handles.
+"""
+
+import pytest
+
+from app.services.conversations import MemoryConversationRegistry, SQLiteConversationRegistry
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        """Initialize the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+def open_conversation(registry, topic="topic"):
+    """Register a conversation about a topic."""
+    return registry.open(topic, "summary", None, None, 0, [])
+
+
+def test_registry_expires_idle_and_evicts_least_recently_used():
+    """
+    Test the idle TTL and the size bound of the conversation registry.
+    """
+    clock = FakeClock()
+    registry = MemoryConversationRegistry(max_entries=2, idle_ttl=10.0, clock=clock)
+    first = open_conversation(registry, "first")
+    second = open_conversation(registry, "second")
+
+    clock.now = 5.0
+    assert registry.get(first.handle) is first
+    third = open_conversation(registry, "third")
+    assert registry.get(second.handle) is None
+    assert len(registry) == 2
+
+    clock.now = 14.0
+    assert registry.get(third.handle) is third
+    clock.now = 16.0
+    assert registry.get(first.handle) is None
+    assert registry.get(third.handle) is third
+
+
+def test_sqlite_registry_is_shared_between_processes(tmp_path):
+    """
+    Test that handles opened through one SQLite registry are found, updated and expired through another.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+    """
+    clock = FakeClock()
+    path = str(tmp_path / "conversations.sqlite3")
+    first_worker = SQLiteConversationRegistry(path, max_entries=2, idle_ttl=10.0, clock=clock)
+    second_worker = SQLiteConversationRegistry(path, max_entries=2, idle_ttl=10.0, clock=clock)
+    conversation = first_worker.open("volcanoes", "summary", "research", "session-1", 2, [
+        {"role": "user", "content": "Research volcanoes"},
+        {"role": "assistant", "content": "Answer"},
+    ])
+
+    found = second_worker.get(conversation.handle)
+    assert (found.topic, found.session_id, found.saved_messages) == ("volcanoes", "session-1", 2)
+    found.output_format = "bullet points"
+    found.messages += [{"role": "user", "content": "Reformat"}, {"role": "assistant", "content": "Bullets"}]
+    second_worker.save(found)
+
+    clock.now = 5.0
+    updated = first_worker.get(conversation.handle)
+    assert updated.output_format == "bullet points"
+    assert len(updated.messages) == 4 and updated.unsaved_messages == updated.messages[2:]
+
+    open_conversation(second_worker, "second")
+    open_conversation(first_worker, "third")
+    assert len(first_worker) == 2
+    clock.now = 20.0
+    assert second_worker.get(conversation.handle) is None
+
+
+@pytest.fixture
+def recorded_chats(mock_julep_agent_manager, research_service, monkeypatch):
+    """
+    Fixture recording the chats sent to the mocked agent manager.
+
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+
+    Returns:
+        list: (session ID, messages, options) of each chat.
+    """
+    chats = []
+    original_chat = mock_julep_agent_manager.chat
+
+    def recording_chat(session_id, messages, **options):
+        chats.append((session_id, messages, options))
+        return original_chat(session_id, messages, **options)
+
+    monkeypatch.setattr(mock_julep_agent_manager, "chat", recording_chat)
+    monkeypatch.setattr(research_service, "agent_manager", mock_julep_agent_manager)
+    monkeypatch.setattr(research_service, "cache", None)
+    monkeypatch.setattr(research_service, "conversations", MemoryConversationRegistry(max_entries=10, idle_ttl=60.0))
+    return chats
+
+
+def test_follow_up_reuses_session_and_history(client, recorded_chats):
+    """
+    Test that a follow-up is one chat on the answering session with the earlier exchange.
+
+    Args:
+        client: TestClient fixture.
+        recorded_chats: Chats sent to the mocked agent manager.
+    """
+    response = client.post("/research", json={"topic": "volcanoes"})
+    assert response.status_code == 200
+    handle = response.json()["conversation"]
+
+    response = client.post(f"/research/{handle}/follow-up", json={"format": "bullet points"})
+
+    assert response.status_code == 200
+    assert response.json()["format"] == "bullet points"
+    assert response.json()["conversation"] == handle
+    assert len(recorded_chats) == 2
+    (first_session, _, _), (session_id, messages, options) = recorded_chats
+    assert session_id == first_session
+    assert options["save"] is False
+    assert [message["role"] for message in messages] == ["user", "assistant", "user"]
+    assert "volcanoes" in messages[0]["content"]
+    assert "'bullet points' format" in messages[-1]["content"]
+
+
+def test_follow_up_leases_pooled_sessions(client, recorded_chats, mock_julep_agent_manager, monkeypatch):
+    """
+    Test that a follow-up on an answer from a pooled session leases a session and returns it.
+
+    Args:
+        client: TestClient fixture.
+        recorded_chats: Chats sent to the mocked agent manager.
+        mock_julep_agent_manager: The mocked agent manager.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    leases = []
+    released = []
+    original_lease = mock_julep_agent_manager.lease_session
+
+    async def pooled_lease(output_format, situation, profile=None):
+        lease = await original_lease(output_format, situation, profile)
+        lease.pooled = True
+        leases.append(lease)
+        return lease
+
+    monkeypatch.setattr(mock_julep_agent_manager, "lease_session", pooled_lease)
+    monkeypatch.setattr(mock_julep_agent_manager, "release_session", lambda lease, failed=False: released.append(lease))
+    handle = client.post("/research", json={"topic": "volcanoes"}).json()["conversation"]
+
+    for _ in range(2):
+        response = client.post(f"/research/{handle}/follow-up", json={"instruction": "More detail"})
+        assert response.status_code == 200
+
+    assert len(leases) == 3
+    assert released == leases
+    # Pooled sessions keep no history, so every follow-up sends the whole exchange
+    assert [len(messages) for _, messages, _ in recorded_chats] == [1, 3, 5]
+
+
+def test_follow_up_on_unknown_handle(client, recorded_chats):
+    """
+    Test that unknown or expired handles are reported as not found.
+
+    Args:
+        client: TestClient fixture.
+        recorded_chats: Chats sent to the mocked agent manager.
+    """
+    response = client.post("/research/unknown/follow-up", json={"instruction": "More detail"})
+
+    assert response.status_code == 404
+    assert recorded_chats == []
@@ -0,0 +1,79 @@
+"""
+Tests for the fake Julep server used by the benchmarks.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from julep import InternalServerError, Julep
+
+from app.core.resilience import RETRIES
+from benchmarks.fake_julep import FAKE_RESULT, create_fake_julep_app, parse_latency
+from benchmarks.load import compare
+
+
+def make_fake_client(**options):
+    """Build a Julep SDK client talking to the fake server in-process."""
+    http_client = TestClient(create_fake_julep_app(**options))
+    return Julep(api_key="fake", base_url="http://testserver", http_client=http_client, max_retries=0)
+
+
+def test_agent_manager_runs_against_fake_server(mock_julep_agent_manager):
+    """
+    Test that the real SDK can chat and stream through the fake server.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+    """
+    mock_julep_agent_manager.julep = make_fake_client()
+    
+    async def run():
+        session = await mock_julep_agent_manager.acreate_session("Benchmark situation")
+        messages = [{"role": "user", "content": "Research benchmarks"}]
+        response = await mock_julep_agent_manager.achat(session.id, messages, save=False)
+        pieces = [text async for text in mock_julep_agent_manager.astream_chat(session.id, messages)]
+        return response, pieces
+    
+    response, pieces = asyncio.run(run())
+    
+    assert response.choices[0].message.content == FAKE_RESULT
+    assert "".join(pieces) == FAKE_RESULT
+
+
+def test_injected_errors_are_retried(mock_julep_agent_manager):
+    """
+    Test that injected failures surface as retryable errors.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+    """
+    mock_julep_agent_manager.julep = make_fake_client(error_rate=1.0)
+    mock_julep_agent_manager.retry_policy.backoff_base = 0.0
+    
+    with pytest.raises(InternalServerError):
+        asyncio.run(mock_julep_agent_manager.acreate_session("Benchmark situation"))
+    
+    assert RETRIES.value(operation="create_session") >= mock_julep_agent_manager.retry_policy.max_attempts - 1
+
+
+def test_parse_latency():
+    """
+    Test the latency distribution specs.
+    """
+    assert parse_latency("constant:0.25")() == 0.25
+    assert 0.1 <= parse_latency("uniform:0.1,0.2")() <= 0.2
+    assert parse_latency("lognormal:0.5,0.3")() > 0
+
+
+def test_compare_flags_regressions():
+    """
+    Test that a large latency increase is reported as a regression.
+    """
+    baseline = {"throughput_rps": 100.0, "latency_ms": {"p99": 200.0}}
+    current = {"throughput_rps": 101.0, "latency_ms": {"p99": 300.0}}
+    
+    lines = compare(current, baseline)
+    
+    assert any(line.startswith("latency_ms.p99") and "REGRESSION" in line for line in lines)
+    assert not any(line.startswith("throughput_rps") and "REGRESSION" in line for line in lines)
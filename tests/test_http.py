@@ -0,0 +1,90 @@
+"""
+Tests for the pooled HTTP transport of the Julep client.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.config import get_settings
+from app.core.http import CONNECTIONS_OPENED, close_http_client, create_http_client, pool_stats, request_timeout
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Minimal HTTP/1.1 handler that keeps connections open."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    """
+    Fixture serving KeepAliveHandler on a local port.
+
+    Yields:
+        str: The server URL.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_reuses_connections(server_url):
+    """
+    Test that sequential calls share one kept-alive connection and are counted.
+
+    Args:
+        server_url: URL of the local keep-alive server.
+    """
+    client = create_http_client(get_settings())
+    opened = CONNECTIONS_OPENED.value(stage="tcp")
+
+    for _ in range(5):
+        assert client.get(server_url).status_code == 200
+
+    assert CONNECTIONS_OPENED.value(stage="tcp") - opened == 1
+    assert pool_stats(client) == {"active": 0, "idle": 1, "waiting": 0}
+    close_http_client(client)
+    assert client.is_closed
+    assert pool_stats(client)["idle"] == 0
+
+
+def test_client_applies_limits():
+    """
+    Test that the pool limits come from the settings.
+    """
+    settings = get_settings().model_copy(update={"JULEP_HTTP_MAX_CONNECTIONS": 7, "JULEP_HTTP_MAX_KEEPALIVE": 3})
+    client = create_http_client(settings)
+    pool = client._transport._pool
+
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    close_http_client(client)
+
+
+def test_request_timeout_is_bounded_by_attempt():
+    """
+    Test that connect and pool timeouts never exceed the attempt timeout.
+    """
+    settings = get_settings()
+    short = request_timeout(1.0, settings)
+    long = request_timeout(120.0, settings)
+
+    assert (short.connect, short.read, short.pool) == (1.0, 1.0, 1.0)
+    assert long.connect == settings.JULEP_HTTP_CONNECT_TIMEOUT
+    assert long.read == 120.0
@@ -0,0 +1,321 @@
+"""
+Tests for background research jobs.
+"""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from app.services import jobs
+from app.services.errors import AdmissionRejected, ResearchError, UpstreamUnavailable
+from app.services.jobs import JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JobRunner, JobStore, get_job_runner
+from app.services.scheduling import current_client
+
+
+class FakeService:
+    """Research service stand-in recording the client each job runs as."""
+
+    def __init__(self, fail_topics=(), errors=()):
+        """Initialize the fake service."""
+        self.fail_topics = fail_topics
+        self.errors = list(errors)
+        self.clients = []
+
+    async def perform_research(self, topic, output_format="summary", profile=None):
+        """Return a canned result, or fail for the configured topics or with the queued errors."""
+        self.clients.append(current_client().client_id)
+        if topic in self.fail_topics:
+            raise ResearchError("Upstream failed")
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"topic": topic, "format": output_format, "result": f"Result for {topic}", "cache_status": "MISS"}
+
+
+def make_runner(path, service, **options):
+    """Build a job runner over a store at the given path."""
+    defaults = {
+        "workers": 2,
+        "result_ttl": 60,
+        "max_queued": 100,
+        "poll_interval": 0.05,
+        "callback_hosts": ["example.com"],
+    }
+    return JobRunner(JobStore(str(path)), service, **{**defaults, **options})
+
+
+def run_until_finished(runner, job_ids, timeout=5.0):
+    """Start the runner, wait for the jobs to finish and stop it."""
+    async def run():
+        runner.start()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            states = [await runner.get(job_id) for job_id in job_ids]
+            # Workers may still be delivering callbacks once the outcome is recorded
+            if all(job["status"] in (JOB_SUCCEEDED, JOB_FAILED) for job in states) and not runner._running:
+                break
+            await asyncio.sleep(0.01)
+        await runner.stop()
+
+    asyncio.run(run())
+
+
+def test_store_claims_oldest_job_once(tmp_path):
+    """
+    Test that queued jobs are claimed in submission order, each exactly once.
+    """
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    first = store.create("first", "summary", None, "client", "batch")
+    second = store.create("second", "summary", None, "client", "batch")
+
+    assert store.claim(60)["id"] == first["id"]
+    assert store.claim(60)["id"] == second["id"]
+    assert store.claim(60) is None
+    assert store.get(first["id"])["status"] == JOB_RUNNING
+
+
+def test_store_expires_finished_jobs(tmp_path):
+    """
+    Test that finished jobs disappear once their result TTL has passed.
+    """
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job = store.create("topic", "summary", None, "client", "interactive")
+    store.claim(60)
+    store.finish(job["id"], JOB_SUCCEEDED, ttl_seconds=-1, result={"topic": "topic"})
+
+    assert store.get(job["id"]) is None
+    assert store.purge_expired() == 1
+
+
+def test_runner_completes_jobs_as_submitting_client(tmp_path):
+    """
+    Test that jobs run as the client that submitted them and store their outcome.
+    """
+    service = FakeService(fail_topics=("broken",))
+    runner = make_runner(tmp_path / "jobs.sqlite3", service)
+    good = asyncio.run(runner.submit("climate", "summary", None, "alice", "interactive"))
+    bad = asyncio.run(runner.submit("broken", "summary", None, "bob", "batch"))
+
+    run_until_finished(runner, [good["id"], bad["id"]])
+
+    succeeded, failed = runner.store.get(good["id"]), runner.store.get(bad["id"])
+    assert succeeded["status"] == JOB_SUCCEEDED
+    assert succeeded["result"] == {"topic": "climate", "format": "summary", "result": "Result for climate"}
+    assert failed["status"] == JOB_FAILED
+    assert failed["error"] == "Upstream failed"
+    assert sorted(service.clients) == ["alice", "bob"]
+
+
+def test_jobs_survive_restart(tmp_path):
+    """
+    Test that a job whose owner stopped renewing its lease is requeued and completed.
+    """
+    path = tmp_path / "jobs.sqlite3"
+    store = JobStore(str(path))
+    job = store.create("interrupted", "summary", None, "client", "interactive")
+    store.claim(lease_seconds=0)
+
+    runner = make_runner(path, FakeService())
+    run_until_finished(runner, [job["id"]])
+
+    assert runner.store.get(job["id"])["status"] == JOB_SUCCEEDED
+    assert not store.finish(job["id"], JOB_FAILED, 60, error="late")
+
+
+def test_jobs_leased_by_live_owner_are_not_taken_over(tmp_path):
+    """
+    Test that starting another worker leaves jobs running under a live lease alone.
+    """
+    path = tmp_path / "jobs.sqlite3"
+    store = JobStore(str(path))
+    job = store.create("running elsewhere", "summary", None, "client", "interactive")
+    store.claim(lease_seconds=60)
+    service = FakeService()
+
+    async def run():
+        runner = make_runner(path, service)
+        runner.start()
+        await asyncio.sleep(0.2)
+        await runner.stop()
+
+    asyncio.run(run())
+
+    assert service.clients == []
+    assert store.get(job["id"])["status"] == JOB_RUNNING
+    assert store.finish(job["id"], JOB_SUCCEEDED, 60, result={"topic": "running elsewhere"})
+
+
+def test_runner_delivers_callback(tmp_path, monkeypatch):
+    """
+    Test that a finished job is delivered to its callback URL.
+    """
+    runner = make_runner(tmp_path / "jobs.sqlite3", FakeService())
+    delivered = []
+
+    async def deliver(job):
+        delivered.append(job)
+
+    monkeypatch.setattr(runner, "_deliver", deliver)
+    job = asyncio.run(runner.submit("climate", "summary", "https://example.com/hook", "client", "interactive"))
+    run_until_finished(runner, [job["id"]])
+
+    assert [(sent["id"], sent["status"]) for sent in delivered] == [(job["id"], JOB_SUCCEEDED)]
+
+
+@pytest.mark.parametrize("url", [
+    "https://attacker.test/hook",
+    "http://example.com/hook",
+    "https://example.com.attacker.test/hook",
+    "file:///etc/passwd",
+])
+def test_runner_rejects_disallowed_callback_urls(tmp_path, url):
+    """
+    Test that callbacks only go to allowed hosts over HTTPS.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+        url: A callback URL that must be refused.
+    """
+    runner = make_runner(tmp_path / "jobs.sqlite3", FakeService(), callback_hosts=["example.com", ".hooks.test"])
+    runner.check_callback_url("https://api.hooks.test/done")
+
+    with pytest.raises(ValueError):
+        asyncio.run(runner.submit("climate", "summary", url, "client", "interactive"))
+    assert runner.store.count_queued() == 0
+
+
+def test_runner_keeps_working_after_store_errors(tmp_path, monkeypatch):
+    """
+    Test that a failing job store is retried instead of stopping the workers.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    runner = make_runner(tmp_path / "jobs.sqlite3", FakeService(), workers=1)
+    job = asyncio.run(runner.submit("climate", "summary", None, "client", "interactive"))
+    original_claim = runner.store.claim
+    failures = []
+
+    def flaky_claim(lease_seconds):
+        if not failures:
+            failures.append(lease_seconds)
+            raise sqlite3.OperationalError("database is locked")
+        return original_claim(lease_seconds)
+
+    monkeypatch.setattr(runner.store, "claim", flaky_claim)
+    run_until_finished(runner, [job["id"]])
+
+    assert failures
+    assert runner.store.get(job["id"])["status"] == JOB_SUCCEEDED
+
+
+def test_runner_retries_transient_errors(tmp_path, monkeypatch):
+    """
+    Test that jobs hitting 429/503 from upstream are retried later, up to the attempt limit.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(jobs, "RETRY_BASE_DELAY", 0.0)
+    errors = [
+        AdmissionRejected("Busy", status_code=429, retry_after=0),
+        UpstreamUnavailable("Shedding load", status_code=503, retry_after=0),
+    ]
+    runner = make_runner(tmp_path / "jobs.sqlite3", FakeService(errors=errors), max_attempts=3)
+    job = asyncio.run(runner.submit("climate", "summary", None, "client", "interactive"))
+    run_until_finished(runner, [job["id"]])
+
+    finished = runner.store.get(job["id"])
+    assert (finished["status"], finished["attempts"]) == (JOB_SUCCEEDED, 2)
+
+    errors = [UpstreamUnavailable("Timed out", status_code=504, retry_after=0) for _ in range(2)]
+    runner = make_runner(tmp_path / "other.sqlite3", FakeService(errors=errors), max_attempts=2)
+    job = asyncio.run(runner.submit("climate", "summary", None, "client", "interactive"))
+    run_until_finished(runner, [job["id"]])
+
+    finished = runner.store.get(job["id"])
+    assert (finished["status"], finished["error"]) == (JOB_FAILED, "Timed out")
+
+
+def test_store_holds_retried_jobs_until_their_delay(tmp_path):
+    """
+    Test that a retried job is not claimed before its delay has passed.
+    """
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job = store.create("topic", "summary", None, "client", "batch")
+    store.claim(60)
+
+    assert store.retry(job["id"], delay=60)
+    assert store.get(job["id"])["status"] == JOB_QUEUED
+    assert store.claim(60) is None
+    assert store.retry(job["id"], delay=0) is False
+
+
+def test_stop_requeues_running_jobs(tmp_path):
+    """
+    Test that stopping the runner returns the jobs it was running to the queue.
+    """
+    class SlowService(FakeService):
+        """Service whose research does not finish before the runner stops."""
+
+        async def perform_research(self, topic, output_format="summary", profile=None):
+            self.started.set()
+            await asyncio.sleep(60)
+
+    service = SlowService()
+    runner = make_runner(tmp_path / "jobs.sqlite3", service, workers=1)
+
+    async def run():
+        service.started = asyncio.Event()
+        job = await runner.submit("climate", "summary", None, "client", "interactive")
+        runner.start()
+        await asyncio.wait_for(service.started.wait(), timeout=5)
+        await runner.stop()
+        return job
+
+    job = asyncio.run(run())
+
+    stopped = runner.store.get(job["id"])
+    assert (stopped["status"], stopped["owner"]) == (JOB_QUEUED, None)
+
+
+def test_runner_rejects_submissions_when_full(tmp_path):
+    """
+    Test that submissions beyond the queue bound are rejected with 429.
+    """
+    runner = make_runner(tmp_path / "jobs.sqlite3", FakeService(), max_queued=1)
+    asyncio.run(runner.submit("first", "summary", None, "client", "interactive"))
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        asyncio.run(runner.submit("second", "summary", None, "client", "interactive"))
+    assert rejected.value.status_code == 429
+
+
+def test_job_endpoints(client, tmp_path, monkeypatch):
+    """
+    Test submitting a job over HTTP and polling for it.
+
+    Args:
+        client: TestClient fixture.
+        tmp_path: Pytest temporary directory fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    runner = make_runner(tmp_path / "jobs.sqlite3", FakeService())
+    monkeypatch.setitem(client.app.dependency_overrides, get_job_runner, lambda: runner)
+
+    response = client.post(
+        "/research/jobs",
+        json={"topic": "climate", "format": "summary", "callback_url": "https://example.com/hook"}
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == JOB_QUEUED
+    assert response.headers["location"] == f"/research/jobs/{job['id']}"
+
+    polled = client.get(response.headers["location"])
+    assert polled.status_code == 200
+    assert polled.json()["id"] == job["id"]
+    assert client.get("/research/jobs/unknown").status_code == 404
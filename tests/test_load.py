@@ -0,0 +1,84 @@
+"""
+Load tests for the non-blocking research path.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from tests.conftest import MockJulep
+
+
+LATENCY = 0.05
+CONCURRENCY = 100
+
+
+@pytest.fixture
+def slow_agent_manager(mock_julep_agent_manager, research_service, monkeypatch):
+    """
+    Fixture providing an agent manager whose Julep calls take LATENCY seconds each.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+        
+    Returns:
+        JulepAgentManager: The slow mocked agent manager.
+    """
+    mock_julep_agent_manager.julep = MockJulep(api_key="mock-api-key", latency=LATENCY)
+    monkeypatch.setattr(research_service, "agent_manager", mock_julep_agent_manager)
+    return mock_julep_agent_manager
+
+
+def test_concurrent_research_scales(slow_agent_manager, research_service):
+    """
+    Test that concurrent research calls overlap instead of running serially.
+    
+    Args:
+        slow_agent_manager: The slow mocked agent manager.
+        research_service: Research service fixture.
+    """
+    async def run():
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            research_service.perform_research(f"topic {i}", "summary")
+            for i in range(CONCURRENCY)
+        ))
+        return results, time.perf_counter() - start
+    
+    results, elapsed = asyncio.run(run())
+    
+    assert len(results) == CONCURRENCY
+    # Serial execution would take CONCURRENCY * 2 * LATENCY (10 seconds)
+    assert elapsed < CONCURRENCY * 2 * LATENCY / 5
+
+
+def test_event_loop_stays_responsive(slow_agent_manager, research_service):
+    """
+    Test that the event loop keeps running other tasks during research calls.
+    
+    Args:
+        slow_agent_manager: The slow mocked agent manager.
+        research_service: Research service fixture.
+    """
+    async def run():
+        ticks = 0
+        
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+        
+        beat = asyncio.create_task(heartbeat())
+        await asyncio.gather(*(
+            research_service.perform_research("artificial intelligence", "summary")
+            for _ in range(10)
+        ))
+        beat.cancel()
+        return ticks
+    
+    # Two sequential calls of LATENCY each leave room for many heartbeats
+    assert asyncio.run(run()) >= 5
@@ -0,0 +1,99 @@
+"""
+Tests for the logging pipeline.
+"""
+
+import io
+import json
+import logging
+import logging.handlers
+import sys
+
+import pytest
+
+from app.core import logging as app_logging
+from app.core.logging import InfoSamplingFilter, JsonFormatter, configure_logging, setup_logger
+
+
+def make_record(level=logging.INFO, msg="Research on %s", args=("AI",)):
+    """
+    Build a log record for tests.
+    
+    Returns:
+        logging.LogRecord: The record.
+    """
+    return logging.LogRecord("test", level, __file__, 1, msg, args, None)
+
+
+def test_setup_logger_enqueues_records():
+    """
+    Test that module loggers hand records to the background queue.
+    """
+    logger = setup_logger("tests.logging.queue")
+    
+    assert len(logger.handlers) == 1
+    assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+
+
+def test_queue_handler_defers_formatting():
+    """
+    Test that records are enqueued with merged arguments but without formatting.
+    """
+    record = app_logging._queue_handler.prepare(make_record())
+    
+    assert record.msg == "Research on AI"
+    assert record.args is None
+    assert not hasattr(record, "asctime")
+
+
+def test_json_formatter():
+    """
+    Test that the JSON formatter emits the record fields.
+    """
+    entry = json.loads(JsonFormatter().format(make_record()))
+    
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "test"
+    assert entry["message"] == "Research on AI"
+    assert "timestamp" in entry
+
+
+def test_info_sampling_keeps_other_levels():
+    """
+    Test that sampling drops INFO records but never warnings.
+    """
+    sampling = InfoSamplingFilter(rate=0.0)
+    
+    assert not sampling.filter(make_record(logging.INFO))
+    assert sampling.filter(make_record(logging.WARNING))
+    assert InfoSamplingFilter(rate=1.0).filter(make_record(logging.INFO))
+
+
+def test_configure_logging_updates_levels():
+    """
+    Test that configure_logging changes the level of loggers set up without one.
+    """
+    logger = setup_logger("tests.logging.level")
+    try:
+        configure_logging(log_level="WARNING")
+        assert not logger.isEnabledFor(logging.INFO)
+    finally:
+        configure_logging()
+    assert logger.isEnabledFor(logging.INFO)
+    
+    with pytest.raises(ValueError):
+        configure_logging(log_format="xml")
+
+
+def test_output_follows_the_current_stdout(monkeypatch):
+    """
+    Test that records go to the stdout in place when emitted, not the one at import.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    replaced = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", replaced)
+    
+    app_logging._output_handler.handle(make_record())
+    
+    assert "Research on AI" in replaced.getvalue()
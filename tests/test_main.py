@@ -0,0 +1,76 @@
+"""
+Tests for the application entry point.
+"""
+
+import pytest
+
+import main
+from benchmarks.bench_import import run
+from app.core.config import get_settings
+
+
+def test_main_serves_with_configured_workers(monkeypatch):
+    """
+    Test that the server runs with the configured workers after a shared bootstrap.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    runs = []
+    monkeypatch.setattr(main.uvicorn, "run", lambda app, **options: runs.append((app, options)))
+    monkeypatch.setattr(main.get_agent_manager(), "bootstrap", lambda: "shared-agent-id")
+    monkeypatch.setattr(get_settings(), "WORKERS", 4)
+    # Set before deleting, so that the ID exported by main is removed again afterwards
+    monkeypatch.setenv("JULEP_AGENT_ID", "")
+    monkeypatch.delenv("JULEP_AGENT_ID")
+    
+    main.main([])
+    
+    app, options = runs[0]
+    assert app == "app.api.endpoints:create_application"
+    assert options["factory"] is True
+    assert options["workers"] == 4
+    assert options["port"] == get_settings().PORT
+    assert main.os.environ["JULEP_AGENT_ID"] == "shared-agent-id"
+
+
+def test_main_single_worker_skips_shared_bootstrap(monkeypatch):
+    """
+    Test that a single worker bootstraps in its own lifespan instead.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    runs = []
+    monkeypatch.setattr(main.uvicorn, "run", lambda app, **options: runs.append(options))
+    monkeypatch.setattr(main, "bootstrap_shared_state", lambda: pytest.fail("unexpected bootstrap"))
+    monkeypatch.setattr(get_settings(), "WORKERS", 1)
+    
+    main.main([])
+    
+    assert runs[0]["workers"] == 1
+
+
+@pytest.mark.parametrize("module", ["main", "app.api.endpoints"])
+def test_entry_points_do_not_import_the_sdk(module):
+    """
+    Test that importing the entry points leaves the Julep SDK unloaded.
+    
+    Args:
+        module (str): The entry point module to import.
+    """
+    assert run(module, repeat=1, forbidden=["julep", "openai"])["forbidden_loaded"] == []
+
+
+def test_prime_command_arguments():
+    """
+    Test that the prime subcommand accepts a topic file or a log to replay.
+    """
+    args = main.parse_args(["prime", "topics.csv", "--rate", "2"])
+    assert (args.command, args.file, args.rate, args.restart) == ("prime", "topics.csv", 2.0, False)
+    
+    args = main.parse_args(["prime", "--from-log", "app.log", "--top", "5"])
+    assert (args.file, args.from_log, args.top) == (None, "app.log", 5)
+    
+    with pytest.raises(SystemExit):
+        main.parse_args(["prime"])
@@ -0,0 +1,93 @@
+"""
+Tests for metrics and request timing.
+"""
+
+import pytest
+
+from app.core.metrics import Counter, Histogram, timed, start_request_timings
+from app.services import research
+
+
+def test_histogram_quantiles_and_buckets():
+    """
+    Test that histograms report cumulative buckets and recent quantiles.
+    """
+    histogram = Histogram("test_seconds", "Test latency", labelnames=("stage",), buckets=(0.1, 1.0))
+    for value in [0.05] * 50 + [0.5] * 45 + [2.0] * 5:
+        histogram.observe(value, stage="chat")
+    
+    assert histogram.count(stage="chat") == 100
+    assert histogram.quantile(0.5, stage="chat") == 0.5
+    assert histogram.quantile(0.99, stage="chat") == 2.0
+    
+    text = "\n".join(histogram.render())
+    assert 'test_seconds_bucket{stage="chat",le="0.1"} 50' in text
+    assert 'test_seconds_bucket{stage="chat",le="+Inf"} 100' in text
+    assert 'test_seconds_quantile{stage="chat",quantile="0.95"} 2.0' in text
+
+
+def test_counter_escapes_labels():
+    """
+    Test that counter label values are escaped.
+    """
+    counter = Counter("test_total", "Test count", labelnames=("exception",))
+    counter.inc(exception='Bad"Error')
+    
+    assert 'test_total{exception="Bad\\"Error"} 1.0' in counter.render()
+
+
+def test_timed_records_request_timings():
+    """
+    Test that timed stages are collected for the current request.
+    """
+    timings = start_request_timings()
+    with timed("validate"):
+        pass
+    
+    assert [stage for stage, _ in timings] == ["validate"]
+
+
+def test_research_reports_server_timing_and_metrics(client, mock_julep_agent_manager, research_service, monkeypatch):
+    """
+    Test that a research call exposes its stages in Server-Timing and /metrics.
+    
+    Args:
+        client: TestClient fixture.
+        mock_julep_agent_manager: The mocked agent manager.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(research_service, "agent_manager", mock_julep_agent_manager)
+    monkeypatch.setattr(research_service, "cache", None)
+    
+    response = client.post("/research", json={"topic": "server timing"})
+    
+    assert response.status_code == 200
+    stages = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+    assert {"session_lease", "chat", "validate", "total"} <= set(stages)
+    
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert 'research_stage_seconds_count{stage="chat"}' in metrics.text
+    assert 'http_request_seconds_quantile{method="POST",path="/research",quantile="0.99"}' in metrics.text
+    assert 'http_requests_in_flight{path="/metrics"} 1.0' in metrics.text
+
+
+def test_errors_counted_by_exception_class(client, research_service, monkeypatch):
+    """
+    Test that research errors are counted per exception class.
+    
+    Args:
+        client: TestClient fixture.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    async def failing_research(topic, output_format, profile=None):
+        raise research.AgentSessionError("no session")
+    
+    monkeypatch.setattr(research_service, "perform_research", failing_research)
+    
+    client.post("/research", json={"topic": "errors"})
+    
+    assert 'research_errors_total{exception="AgentSessionError"}' in client.get("/metrics").text
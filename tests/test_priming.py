@@ -0,0 +1,172 @@
+"""
+Tests for result cache priming.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.services.cache import CACHE_HIT, CACHE_MISS, MemoryResultCache
+from app.services.errors import ResearchError
+from app.services.priming import PRIMER_CLIENT, CachePrimer, prime_in_background, read_items, top_logged_topics
+from app.services.scheduling import current_client
+
+
+class FakeService:
+    """Research service stand-in recording each researched topic and its client."""
+
+    def __init__(self, cached_topics=(), fail_topics=()):
+        """Initialize the fake service."""
+        self.cache = MemoryResultCache(max_bytes=1024, ttl_seconds=60)
+        self.cached_topics = cached_topics
+        self.fail_topics = fail_topics
+        self.calls = []
+
+    async def perform_research(self, topic, output_format="summary", profile=None):
+        """Return a canned result, or fail for the configured topics."""
+        self.calls.append((topic, current_client().client_id, current_client().priority))
+        if topic in self.fail_topics:
+            raise ResearchError("Upstream failed")
+        status = CACHE_HIT if topic in self.cached_topics else CACHE_MISS
+        return {"topic": topic, "format": output_format, "result": "Result", "cache_status": status}
+
+
+def make_primer(service, checkpoint_path=None):
+    """Build a primer that does not wait between items."""
+    return CachePrimer(
+        service=service,
+        rate=1000.0,
+        concurrency=1,
+        priority="batch",
+        checkpoint_path=checkpoint_path,
+        progress_interval=2,
+    )
+
+
+def test_read_items_from_csv_and_jsonl(tmp_path):
+    """
+    Test that topic lists are read from CSV, with or without a header, and from JSONL.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+    """
+    headed = tmp_path / "headed.csv"
+    headed.write_text("format,topic\nbullet points,AI ethics\nsummary,\n")
+    bare = tmp_path / "bare.csv"
+    bare.write_text("Quantum computing\nClimate,short report,research\n")
+    lines = tmp_path / "topics.jsonl"
+    lines.write_text('{"topic": "Rome", "format": "summary"}\nnot json\n\n{"topic": "Mars"}\n')
+
+    assert list(read_items(str(headed))) == [("AI ethics", "bullet points", None)]
+    assert list(read_items(str(bare))) == [
+        ("Quantum computing", "summary", None),
+        ("Climate", "short report", "research"),
+    ]
+    assert list(read_items(str(lines))) == [("Rome", "summary", None), ("Mars", "summary", None)]
+
+
+def test_top_logged_topics(tmp_path):
+    """
+    Test that the most requested topics are found in text and JSON logs.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+    """
+    log = tmp_path / "app.log"
+    text = "2024-01-01 - app.api.endpoints - INFO - Received research request - Topic: '{}', Format: '{}'\n"
+    entry = {"level": "INFO", "message": "Received streaming research request - Topic: 'ai  ethics', Format: 'summary'"}
+    log.write_text(
+        text.format("AI ethics", "summary") * 2
+        + text.format("Mars", "bullet points")
+        + json.dumps(entry) + "\n"
+        + "unrelated line\n"
+    )
+
+    assert top_logged_topics(str(log), 1) == [("AI ethics", "summary", None)]
+    assert len(top_logged_topics(str(log), 10)) == 2
+
+
+def test_primer_counts_outcomes_at_low_priority():
+    """
+    Test that priming runs as the primer client in its priority class and counts outcomes.
+    """
+    service = FakeService(cached_topics={"b"}, fail_topics={"c"})
+    items = [("a", "summary", None), ("b", "summary", None), ("c", "summary", None)]
+
+    stats = asyncio.run(make_primer(service).prime(items, source="topics"))
+
+    assert stats == {"skipped": 0, "primed": 1, "cached": 1, "failed": 1}
+    assert {(client, priority) for _, client, priority in service.calls} == {(PRIMER_CLIENT, "batch")}
+
+
+def test_primer_resumes_after_interruption(tmp_path):
+    """
+    Test that an interrupted run resumes after the items it completed.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+    """
+    checkpoint = str(tmp_path / "checkpoint.json")
+    topics = [f"topic {i}" for i in range(6)]
+
+    def interrupted():
+        for topic in topics[:3]:
+            yield topic, "summary", None
+        raise KeyboardInterrupt
+
+    first = FakeService()
+    with pytest.raises(KeyboardInterrupt):
+        asyncio.run(make_primer(first, checkpoint).prime(interrupted(), source="topics"))
+
+    second = FakeService()
+    items = [(topic, "summary", None) for topic in topics]
+    stats = asyncio.run(make_primer(second, checkpoint).prime(items, source="topics"))
+
+    done_first = [topic for topic, _, _ in first.calls]
+    assert stats["skipped"] == len(done_first)
+    assert done_first + [topic for topic, _, _ in second.calls] == topics
+    with open(checkpoint) as f:
+        assert json.load(f) == {"topics": 6}
+
+    again = asyncio.run(make_primer(FakeService(), checkpoint).prime(items, source="topics", restart=True))
+    assert again["primed"] == 6
+
+
+def test_background_priming_ignores_earlier_checkpoint(tmp_path):
+    """
+    Test that startup priming primes the whole list despite a checkpoint from an earlier process.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+    """
+    checkpoint = str(tmp_path / "checkpoint.json")
+    topics = tmp_path / "topics.csv"
+    topics.write_text("topic\n" + "\n".join(f"topic {i}" for i in range(5)) + "\n")
+    asyncio.run(make_primer(FakeService(), checkpoint).prime(read_items(str(topics)), source=str(topics)))
+
+    service = FakeService()
+    asyncio.run(prime_in_background(make_primer(service, checkpoint), str(topics), shared=True))
+
+    assert len(service.calls) == 5
+
+
+def test_primer_skips_while_checkpoint_is_locked(tmp_path):
+    """
+    Test that only one process primes with a given checkpoint at a time.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+    """
+    checkpoint = str(tmp_path / "checkpoint.json")
+    items = [("a", "summary", None), ("b", "summary", None)]
+    holder = make_primer(FakeService(), checkpoint)
+    service = FakeService()
+
+    with holder._checkpoint_lock() as locked:
+        assert locked
+        stats = asyncio.run(make_primer(service, checkpoint).prime(items, source="topics"))
+
+    assert stats == {"skipped": 0, "primed": 0, "cached": 0, "failed": 0}
+    assert service.calls == []
+    assert asyncio.run(make_primer(service, checkpoint).prime(items, source="topics"))["primed"] == 2
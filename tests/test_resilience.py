@@ -0,0 +1,165 @@
+"""
+Tests for retries, deadlines and the circuit breaker around upstream calls.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from julep import BadRequestError, InternalServerError
+
+from app.core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    RetryPolicy,
+    call_with_retry,
+    deadline,
+    is_retryable,
+)
+
+
+def make_status_error(error_class, status_code):
+    """Build a Julep API status error with the given status code."""
+    request = httpx.Request("POST", "https://api.julep.ai/api/sessions")
+    response = httpx.Response(status_code, request=request)
+    return error_class("upstream error", response=response, body=None)
+
+
+def make_policy(max_attempts=3, attempt_timeout=1.0):
+    """Build a retry policy without backoff delays."""
+    return RetryPolicy(
+        max_attempts=max_attempts,
+        attempt_timeout=attempt_timeout,
+        backoff_base=0.0,
+        backoff_max=0.0,
+    )
+
+
+def test_is_retryable_classification():
+    """
+    Test that transient errors are retryable and client errors are not.
+    """
+    assert is_retryable(asyncio.TimeoutError())
+    assert is_retryable(make_status_error(InternalServerError, 502))
+    assert not is_retryable(make_status_error(BadRequestError, 400))
+    assert not is_retryable(DeadlineExceeded())
+    assert not is_retryable(ValueError("bad response"))
+
+
+def test_retries_retryable_errors_until_success():
+    """
+    Test that a retryable error is retried and the later success is returned.
+    """
+    attempts = []
+    
+    async def flaky(timeout):
+        attempts.append(timeout)
+        if len(attempts) < 3:
+            raise make_status_error(InternalServerError, 503)
+        return "ok"
+    
+    result = asyncio.run(call_with_retry(flaky, make_policy(), None, "chat"))
+    
+    assert result == "ok"
+    assert attempts == [1.0, 1.0, 1.0]
+
+
+def test_does_not_retry_client_errors():
+    """
+    Test that a non-retryable error fails on the first attempt.
+    """
+    attempts = []
+    
+    async def rejected(timeout):
+        attempts.append(timeout)
+        raise make_status_error(BadRequestError, 400)
+    
+    with pytest.raises(BadRequestError):
+        asyncio.run(call_with_retry(rejected, make_policy(), None, "chat"))
+    
+    assert len(attempts) == 1
+
+
+def test_attempts_are_bounded_by_the_deadline():
+    """
+    Test that the deadline caps the attempt timeout and stops further retries.
+    """
+    async def slow(timeout):
+        await asyncio.sleep(1)
+    
+    async def run():
+        with deadline(0.05):
+            await call_with_retry(slow, make_policy(attempt_timeout=5.0), None, "chat")
+    
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(run())
+
+
+def test_breaker_opens_sheds_and_recovers_through_half_open():
+    """
+    Test the closed, open, half-open and closed cycle of the circuit breaker.
+    """
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=10.0, clock=lambda: now[0])
+    
+    async def failing(timeout):
+        raise make_status_error(InternalServerError, 500)
+    
+    async def healthy(timeout):
+        return "ok"
+    
+    policy = make_policy(max_attempts=1)
+    for _ in range(2):
+        with pytest.raises(InternalServerError):
+            asyncio.run(call_with_retry(failing, policy, breaker, "chat"))
+    assert breaker.state == CircuitBreaker.OPEN
+    
+    with pytest.raises(CircuitOpenError) as shed:
+        asyncio.run(call_with_retry(healthy, policy, breaker, "chat"))
+    assert shed.value.retry_after == 10.0
+    
+    # A failed probe opens the breaker again
+    now[0] = 10.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(InternalServerError):
+        asyncio.run(call_with_retry(failing, policy, breaker, "chat"))
+    assert breaker.state == CircuitBreaker.OPEN
+    
+    # A successful probe closes it
+    now[0] = 20.0
+    assert asyncio.run(call_with_retry(healthy, policy, breaker, "chat")) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_limits_concurrent_probes():
+    """
+    Test that only the configured number of probes run while half-open.
+    """
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=0.0, half_open_max_calls=1)
+    breaker.record_failure()
+    
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_open_breaker_returns_503_with_retry_after(client, mock_julep_agent_manager, research_service, monkeypatch):
+    """
+    Test that requests are failed fast while the circuit breaker is open.
+    
+    Args:
+        client: TestClient fixture.
+        mock_julep_agent_manager: The mocked agent manager.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    mock_julep_agent_manager.session_pool = None
+    for _ in range(mock_julep_agent_manager.breaker.failure_threshold):
+        mock_julep_agent_manager.breaker.record_failure()
+    monkeypatch.setattr(research_service, "agent_manager", mock_julep_agent_manager)
+    
+    response = client.post("/research", json={"topic": "breaker open", "format": "summary"})
+    
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
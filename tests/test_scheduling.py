@@ -0,0 +1,148 @@
+"""
+Tests for priority classes, fair queuing and per-client rate limits.
+"""
+
+import asyncio
+
+from app.services import research
+from app.services.admission import AdmissionController
+from app.services.scheduling import ClientRateLimiter, TokenBucket, current_client
+
+
+def admission_order(controller, requests):
+    """
+    Queue requests behind one held slot and record the order they are admitted in.
+    
+    Args:
+        controller (AdmissionController): Controller with a concurrency limit of 1.
+        requests (list): (client_id, priority) pairs, enqueued in this order.
+        
+    Returns:
+        list: The requests in admission order.
+    """
+    order = []
+    
+    async def wait(client_id, priority):
+        await controller.acquire("summary", client_id=client_id, priority=priority)
+        order.append((client_id, priority))
+    
+    async def run():
+        await controller.acquire("summary")
+        tasks = [asyncio.ensure_future(wait(*request)) for request in requests]
+        await asyncio.sleep(0)
+        for _ in requests:
+            controller.release("summary")
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+    
+    asyncio.run(run())
+    return order
+
+
+def test_classes_share_slots_by_weight():
+    """
+    Test that a backlog of low priority requests does not starve a higher class.
+    """
+    controller = AdmissionController(
+        max_concurrency=1,
+        max_queue=100,
+        max_queue_time=5,
+        class_weights={"interactive": 3.0, "batch": 1.0}
+    )
+    backfill = [("backfill", "batch")] * 8
+    interactive = [("user", "interactive")] * 6
+    
+    order = admission_order(controller, backfill + interactive)
+    
+    # The interactive requests arrived last but take three of every four slots
+    first_eight = [priority for _, priority in order[:8]]
+    assert first_eight.count("interactive") == 6
+    assert order[-1] == ("backfill", "batch")
+
+
+def test_clients_within_a_class_are_served_round_robin():
+    """
+    Test that one client's backlog does not delay another client of the same class.
+    """
+    controller = AdmissionController(max_concurrency=1, max_queue=100, max_queue_time=5)
+    
+    order = admission_order(controller, [("busy", "batch")] * 5 + [("quiet", "batch")])
+    
+    assert order.index(("quiet", "batch")) == 1
+
+
+def test_token_bucket_refills_over_time():
+    """
+    Test that a token bucket allows a burst and then the configured rate.
+    """
+    now = [0.0]
+    bucket = TokenBucket(rate=2.0, burst=2.0, clock=lambda: now[0])
+    
+    assert bucket.try_take() == 0.0
+    assert bucket.try_take() == 0.0
+    assert bucket.try_take() == 0.5
+    
+    now[0] = 0.5
+    assert bucket.try_take() == 0.0
+
+
+def test_rate_limiter_is_per_client():
+    """
+    Test that one client exhausting its bucket does not limit another.
+    """
+    limiter = ClientRateLimiter(rate=1.0, burst=1.0, clock=lambda: 0.0)
+    
+    assert limiter.check("a") == 0.0
+    assert limiter.check("a") > 0.0
+    assert limiter.check("b") == 0.0
+
+
+def test_rate_limited_client_gets_429(client, research_service, monkeypatch):
+    """
+    Test that requests over a client's rate limit are rejected with Retry-After.
+    
+    Args:
+        client: TestClient fixture.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    async def instant_research(topic, output_format, profile=None):
+        return {"topic": topic, "format": output_format, "result": "ok"}
+    
+    monkeypatch.setattr(research_service, "perform_research", instant_research)
+    monkeypatch.setattr(research_service, "rate_limiter", ClientRateLimiter(rate=0.1, burst=1.0))
+    headers = {"X-Client-Id": "rate-limited-client"}
+    
+    first = client.post("/research", json={"topic": "limits"}, headers=headers)
+    second = client.post("/research", json={"topic": "limits"}, headers=headers)
+    
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert second.headers["Retry-After"] == "10"
+
+
+def test_priority_class_from_api_key_and_header(client, research_service, monkeypatch):
+    """
+    Test that the API key mapping overrides the X-Priority header.
+    
+    Args:
+        client: TestClient fixture.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    seen = []
+    
+    async def recording_research(topic, output_format, profile=None):
+        seen.append(current_client().priority)
+        return {"topic": topic, "format": output_format, "result": "ok"}
+    
+    monkeypatch.setattr(research_service, "perform_research", recording_research)
+    monkeypatch.setattr(research.get_settings(), "API_KEY_PRIORITIES", {"backfill-key": "batch"})
+    
+    client.post("/research", json={"topic": "a"})
+    client.post("/research", json={"topic": "b"}, headers={"X-Priority": "batch"})
+    client.post("/research", json={"topic": "c"}, headers={"X-API-Key": "backfill-key", "X-Priority": "interactive"})
+    client.post("/research", json={"topic": "d"}, headers={"X-Priority": "unknown"})
+    
+    assert seen == ["interactive", "batch", "batch", "interactive"]
+    assert "admission_queue_wait_seconds" in client.get("/metrics").text
@@ -0,0 +1,186 @@
+"""
+Tests for the semantic near-duplicate cache.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.services import research, semantic_cache
+from app.services.cache import MemoryResultCache, make_cache_key
+from app.services.research import ResearchService
+from app.services.semantic_cache import (
+    SemanticCache,
+    SemanticIndex,
+    create_semantic_cache,
+    terms_match,
+    vectorize,
+)
+
+
+def similarity(first, second):
+    """Cosine similarity of two topics."""
+    return float(vectorize(first, 1024) @ vectorize(second, 1024))
+
+
+def test_paraphrases_are_more_similar_than_unrelated_topics():
+    """
+    Test that reworded topics score above unrelated ones.
+    """
+    assert similarity("history of rome", "Roman history") > 0.6
+    assert similarity("quantum computing", "quantum computers") > 0.6
+    assert similarity("the climate change", "climate change") == pytest.approx(1.0)
+    assert similarity("climate change", "medieval poetry") < 0.2
+
+
+@pytest.mark.parametrize("first, second", [
+    ("world war 1", "world war 2"),
+    ("climate change in africa", "climate change in asia"),
+    ("python 3", "python 2"),
+    ("history of rome", "history of greece"),
+    ("history of rome", "rome"),
+    ("impact of climate change", "climate change"),
+    ("effects of smoking", "smoking"),
+    ("what is the", "what is a"),
+])
+def test_near_misses_do_not_match(first, second):
+    """
+    Test that similar topics about different things are kept apart.
+
+    Args:
+        first: A topic.
+        second: A similar topic about something else.
+    """
+    assert not terms_match(first, second)
+    semantic = SemanticCache(threshold=research.get_settings().SEMANTIC_CACHE_THRESHOLD, dim=1024, max_entries=10)
+    semantic.add(make_cache_key(first, "summary"), first, "summary")
+
+    assert semantic.lookup(second, "summary") is None
+
+
+@pytest.mark.parametrize("first, second", [
+    ("AI ethics", "ethics of artificial intelligence"),
+    ("history of rome", "Roman history"),
+    ("quantum computing", "quantum computers"),
+])
+def test_paraphrases_match_at_default_threshold(first, second):
+    """
+    Test that paraphrases, acronyms included, match at the default threshold.
+
+    Args:
+        first: A topic.
+        second: A paraphrase of it.
+    """
+    semantic = SemanticCache(threshold=research.get_settings().SEMANTIC_CACHE_THRESHOLD, dim=1024, max_entries=10)
+    semantic.add(make_cache_key(first, "summary"), first, "summary")
+
+    assert semantic.lookup(second, "summary") == make_cache_key(first, "summary")
+
+
+def test_index_evicts_least_recently_used():
+    """
+    Test that a full index evicts the entry that was used least recently.
+    """
+    index = SemanticIndex(dim=64, capacity=2)
+    index.add("summary::rome", vectorize("rome", 64))
+    index.add("summary::paris", vectorize("paris", 64))
+    assert index.lookup(vectorize("rome", 64), threshold=0.9)[0] == "summary::rome"
+    
+    index.add("summary::berlin", vectorize("berlin", 64))
+    
+    assert len(index) == 2
+    assert index.lookup(vectorize("paris", 64), threshold=0.9) is None
+    assert index.lookup(vectorize("rome", 64), threshold=0.9)[0] == "summary::rome"
+
+
+def test_index_persists_across_restarts(tmp_path):
+    """
+    Test that a flushed index is loaded back from its snapshot.
+    
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+    """
+    path = str(tmp_path / "summary.npz")
+    index = SemanticIndex(dim=64, capacity=8, path=path)
+    index.add("summary::rome", vectorize("rome", 64))
+    index.flush()
+    # Written after the last flush, so not part of the saved index
+    index.add("summary::paris", vectorize("paris", 64))
+    
+    reloaded = SemanticIndex(dim=64, capacity=8, path=path)
+    
+    assert len(reloaded) == 1
+    assert reloaded.lookup(vectorize("rome", 64), threshold=0.9)[0] == "summary::rome"
+    assert reloaded.lookup(vectorize("paris", 64), threshold=0.5) is None
+
+
+def test_processes_do_not_overwrite_each_others_vectors(tmp_path):
+    """
+    Test that indexes sharing a snapshot file keep their own vectors in memory.
+    
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+    """
+    path = str(tmp_path / "summary.npz")
+    first = SemanticIndex(dim=64, capacity=8, path=path)
+    second = SemanticIndex(dim=64, capacity=8, path=path)
+    first.add("summary::rome", vectorize("rome", 64))
+    second.add("summary::paris", vectorize("paris", 64))
+    first.flush()
+    second.flush()
+    
+    assert first.lookup(vectorize("rome", 64), threshold=0.9)[0] == "summary::rome"
+    assert first.lookup(vectorize("paris", 64), threshold=0.9) is None
+    assert len(SemanticIndex(dim=64, capacity=8, path=path)) == 1
+
+
+def test_service_serves_paraphrases_from_cache(mock_julep_agent_manager, monkeypatch):
+    """
+    Test that a paraphrased topic is served from the cache without a new chat.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    calls = []
+    original_chat = mock_julep_agent_manager.chat
+    
+    def counting_chat(session_id, messages, **options):
+        calls.append(messages)
+        return original_chat(session_id, messages, **options)
+    
+    monkeypatch.setattr(mock_julep_agent_manager, "chat", counting_chat)
+    service = ResearchService(
+        cache=MemoryResultCache(max_bytes=4096, ttl_seconds=60),
+        semantic_cache=SemanticCache(threshold=0.6, dim=1024, max_entries=100),
+        agent_manager=mock_julep_agent_manager,
+    )
+    
+    first = asyncio.run(service.perform_research("History of Rome", "summary"))
+    second = asyncio.run(service.perform_research("roman history", "summary"))
+    other_format = asyncio.run(service.perform_research("roman history", "bullet points"))
+    
+    assert first["cache_status"] == "MISS"
+    assert second["cache_status"] == "SEMANTIC_HIT"
+    assert second["topic"] == "roman history"
+    assert other_format["cache_status"] == "MISS"
+    assert len(calls) == 2
+    
+    service.invalidate()
+    assert asyncio.run(service.perform_research("roman history", "summary"))["cache_status"] == "MISS"
+
+
+def test_semantic_cache_is_disabled_without_numpy(monkeypatch):
+    """
+    Test that the semantic cache turns itself off when numpy is missing.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    settings = research.get_settings().model_copy(update={"SEMANTIC_CACHE_ENABLED": True})
+    assert create_semantic_cache(settings) is not None
+    
+    monkeypatch.setattr(semantic_cache, "np", None)
+    assert create_semantic_cache(settings) is None
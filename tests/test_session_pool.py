@@ -0,0 +1,162 @@
+"""
+Tests for the warm session pool.
+"""
+
+import asyncio
+import itertools
+
+import pytest
+
+from app.core.http import request_timeout
+from app.core.session_pool import SessionPool
+
+
+class FakeClock:
+    """Manually advanced clock for idle timeout tests."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class FakeSession:
+    """Session object with a unique ID."""
+    
+    def __init__(self, session_id):
+        self.id = session_id
+
+
+def make_pool(size=2, max_uses=3, idle_timeout=60.0, clock=None):
+    """
+    Build a pool whose sessions are numbered in creation order.
+    
+    Returns:
+        tuple: The pool and the list of situations it created sessions for.
+    """
+    counter = itertools.count()
+    situations = []
+    
+    async def create_session(situation, output_format):
+        situations.append(situation)
+        return FakeSession(f"session-{next(counter)}")
+    
+    pool = SessionPool(
+        create_session=create_session,
+        size=size,
+        max_uses=max_uses,
+        idle_timeout=idle_timeout,
+        clock=clock or FakeClock(),
+    )
+    return pool, situations
+
+
+def test_warm_pool_serves_leases_without_creating_sessions():
+    """
+    Test that leases after warm-up come from the pool.
+    """
+    pool, situations = make_pool(size=2)
+    
+    async def run():
+        await pool.warm(["summary"])
+        created = len(situations)
+        lease = await pool.lease("summary")
+        return created, lease
+    
+    created, lease = asyncio.run(run())
+    
+    assert created == 2
+    assert lease.pooled
+    assert lease.id == "session-0"
+    assert "'summary' format" in situations[0]
+    assert pool.stats()["summary"]["hits"] == 1
+
+
+def test_sessions_retired_after_max_uses():
+    """
+    Test that a session is retired once it has been used max_uses times.
+    """
+    pool, _ = make_pool(size=1, max_uses=2)
+    
+    async def run():
+        await pool.warm(["summary"])
+        ids = []
+        for _ in range(3):
+            lease = await pool.lease("summary")
+            ids.append(lease.id)
+            pool.release(lease)
+            await asyncio.sleep(0)
+        return ids
+    
+    ids = asyncio.run(run())
+    
+    assert ids[0] == ids[1]
+    assert ids[2] != ids[0]
+    assert pool.stats()["summary"]["retired"] >= 1
+
+
+def test_idle_sessions_retired_after_timeout():
+    """
+    Test that a session idle for longer than the timeout is not leased again.
+    """
+    clock = FakeClock()
+    pool, _ = make_pool(size=1, idle_timeout=10.0, clock=clock)
+    
+    async def run():
+        await pool.warm(["summary"])
+        clock.now = 11.0
+        return await pool.lease("summary")
+    
+    lease = asyncio.run(run())
+    
+    assert lease.id != "session-0"
+    assert pool.stats()["summary"]["misses"] == 1
+
+
+def test_failed_sessions_are_not_reused():
+    """
+    Test that a session whose request failed is retired.
+    """
+    pool, _ = make_pool(size=1)
+    
+    async def run():
+        await pool.warm(["summary"])
+        lease = await pool.lease("summary")
+        pool.release(lease, failed=True)
+        await asyncio.sleep(0)
+        return lease.id, (await pool.lease("summary")).id
+    
+    failed_id, next_id = asyncio.run(run())
+    assert failed_id != next_id
+
+
+def test_research_chats_on_pooled_session_without_saving(mock_julep_agent_manager, research_service, monkeypatch):
+    """
+    Test that research on a pooled session does not save history.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    chat_options = []
+    original_chat = mock_julep_agent_manager.chat
+    
+    def recording_chat(session_id, messages, **options):
+        chat_options.append(options)
+        return original_chat(session_id, messages, **options)
+    
+    monkeypatch.setattr(mock_julep_agent_manager, "chat", recording_chat)
+    monkeypatch.setattr(research_service, "agent_manager", mock_julep_agent_manager)
+    
+    result = asyncio.run(research_service._research_upstream("pooling", "summary"))
+    
+    assert result["result"] == "Mock research result about the requested topic."
+    settings = mock_julep_agent_manager.settings
+    timeout = request_timeout(settings.UPSTREAM_CALL_TIMEOUT, settings)
+    max_tokens = min(
+        mock_julep_agent_manager.resolve_profile("summary").max_tokens,
+        settings.OUTPUT_TOKEN_BUDGETS["summary"]
+    )
+    assert chat_options == [{"save": False, "timeout": timeout, "max_tokens": max_tokens}]
@@ -0,0 +1,147 @@
+"""
+Tests for request shaping by token budget.
+"""
+
+import asyncio
+
+import pytest
+
+from app.api.models import MAX_FORMAT_LENGTH, MAX_TEXT_LENGTH
+from app.services.cache import format_label
+from app.services.errors import InputTooLarge
+from app.services.research import ResearchService
+from app.services.shaping import REJECT, SHAPED, RequestShaper, estimate_tokens, truncate_to_tokens
+
+
+def make_shaper(oversized="truncate"):
+    """Build a shaper with small budgets."""
+    return RequestShaper(
+        input_budgets={"summary": 8},
+        default_input_budget=16,
+        output_budgets={"summary": 50, "short report": 240},
+        word_limits={"short report": 150},
+        oversized=oversized,
+    )
+
+
+def test_estimate_and_truncate_tokens():
+    """
+    Test that token estimates grow with the text and truncation keeps whole words.
+    """
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("one two three") == 4
+    assert estimate_tokens("x" * 40) == 10
+
+    text = "the history of artificial intelligence research in europe and asia"
+    truncated = truncate_to_tokens(text, 8)
+    assert text.startswith(truncated)
+    assert estimate_tokens(truncated) <= 8
+    assert truncated == "the history of artificial"
+    assert truncate_to_tokens(text, 100) == text
+
+
+def test_shaper_truncates_or_rejects_oversized_topics():
+    """
+    Test the per-format input budgets and both oversized topic policies.
+    """
+    topic = "word " * 10
+    assert make_shaper().shape_topic(topic, "bullets") == topic
+    assert estimate_tokens(make_shaper().shape_topic(topic, "summary")) <= 8
+
+    with pytest.raises(InputTooLarge):
+        make_shaper(oversized=REJECT).shape_topic(topic, "summary")
+
+
+
+def test_truncation_never_leaves_an_empty_topic():
+    """
+    Test that a topic without word breaks is cut by characters, and refused if nothing fits.
+    """
+    assert truncate_to_tokens("x" * 1999, 128) == "x" * 512
+    assert make_shaper().shape_topic("x" * 100, "summary") == "x" * 32
+
+    with pytest.raises(InputTooLarge):
+        RequestShaper(input_budgets={}, default_input_budget=1).shape_topic("x" * 100, "summary")
+
+
+def test_output_limits_follow_format(mock_julep_agent_manager):
+    """
+    Test that the format's completion limit and word limit reach the upstream call.
+
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+    """
+    calls = []
+    original_chat = mock_julep_agent_manager.chat
+
+    def recording_chat(session_id, messages, **options):
+        calls.append((messages[0]["content"], options.get("max_tokens")))
+        return original_chat(session_id, messages, **options)
+
+    mock_julep_agent_manager.chat = recording_chat
+    service = ResearchService(agent_manager=mock_julep_agent_manager, shaper=make_shaper())
+
+    asyncio.run(service.perform_research("robots", "summary"))
+    asyncio.run(service.perform_research("robots", "short report"))
+
+    assert calls[0][1] == 50
+    assert "words" not in calls[0][0]
+    assert calls[1][1] == 240
+    assert calls[1][0].endswith("Keep the answer under 150 words.")
+
+
+def test_research_endpoint_rejects_oversized_topic(client, research_service, monkeypatch):
+    """
+    Test that oversized topics are rejected with 413 when the policy is to reject them.
+
+    Args:
+        client: TestClient fixture.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(research_service, "shaper", make_shaper(oversized=REJECT))
+
+    for path in ("/research", "/research/stream"):
+        response = client.post(path, json={"topic": "word " * 50})
+        assert response.status_code == 413
+        assert "limit for 'summary' is 8 tokens" in response.json()["detail"]
+
+
+def test_research_endpoints_refuse_overlong_input(client, research_service):
+    """
+    Test that input past the hard length limit is refused with 422 before it is shaped.
+
+    Args:
+        client: TestClient fixture.
+        research_service: Research service fixture.
+    """
+    topic = "x" * (MAX_TEXT_LENGTH + 1)
+
+    for path in ("/research", "/research/stream", "/research/jobs"):
+        assert client.post(path, json={"topic": topic}).status_code == 422
+    response = client.post("/research/batch", json={"items": [{"topic": topic}]})
+    assert response.status_code == 422
+    response = client.post("/research/handle/follow-up", json={"instruction": topic})
+    assert response.status_code == 422
+    response = client.post("/research/handle/follow-up", json={"format": "x" * (MAX_FORMAT_LENGTH + 1)})
+    assert response.status_code == 422
+    assert client.post("/research", json={"topic": "AI", "format": "x" * (MAX_FORMAT_LENGTH + 1)}).status_code == 422
+
+
+def test_metrics_label_unknown_formats_as_other(research_service, monkeypatch):
+    """
+    Test that free-text formats share one metric series instead of creating their own.
+
+    Args:
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(research_service, "shaper", make_shaper())
+    before = SHAPED.value(format="other", action="truncated")
+
+    for output_format in ("limerick", "haiku"):
+        research_service.shape_topic("word " * 50, output_format)
+
+    assert SHAPED.value(format="other", action="truncated") == before + 2
+    assert SHAPED.value(format="limerick", action="truncated") == 0
+    assert format_label("Bullets") == "bullet points"
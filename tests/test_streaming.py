@@ -0,0 +1,121 @@
+"""
+Tests for streaming research responses.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.services import research
+from app.services.cache import MemoryResultCache
+from app.services.research import ResearchService
+from tests.conftest import MOCK_RESULT
+
+
+def parse_sse(body):
+    """
+    Parse a server-sent event stream into (event, data) pairs.
+    
+    Args:
+        body (str): The raw event stream.
+        
+    Returns:
+        list: The decoded events.
+    """
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_agent_manager_streams_chat(mock_julep_agent_manager):
+    """
+    Test that the agent manager relays streamed chunks in order.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+    """
+    async def run():
+        messages = [{"role": "user", "content": "Research AI"}]
+        return [text async for text in mock_julep_agent_manager.astream_chat("mock-session-id", messages)]
+    
+    pieces = asyncio.run(run())
+    
+    assert len(pieces) > 1
+    assert "".join(pieces) == MOCK_RESULT
+
+
+def test_stream_research_caches_result(mock_julep_agent_manager, monkeypatch):
+    """
+    Test that a streamed result is cached and replayed on the next request.
+    
+    Args:
+        mock_julep_agent_manager: The mocked agent manager.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    service = ResearchService(
+        cache=MemoryResultCache(max_bytes=1024, ttl_seconds=60),
+        agent_manager=mock_julep_agent_manager,
+    )
+    
+    async def collect():
+        return [event async for event in service.stream_research("AI", "summary")]
+    
+    first = asyncio.run(collect())
+    second = asyncio.run(collect())
+    
+    assert first[-1]["event"] == "result"
+    assert first[-1]["data"]["result"] == MOCK_RESULT
+    assert first[-1]["data"]["cache_status"] == "MISS"
+    assert [event["event"] for event in second] == ["token", "result"]
+    assert second[-1]["data"]["cache_status"] == "HIT"
+
+
+def test_research_stream_endpoint(client, mock_julep_agent_manager, research_service, monkeypatch):
+    """
+    Test that the streaming endpoint emits token events and a final result event.
+    
+    Args:
+        client: TestClient fixture.
+        mock_julep_agent_manager: The mocked agent manager.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(research_service, "agent_manager", mock_julep_agent_manager)
+    monkeypatch.setattr(research_service, "cache", None)
+    
+    response = client.post("/research/stream", json={"topic": "quantum computing"})
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    tokens = [data["text"] for event, data in events if event == "token"]
+    assert "".join(tokens) == MOCK_RESULT
+    assert events[-1][1].pop("conversation")
+    assert events[-1] == ("result", {
+        "topic": "quantum computing",
+        "format": "summary",
+        "result": MOCK_RESULT
+    })
+
+
+def test_research_stream_endpoint_reports_errors(client, research_service, monkeypatch):
+    """
+    Test that failures while streaming are reported as an error event.
+    
+    Args:
+        client: TestClient fixture.
+        research_service: Research service fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    async def failing_stream(topic, output_format, profile=None):
+        raise research.AgentSessionError("no session")
+        yield
+    
+    monkeypatch.setattr(research_service, "stream_research", failing_stream)
+    
+    response = client.post("/research/stream", json={"topic": "quantum computing"})
+    
+    assert parse_sse(response.text) == [("error", {"detail": "no session"})]